@@ -61,6 +61,7 @@ def launch():
             f"saves/strands",
             f"saves/nucleic_acid",
             f"saves/snapshots",
+            f"saves/geometry",
         ):
             with suppress(FileExistsError):
                 os.mkdir(Path.cwd() / directory)
@@ -1,3 +1,4 @@
+import itertools
 import json
 import logging
 from typing import Dict
@@ -8,13 +9,68 @@ import pandas as pd
 
 from natug import structures
 from natug.constants.directions import DOWN, UP
+from natug.structures import ids
 from natug.structures.domains import Domains
-from natug.structures.points.point import PointStyles
+from natug.structures.points.point import PointStyles, clear_shared_styles
+from natug.structures.strands.segment import Segment
 from natug.utils import hex_to_rgb
 
 logger = logging.getLogger(__name__)
 
 
+class ItemTable:
+    """
+    Resolves the ids that a save file refers to its items by to the loaded items.
+
+    Save files refer to items by compact integer file ids, which index directly into
+    a list. Older save files refer to items by uuid strings instead, which are
+    resolved through a dict. Either way, the loaded items are given new ids in the
+    open document, and the file ids are only used to resolve references within the
+    file.
+
+    Methods:
+        key: Parse an id from a save file.
+    """
+
+    def __init__(self):
+        self.items = []
+        self.items_by_uuid = {}
+
+    @staticmethod
+    def key(saved_id) -> int | str:
+        """
+        Parse an id from a save file.
+
+        Args:
+            saved_id: The id, as it was read from the save file.
+
+        Returns:
+            The integer id, or the uuid string if the save file is an older one.
+        """
+        try:
+            return int(saved_id)
+        except ValueError:
+            return str(saved_id)
+
+    def __setitem__(self, saved_id, item) -> None:
+        key = self.key(saved_id)
+        if isinstance(key, str):
+            self.items_by_uuid[key] = item
+        else:
+            if key >= len(self.items):
+                self.items.extend(itertools.repeat(None, key + 1 - len(self.items)))
+            self.items[key] = item
+
+    def __getitem__(self, saved_id) -> object:
+        key = self.key(saved_id)
+        if isinstance(key, str):
+            return self.items_by_uuid[key]
+        item = self.items[key] if 0 <= key < len(self.items) else None
+        if item is None:
+            raise KeyError(saved_id)
+        return item
+
+
 class FileHandler:
     def __init__(self, runner: "Runner"):
         self.runner = runner
@@ -26,32 +82,21 @@ class FileHandler:
         logger.debug(f"Saving program state to %s...", {filename})
 
         with ZipFile(filename, "w") as package:
-            # Save the domains
-            domains_df = self.runner.managers.domains.current.to_df()
-            package.writestr("domains.csv", domains_df.to_csv())
+            # Create a reference to the current domains
+            domains = self.runner.managers.domains.current
 
-            # Save the nucleic acid profiles
-            nucleic_acid_profiles_df = [
-                self.runner.managers.nucleic_acid_profile.current
-            ]
+            # Collect the nucleic acid profiles to save
+            nucleic_acid_profiles = [self.runner.managers.nucleic_acid_profile.current]
             # Save the current nucleic acid profile
-            nucleic_acid_profiles_df[-1].name = "Restored"
+            nucleic_acid_profiles[-1].name = "Restored"
             # Add all the other nucleic acid profiles except the previously restored one
             for (
                 nucleic_acid_profile
             ) in self.runner.managers.nucleic_acid_profile.profiles.values():
                 if (nucleic_acid_profile.name != "Restored") and (
-                    nucleic_acid_profile not in nucleic_acid_profiles_df
+                    nucleic_acid_profile not in nucleic_acid_profiles
                 ):
-                    nucleic_acid_profiles_df.append(nucleic_acid_profile)
-            # Export the nucleic acid profiles to a dataframe
-            nucleic_acid_profiles_df = structures.profiles.nucleic_acid_profile.to_df(
-                nucleic_acid_profiles_df
-            )
-            # Save the dataframe to the zip file
-            package.writestr(
-                "nucleic_acid_profiles.csv", nucleic_acid_profiles_df.to_csv()
-            )
+                    nucleic_acid_profiles.append(nucleic_acid_profile)
 
             # Create a reference to the current strands
             strands = self.runner.managers.strands.current
@@ -66,24 +111,71 @@ class FileHandler:
                 structures.points.nick.Nick: [],
                 structures.strands.linkage.Linkage: [],
             }
-            for item in strands.items():
-                items_by_type[type(item)].append(item)
+            # The points of segments are sorted a segment at a time, so that they are
+            # saved from the data of their helices instead of being created
+            for strand in strands.strands:
+                for piece in strand.items.pieces:
+                    if not isinstance(piece, Segment):
+                        items_by_type[type(piece)].append(piece)
+                        continue
+                    for type_ in (
+                        structures.points.Nucleoside,
+                        structures.points.NEMid,
+                    ):
+                        segment = piece.of_type((type_,))
+                        if len(segment):
+                            items_by_type[type_].append(segment)
 
             # Some NEMids may not be included via strand.items, if they are nicks
             # that had the items removed. So, we'll add them manually.
             for nick in strands.nicks:
                 items_by_type[structures.points.nemid.NEMid].append(nick.original_item)
 
+            # Give everything that the file refers to by id consecutive file ids.
+            # The file stores these instead of the objects' own ids, so the file has
+            # a dense id space that is the same each time that the document is saved,
+            # and saving leaves the open document untouched.
+            file_ids = ids.FileIds(
+                itertools.chain(
+                    nucleic_acid_profiles,
+                    (strands.nucleic_acid_profile,),
+                    domains.domains(),
+                    items_by_type[structures.points.Nucleoside],
+                    items_by_type[structures.points.NEMid],
+                    items_by_type[structures.points.nick.Nick],
+                    strands.nicks,
+                    items_by_type[structures.strands.linkage.Linkage],
+                    strands.strands,
+                    (strands,),
+                    double_helices.helices(),
+                    double_helices.double_helices,
+                    (double_helices,),
+                )
+            )
+
+            # Save the domains
+            domains_df = domains.to_df(file_ids=file_ids)
+            package.writestr("domains.csv", domains_df.to_csv())
+
+            # Export the nucleic acid profiles to a dataframe
+            nucleic_acid_profiles_df = structures.profiles.nucleic_acid_profile.to_df(
+                nucleic_acid_profiles, file_ids
+            )
+            # Save the dataframe to the zip file
+            package.writestr(
+                "nucleic_acid_profiles.csv", nucleic_acid_profiles_df.to_csv()
+            )
+
             # Create dataframes of all the different types of strand items
             nucleosides_df = structures.points.nucleoside.to_df(
-                items_by_type[structures.points.Nucleoside]
+                items_by_type[structures.points.Nucleoside], file_ids
             )
             NEMids_df = structures.points.nemid.to_df(
-                items_by_type[structures.points.NEMid]
+                items_by_type[structures.points.NEMid], file_ids
             )
-            nicks_df = structures.points.nick.to_df(strands.nicks)
+            nicks_df = structures.points.nick.to_df(strands.nicks, file_ids)
             linkages_df = structures.strands.linkage.to_df(
-                items_by_type[structures.strands.linkage.Linkage]
+                items_by_type[structures.strands.linkage.Linkage], file_ids
             )
 
             # Create a directory for the points
@@ -97,10 +189,10 @@ class FileHandler:
             package.writestr("strands/linkages.csv", linkages_df.to_csv())
 
             # Save the strands themselves, and the Strands container object
-            strands_json = strands.to_json()
+            strands_json = strands.to_json(file_ids)
             strands_json = json.dumps(strands_json, indent=4)
             package.writestr("strands/strands.json", strands_json)
-            strands_df = structures.strands.strand.to_df(strands.strands)
+            strands_df = structures.strands.strand.to_df(strands.strands, file_ids)
             package.writestr(
                 "strands/strands.csv",
                 strands_df.to_csv(index=False),
@@ -108,17 +200,19 @@ class FileHandler:
 
             package.mkdir("helices")
             # Repeat the same process that we just did for strands for double helices
-            double_helices_json = double_helices.to_json()
+            double_helices_json = double_helices.to_json(file_ids)
             double_helices_json = json.dumps(double_helices_json, indent=4)
             package.writestr("helices/double_helices.json", double_helices_json)
             double_helices_df = structures.helices.double_helix.to_df(
-                double_helices.double_helices
+                double_helices.double_helices, file_ids
             )
             package.writestr(
                 "helices/double_helices.csv",
                 double_helices_df.to_csv(index=False),
             )
-            helices_df = structures.helices.helix.to_df(tuple(double_helices.helices()))
+            helices_df = structures.helices.helix.to_df(
+                tuple(double_helices.helices()), file_ids
+            )
             package.writestr(
                 "helices/helices.csv",
                 helices_df.to_csv(index=False),
@@ -135,7 +229,9 @@ class FileHandler:
             clear_nucleic_acid_profiles: Whether to clear the nucleic acid profiles from
                  the respective panel.
         """
-        items_by_uuid = {}
+        items = ItemTable()
+        # The loaded design shouldn't share style records with previous designs
+        clear_shared_styles()
         nucleic_acid_profiles: Dict[str, structures.NucleicAcidProfile] = {}
         domains: Domains
         double_helices: structures.helices.DoubleHelices
@@ -151,7 +247,6 @@ class FileHandler:
                     nucleic_acid_profile = (
                         structures.profiles.nucleic_acid_profile.NucleicAcidProfile(
                             name=str(row["name"]),
-                            uuid=str(row["uuid"]),
                             D=float(row["data:D"]),
                             H=float(row["data:H"]),
                             g=float(row["data:g"]),
@@ -164,7 +259,6 @@ class FileHandler:
                     nucleic_acid_profiles[nucleic_acid_profile.name] = (
                         nucleic_acid_profile
                     )
-                    items_by_uuid[row["uuid"]] = nucleic_acid_profile
 
             nucleic_acid_profile = nucleic_acid_profiles["Restored"]
 
@@ -172,8 +266,6 @@ class FileHandler:
                 domains = structures.domains.Domains.from_df(
                     pd.read_csv(file), nucleic_acid_profile
                 )
-                for domain in domains.domains():
-                    items_by_uuid[domain.uuid] = domain
 
             def row_to_point_styles(row: pd.Series) -> PointStyles:
                 """
@@ -183,15 +275,14 @@ class FileHandler:
                     hex_to_rgb(row["style:outline"].split(",")[0].strip()),
                     float(row["style:outline"].split(",")[1].strip().replace("px", "")),
                 )
-                styles = PointStyles(
+                return PointStyles.from_values(
+                    state=row["style:state"],
                     symbol=row["style:symbol"],
                     size=row["style:size"],
                     rotation=row["style:rotation"],
                     fill=hex_to_rgb(row["style:fill"]),
                     outline=outline,
                 )
-                styles.state = row["style:state"]
-                return styles
 
             # Load all the nucleosides
             with package.open("points/nucleosides.csv") as file:
@@ -204,7 +295,6 @@ class FileHandler:
                 for index, row in df.iterrows():
                     base = row["nucleoside:base"]
                     nucleoside = structures.points.nucleoside.Nucleoside(
-                        uuid=row["uuid"],
                         x_coord=row["data:x_coord"],
                         z_coord=row["data:z_coord"],
                         angle=row["data:angle"],
@@ -213,7 +303,7 @@ class FileHandler:
                         base=base if isinstance(base, str) else None,
                         styles=row_to_point_styles(row),
                     )
-                    items_by_uuid[row["uuid"]] = nucleoside
+                    items[row["uuid"]] = nucleoside
 
             # Load all individual NEMids
             with package.open("points/NEMids.csv") as file:
@@ -229,10 +319,13 @@ class FileHandler:
                 NEMids = np.empty(len(df), dtype=object)
                 for index, row in df.iterrows():
                     juncmate = row.get("NEMid:juncmate")
+                    # Integer id columns with blanks are read as floats, with NaN for
+                    # the blanks
+                    if pd.isna(juncmate):
+                        juncmate = None
 
                     # Create the NEMid object from the dataframe row
                     NEMid_ = structures.points.nemid.NEMid(
-                        uuid=row["uuid"],
                         x_coord=row["data:x_coord"],
                         z_coord=row["data:z_coord"],
                         direction=row["data:direction"],
@@ -244,12 +337,12 @@ class FileHandler:
                         styles=row_to_point_styles(row),
                     )
                     NEMids[index] = NEMid_
-                    items_by_uuid[NEMid_.uuid] = NEMid_
+                    items[row["uuid"]] = NEMid_
 
-                # Now change the juncmate uuids to actual NEMid objects
+                # Now change the juncmate ids to actual NEMid objects
                 for NEMid_ in NEMids:
                     if NEMid_.juncmate is not None:
-                        NEMid_.juncmate = items_by_uuid[NEMid_.juncmate]
+                        NEMid_.juncmate = items[NEMid_.juncmate]
 
             # Load nick objects
             with package.open("points/nicks.csv") as file:
@@ -257,10 +350,9 @@ class FileHandler:
                 nicks = []
                 for index, row in df.iterrows():
                     nick = structures.points.nick.Nick(
-                        uuid=row["uuid"],
-                        original_item=items_by_uuid[row["data:original_item"]],
+                        original_item=items[row["data:original_item"]],
                     )
-                    items_by_uuid[row["uuid"]] = nick
+                    items[row["uuid"]] = nick
                     nicks.append(nick)
 
             # Load the Linkage objects
@@ -268,7 +360,7 @@ class FileHandler:
                 df = pd.read_csv(file)
                 df = df.where(pd.notnull(df), None)
                 for index, row in df.iterrows():
-                    items = [
+                    nucleosides = [
                         structures.points.nucleoside.Nucleoside(
                             base=None if base == "X" else base
                         )
@@ -287,23 +379,55 @@ class FileHandler:
                     linkage = structures.strands.linkage.Linkage(
                         coord_one=coord_one,
                         coord_two=coord_two,
-                        uuid=row["uuid"],
-                        items=items,
+                        items=nucleosides,
                         inflection=row["data:inflection"],
                         styles=styles,
                     )
                     linkage.styles.linkage = linkage
                     linkage.styles.reset()
 
-                    items_by_uuid[row["uuid"]] = linkage
+                    items[row["uuid"]] = linkage
+
+            # Load the helices and double helices
+            with package.open("helices/helices.csv") as file:
+                df = pd.read_csv(file)
+                for index, row in df.iterrows():
+                    helix = structures.helices.Helix(
+                        double_helix=row["data:double_helix"],  # Placeholder id
+                        direction=UP if row["data:direction"] == "UP" else DOWN,
+                    )
+                    helix.data.x_coords = np.array(
+                        tuple(map(float, row["data:x_coords"].split(";"))), dtype=float
+                    )
+                    helix.data.z_coords = np.array(
+                        tuple(map(float, row["data:z_coords"].split(";"))), dtype=float
+                    )
+                    helix.data.angles = np.array(
+                        tuple(map(float, row["data:angles"].split(";"))), dtype=float
+                    )
+                    helix.data.set_points(
+                        items[point] for point in row["data:points"].split(";")
+                    )
+                    # The store tells which of the points have been nicked, and it
+                    # is the points that the nicks stand in for that lie on the helix
+                    points = helix.data.points.copy()
+                    for index in np.flatnonzero(helix.data.store.nicks()).tolist():
+                        points[index] = points[index].original_item
+                    for index, point in enumerate(points):
+                        point.helix = helix
+                        point.helical_index = index
+                    assert isinstance(helix.data.x_coords[0], float)
+                    assert len(helix.data.x_coords) > 0
+                    items[row["uuid"]] = helix
 
-            # Load each individual Strands
+            # Load each individual Strands. The helices are loaded first, so that the
+            # points of the strands are grouped into segments of their helices.
             with package.open("strands/strands.csv") as file:
                 df = pd.read_csv(file)
 
                 for index, row in df.iterrows():
-                    items = [
-                        items_by_uuid[uuid] for uuid in row["data:items"].split("; ")
+                    strand_items = [
+                        items[item_id] for item_id in row["data:items"].split("; ")
                     ]
 
                     styles = structures.strands.strand.StrandStyles()
@@ -314,82 +438,38 @@ class FileHandler:
                     styles.highlighted = row["style:highlighted"]
 
                     strand = structures.strands.strand.Strand(
-                        uuid=row["uuid"],
-                        items=items,
+                        items=strand_items,
+                        nucleic_acid_profile=nucleic_acid_profile,
                         name=row["name"],
                         styles=styles,
                         closed=row["data:closed"],
                     )
                     strand.styles.strand = strand
-                    items_by_uuid[row["uuid"]] = strand
+                    items[row["uuid"]] = strand
 
             # Load the Strands container
             with package.open("strands/strands.json") as file:
                 loaded = json.load(file)
                 strands = structures.strands.Strands(
                     name=loaded["name"],
-                    uuid=loaded["uuid"],
                     nucleic_acid_profile=nucleic_acid_profile,
-                    strands=[items_by_uuid[uuid] for uuid in loaded["data:strands"]],
+                    strands=[items[strand_id] for strand_id in loaded["data:strands"]],
                 )
                 strands.nicks = nicks
 
             # Build the strand by using the items in the main hash table
             for strand in strands:
-                for item in strand:
-                    item.strand = strand
+                strand.record()
                 strand.strands = strands
 
-            # Load the helices and double helices
-            with package.open("helices/helices.csv") as file:
-                df = pd.read_csv(file)
-                for index, row in df.iterrows():
-                    helix = structures.helices.Helix(
-                        uuid=row["uuid"],
-                        double_helix=row["data:double_helix"],  # Placeholder UUID
-                        direction=UP if row["data:direction"] == "UP" else DOWN,
-                    )
-                    helix.data.x_coords = np.array(
-                        tuple(map(float, row["data:x_coords"].split(";"))), dtype=float
-                    )
-                    helix.data.z_coords = np.array(
-                        tuple(map(float, row["data:z_coords"].split(";"))), dtype=float
-                    )
-                    helix.data.angles = np.array(
-                        tuple(map(float, row["data:angles"].split(";"))), dtype=float
-                    )
-                    helix.data.points = np.array(
-                        tuple(
-                            map(
-                                lambda point: items_by_uuid[point],
-                                row["data:points"].split(";"),
-                            )
-                        ),
-                        dtype=object,
-                    )
-                    for i, point in enumerate(helix.data.points):
-                        if isinstance(
-                            point,
-                            structures.points.nick.Nick,
-                        ):
-                            point.original_item.helix = helix
-                            point.original_item.helical_index = i
-                        else:
-                            point.helix = helix
-                            point.helical_index = i
-                    assert isinstance(helix.data.x_coords[0], float)
-                    assert len(helix.data.x_coords) > 0
-                    items_by_uuid[row["uuid"]] = helix
-
             # Load the double helix objects
             with package.open("helices/double_helices.csv") as file:
                 df = pd.read_csv(file)
                 for index, row in df.iterrows():
                     double_helix = structures.helices.double_helix.DoubleHelix(
-                        uuid=row["uuid"],
                         domain=domains.domains()[row["data:domain"]],
-                        up_helix=items_by_uuid[row["data:up_helix"]],
-                        down_helix=items_by_uuid[row["data:down_helix"]],
+                        up_helix=items[row["data:up_helix"]],
+                        down_helix=items[row["data:down_helix"]],
                         # Resizing the helices makes them the correct GenerationCount
                         # size. However, it also wipes all the current data in the
                         # helices. Since they should be the right size, we can skip
@@ -402,22 +482,29 @@ class FileHandler:
                     # )
                     double_helix.up_helix.double_helix = double_helix
                     double_helix.down_helix.double_helix = double_helix
-                    items_by_uuid[row["uuid"]] = double_helix
+                    items[row["uuid"]] = double_helix
 
             # Load the overall DoubleHelices container for all the DoubleHelixes that
             # contain Helix objects
             with package.open("helices/double_helices.json") as file:
                 loaded = json.load(file)
                 listed_double_helices = []
-                for uuid in loaded["items"]:
-                    listed_double_helices.append(items_by_uuid[uuid])
+                for double_helix_id in loaded["items"]:
+                    listed_double_helices.append(items[double_helix_id])
 
                 double_helices = structures.helices.DoubleHelices(
-                    uuid=loaded["uuid"],
                     nucleic_acid_profile=nucleic_acid_profile,
                     double_helices=listed_double_helices,
                 )
-                items_by_uuid[loaded["uuid"]] = double_helices
+                items[loaded["uuid"]] = double_helices
+
+            # Rebuild the junction table of the design from the NEMids' juncmates
+            double_helices.attach_junctions(
+                structures.helices.junctions.JunctionTable.from_juncmates(
+                    double_helices
+                ),
+                strands,
+            )
 
             # Update the currently displayed nucleic acid profile and the possible
             # nucleic acid profiles to those found in the file
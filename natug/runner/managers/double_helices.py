@@ -1,8 +1,10 @@
 import logging
 from contextlib import suppress
 
+from natug import settings
 from natug.runner.managers.manager import Manager
 from natug.structures.helices import DoubleHelices
+from natug.structures.helices.geometry_cache import GeometryCache
 
 logger = logging.getLogger(__name__)
 
@@ -14,13 +16,22 @@ class DoubleHelicesManager(Manager):
     Attributes:
         current: The current double helices.
         runner: NATuG's current runner.
+        cache: The on-disk cache of computed geometries.
 
     Methods:
         restore: Load in a default DoubleHelices instance based on the domains or their
             restored file.
         recompute: Recompute and update the manager's current double helices.
+        cache_current: Store the current double helices' geometry in the cache.
     """
 
+    def __init__(self, runner: "Runner", manager: object = None):
+        super().__init__(runner, manager)
+        self.cache = GeometryCache(
+            settings.geometry_cache_path, settings.geometry_cache_capacity
+        )
+        self._cache_key = None
+
     def restore(self):
         """
         Setup the double helices manager from a blank program state.
@@ -44,23 +55,44 @@ class DoubleHelicesManager(Manager):
         Recompute the double helices.
 
         This uses double_helices.compute() to recompute all data for double helices
-        in-place.
+        in-place. The current double helices are passed along as the previous double
+        helices, so that only the domains that changed since then are recomputed.
 
         Notes:
-            This is a very expensive operation.
+            This is an expensive operation when many domains have changed.
         """
         # Remove the current action repetition settings.
         with suppress(AttributeError):
             self.runner.window.toolbar.repeat.setChecked(False)
             self.runner.window.toolbar.repeat.clicked.emit()
         # Regenerate the double helices based off of the current domains.
+        domains = self.runner.managers.domains.current
+        nucleic_acid_profile = self.runner.managers.nucleic_acid_profile.current
+        previous = self.current
         self.current = DoubleHelices.from_domains(
-            domains=self.runner.managers.domains.current,
-            nucleic_acid_profile=self.runner.managers.nucleic_acid_profile.current,
+            domains=domains,
+            nucleic_acid_profile=nucleic_acid_profile,
         )
-        # Compute the points based off of the newly computed double helices.
-        # (.from_domains()
-        self.current.compute()
+        # Compute the points based off of the newly computed double helices. If the
+        # same settings were computed before then the geometry is loaded from the
+        # cache. Otherwise, the unchanged double helices are reused from the previous
+        # double helices.
+        self._cache_key = self.cache.key(domains, nucleic_acid_profile)
+        geometry = self.cache.load(
+            self._cache_key, domains.domains(), nucleic_acid_profile
+        )
+        self.current.compute(previous=previous, geometry=geometry)
         # Log that the double helices have been computed.
         logger.info("Recomputed double helices.")
         return self.current
+
+    def cache_current(self):
+        """
+        Store the current double helices' geometry in the geometry cache.
+
+        The geometry is only stored once its junctable pair table is known, which is
+        after the double helices have been converted to strands.
+        """
+        if self._cache_key is None or self.current.geometry is None:
+            return
+        self.cache.store(self._cache_key, self.current.geometry)
@@ -34,6 +34,8 @@ class StrandsManager(Manager):
         self.runner.managers.double_helices.recompute()
         # Generate new strands using the strands() method of double helices.
         self.current = self.runner.managers.double_helices.current.strands()
+        # Now that the junctable pairs are known, cache the geometry.
+        self.runner.managers.double_helices.cache_current()
         # Log that the strands have been recomputed and return the new strands.
         logger.info("Recomputed strands.")
         return self.current
@@ -0,0 +1,274 @@
+import logging
+import os
+import sys
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, Iterable, Tuple
+
+import numpy as np
+
+from natug import settings
+from natug.structures.points.nick import Nick
+from natug.structures.points.point import Point
+from natug.structures.strands.linkage import Linkage
+from natug.structures.strands.segment import Segment
+
+logger = logging.getLogger(__name__)
+
+
+def shallow_size(obj) -> int:
+    """The size of an object plus the size of its instance dict, if it has one."""
+    size = sys.getsizeof(obj)
+    if hasattr(obj, "__dict__"):
+        size += sys.getsizeof(obj.__dict__)
+    return size
+
+
+def format_bytes(size: float) -> str:
+    """
+    Format a number of bytes as a human readable string.
+
+    Args:
+        size: The number of bytes. May be negative, for differences in size.
+
+    Returns:
+        The number of bytes in the largest unit that keeps it above one.
+    """
+    for unit in ("B", "KiB", "MiB"):
+        if abs(size) < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GiB"
+
+
+@dataclass(slots=True)
+class Usage:
+    """
+    The number of objects of a type and the approximate bytes that they take up.
+
+    Attributes:
+        count: The number of objects.
+        bytes: The approximate number of bytes that the objects take up.
+    """
+
+    count: int = 0
+    bytes: int = 0
+
+
+@dataclass(slots=True)
+class MemoryReport:
+    """
+    An account of the objects of a design and the approximate memory they take up.
+
+    Sizes are shallow: each object is counted once by its own size (and the size of
+    its instance dict, if it has one), and objects that are shared between many
+    others, like point style records, are counted once. Numpy arrays are counted by
+    the size of the buffers that own their data, so views into a shared buffer are
+    not counted twice.
+
+    Attributes:
+        usage: The usage of each type of object, keyed by the name of the type.
+        taken: When the report was taken.
+
+    Methods:
+        from_design: Walk a design and account for its objects.
+        compare: Obtain the growth of each type of object since a previous report.
+        to_text: Render the report as a table.
+    """
+
+    usage: Dict[str, Usage] = field(default_factory=dict)
+    taken: datetime = field(default_factory=datetime.now)
+
+    @classmethod
+    def from_design(
+        cls,
+        strands: "Strands",
+        double_helices: "DoubleHelices",
+        domains: "Domains",
+        snapshots_filepath: str | None = None,
+    ) -> "MemoryReport":
+        """
+        Walk a design and account for its objects.
+
+        Args:
+            strands: The strands of the design.
+            double_helices: The double helices of the design.
+            domains: The domains of the design.
+            snapshots_filepath: The directory that the snapshots of the design are
+                stored in. If None, snapshots are not accounted for.
+
+        Returns:
+            The memory report.
+        """
+        report = cls()
+        seen = set()
+
+        def account(name: str, obj: object, size: int | None = None) -> None:
+            """Account for an object under a type name, if it hasn't been yet."""
+            if id(obj) in seen:
+                return
+            seen.add(id(obj))
+            usage = report.usage.setdefault(name, Usage())
+            usage.count += 1
+            usage.bytes += shallow_size(obj) if size is None else size
+
+        def account_array(name: str, array: np.ndarray | None) -> None:
+            """Account for the buffer that owns the data of an array."""
+            if array is None:
+                return
+            while isinstance(array.base, np.ndarray):
+                array = array.base
+            account(name, array, array.nbytes)
+
+        def account_point(point: Point | Nick) -> None:
+            """Account for a point, and its styles and style record."""
+            if isinstance(point, Nick):
+                account("Nick", point)
+                point = point.original_item
+            account(type(point).__name__, point)
+            if point.styles is not None:
+                account("PointStyles", point.styles)
+                account("PointStyle records", point.styles.style)
+
+        # The points of the helices, and the data arrays that they are derived from
+        for helix in double_helices.helices():
+            account("Helix", helix)
+            for array in (helix.data.x_coords, helix.data.z_coords, helix.data.angles):
+                account_array("Helix arrays", array)
+            account_array("Helix point caches", helix.data.points)
+            if helix.data.store is not None:
+                store = helix.data.store
+                for array in (
+                    store.kinds,
+                    store.states,
+                    store.strand_ids,
+                    store.bases,
+                    store.junctables,
+                ):
+                    account_array("Helix point stores", array)
+            account("Helix juncmate maps", helix.data.juncmates)
+            for point in helix.data.points if helix.data.points is not None else ():
+                if point is not None:
+                    account_point(point)
+
+        # The items of the strands, which may include points that aren't on helices.
+        # The points of segments are the points of the helices, which were accounted
+        # for above.
+        for strand in strands:
+            account("Strand", strand)
+            account("Strand item lists", strand.items)
+            account("Strand item lists", strand.items.rope)
+            for node in strand.items.rope.nodes():
+                account("Strand rope nodes", node)
+            for item in strand.items.pieces:
+                if isinstance(item, Segment):
+                    account("Strand segments", item)
+                elif isinstance(item, Linkage):
+                    account("Linkage", item)
+                    for nucleoside in item.items:
+                        account_point(nucleoside)
+                else:
+                    account_point(item)
+        for nick in strands.nicks:
+            account_point(nick)
+
+        # The structures that are shared by the whole design
+        if double_helices.geometry is not None:
+            for array in (
+                double_helices.geometry.coords,
+                double_helices.geometry.helix_ids,
+                double_helices.geometry.helical_indices,
+            ):
+                account_array("Helix arrays", array)
+        if double_helices.junctions is not None:
+            junctions = double_helices.junctions
+            for array in (junctions.pairs, junctions.joints, junctions.active):
+                account_array("Junction table", array)
+            account("Junction table", junctions.rows)
+        for domain in domains.domains():
+            account("Domain", domain)
+
+        # The snapshots of the design that are stored on disk
+        if snapshots_filepath is not None and os.path.isdir(snapshots_filepath):
+            usage = report.usage.setdefault("Snapshot files (disk)", Usage())
+            for filename in os.listdir(snapshots_filepath):
+                if filename.endswith(f".{settings.extension}"):
+                    usage.count += 1
+                    usage.bytes += os.path.getsize(
+                        os.path.join(snapshots_filepath, filename)
+                    )
+
+        logger.debug("Took a memory report of %s types.", len(report.usage))
+        return report
+
+    @property
+    def total(self) -> Usage:
+        """The total usage of all the objects that are held in memory."""
+        total = Usage()
+        for name, usage in self.usage.items():
+            if not name.endswith("(disk)"):
+                total.count += usage.count
+                total.bytes += usage.bytes
+        return total
+
+    def compare(self, previous: "MemoryReport") -> Dict[str, Tuple[int, int]]:
+        """
+        Obtain the growth of each type of object since a previous report.
+
+        Args:
+            previous: The previous report.
+
+        Returns:
+            The change in the count and bytes of each type of object, keyed by the
+            name of the type.
+        """
+        growth = {}
+        for name in {**previous.usage, **self.usage}:
+            now = self.usage.get(name, Usage())
+            then = previous.usage.get(name, Usage())
+            growth[name] = (now.count - then.count, now.bytes - then.bytes)
+        return growth
+
+    def to_text(self, previous: "MemoryReport" = None) -> str:
+        """
+        Render the report as a table.
+
+        Args:
+            previous: A previous report to show the growth since. If None, no growth
+                is shown.
+
+        Returns:
+            The report as a plain text table, with one row per type of object.
+        """
+        growth = {}
+        if previous is not None:
+            growth = self.compare(previous)
+            growth["Total (memory)"] = (
+                self.total.count - previous.total.count,
+                self.total.bytes - previous.total.bytes,
+            )
+
+        def rows() -> Iterable[Tuple[str, ...]]:
+            yield "Type", "Count", "Bytes", "Count change", "Bytes change"
+            usages = sorted(self.usage.items(), key=lambda item: -item[1].bytes)
+            for name, usage in (*usages, ("Total (memory)", self.total)):
+                row = [name, f"{usage.count:,}", format_bytes(usage.bytes), "", ""]
+                if name in growth:
+                    count_change, bytes_change = growth[name]
+                    sign = "+" if bytes_change >= 0 else ""
+                    row[3] = f"{count_change:+,}"
+                    row[4] = f"{sign}{format_bytes(bytes_change)}"
+                yield tuple(row)
+
+        rows = tuple(rows())
+        widths = [max(len(row[column]) for row in rows) for column in range(5)]
+        lines = [
+            "  ".join(
+                cell.ljust(width) if column == 0 else cell.rjust(width)
+                for column, (cell, width) in enumerate(zip(row, widths))
+            )
+            for row in rows
+        ]
+        lines.insert(1, "-" * len(lines[0]))
+        lines.insert(0, f"Memory report taken {self.taken:%Y-%m-%d %H:%M:%S}")
+        return "\n".join(lines)
@@ -65,9 +65,12 @@ class Runner:
         filehandler (logging.FileHandler): The file handler for the logger. This
             is used to save and load the program state at the request of the user.
         booted (bool): Whether the program has been booted.
+        last_memory_report (MemoryReport): The memory report that was last taken, to
+            compare the next memory report against. None until a report is taken.
 
     Methods:
         recompute: Recompute the top and side view, and then refresh the plots.
+        memory_report: Account for the objects and memory of the current design.
     """
 
     restored_filepath = f"saves/restored.{settings.extension}"
@@ -80,6 +83,7 @@ class Runner:
         self.managers = None
         self.filehandler = None
         self.booted = False
+        self.last_memory_report = None
 
         atexit.register(self.exit)
 
@@ -271,6 +275,34 @@ class Runner:
         action.triggered.connect(self.managers.snapshots.current.switch_to_next)
         self.window.addAction(action)
 
+    def memory_report(self) -> "MemoryReport":
+        """
+        Account for the objects and memory of the current design.
+
+        The current strands, double helices, and domains are walked, and the
+        snapshots on disk are measured. The report is then stored, so that the next
+        report can show how much each type of object has grown since this one.
+
+        Returns:
+            The memory report of the current design.
+        """
+        from natug.runner.memory import MemoryReport
+
+        report = MemoryReport.from_design(
+            self.managers.strands.current,
+            self.managers.double_helices.current,
+            self.managers.domains.current,
+            self.managers.snapshots.filepath,
+        )
+        logger.info(
+            "Memory report: %s objects, %s bytes.",
+            report.total.count,
+            report.total.bytes,
+        )
+        self.last_memory_report, previous = report, self.last_memory_report
+        logger.debug("\n%s", report.to_text(previous))
+        return report
+
     def recompute(self):
         """Script to recompute top and side view data, and reload the plots."""
         self.window.config.panel.domains.dump_domains(self.managers.domains.current)
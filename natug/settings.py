@@ -6,6 +6,8 @@ debug = True
 extension = "natug"
 snapshot_path = "saves/snapshots"
 default_snapshot_max_capacity = 16
+geometry_cache_path = "saves/geometry"
+geometry_cache_capacity = 32
 
 # Threshold to determine whether a tube is closed.
 closed_threshold = 0.01
@@ -1,8 +1,8 @@
 from copy import copy
 from typing import Tuple
-from uuid import uuid1
 
 from natug.constants.directions import *
+from natug.structures.ids import new_id
 from natug.structures.points.point import x_coord_from_angle
 from natug.structures.profiles import NucleicAcidProfile
 from natug.structures.strands import Strand
@@ -147,6 +147,7 @@ class Domain:
         down_helix_count (GenerationCount): The number of nucleosides to initially
             generate for the up helix of the domain.
         uuid: The unique identifier for the domain. This is automatically generated.
+        signature: The settings of the domain that its helices depend on.
 
     Methods:
         inverted: A domain with helix joint directions that are the inverse of what they
@@ -163,7 +164,7 @@ class Domain:
         down_helix_count: Tuple[int, int, int],
         parent: "Domains" = None,
         index: int = None,
-        uuid: str = None,
+        uuid: int = None,
     ):
         """
         Initialize a Domain object.
@@ -190,7 +191,7 @@ class Domain:
                 object.
             parent (Subunit): The strands subunit. Defaults to None.
             index (int): The index of this domain in its strands. Defaults to None.
-            uuid (str): The unique identifier for the domain. This is automatically
+            uuid (int): The unique identifier for the domain. This is automatically
                 generated. Defaults to None.
         """
         # store the strands subunit
@@ -220,7 +221,7 @@ class Domain:
         self.index = index
 
         # set the uuid
-        self.uuid = uuid or str(uuid1())
+        self.uuid = uuid if uuid is not None else new_id()
 
     def __sub__(self, other):
         """
@@ -275,7 +276,7 @@ class Domain:
         """
         angle = start
         while True:
-            angle += self.nucleic_acid_profile.theta_b
+            angle += self.nucleic_acid_profile.derived.theta_b
             yield angle
 
     def x_coords(self):
@@ -297,7 +298,7 @@ class Domain:
         """
         z_coord = start
         while True:
-            z_coord += self.nucleic_acid_profile.Z_b
+            z_coord += self.nucleic_acid_profile.derived.Z_b
             yield z_coord
 
     @property
@@ -336,6 +337,25 @@ class Domain:
         else:
             return Strand(self.parent.strands.items()[self.index][RIGHT])
 
+    @property
+    def signature(self) -> tuple:
+        """
+        Obtain a tuple of all the settings of the domain that its helices depend on.
+
+        Two domains with equal signatures (and equal nucleic acid profiles) produce
+        identical helix data. Domains are often rebuilt from scratch when they are
+        edited, so comparing signatures is how changed domains are detected.
+        """
+        return (
+            self.index,
+            self.theta_i,
+            self.theta_e,
+            self.left_helix_joint,
+            self.right_helix_joint,
+            tuple(self.up_helix_count),
+            tuple(self.down_helix_count),
+        )
+
     @property
     def theta_s_multiple(self) -> int:
         """
@@ -367,7 +387,7 @@ class Domain:
         This is equivalent to self.theta_s_multiple * self.theta_s.
         Updated Bill 2/11/23
         """
-        return self.theta_s_multiple * self.nucleic_acid_profile.theta_s
+        return self.theta_s_multiple * self.nucleic_acid_profile.derived.theta_s
 
     @property
     def theta_m(self) -> float:
@@ -376,7 +396,7 @@ class Domain:
 
         This is equivalent to self.theta_m_multiple * self.theta_c.
         """
-        return self.theta_m_multiple * self.nucleic_acid_profile.theta_c
+        return self.theta_m_multiple * self.nucleic_acid_profile.derived.theta_c
 
     @property
     def theta_i(self) -> float:
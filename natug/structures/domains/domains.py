@@ -1,8 +1,7 @@
 import logging
 import math
-from contextlib import suppress
 from copy import copy
-from typing import Iterable, List
+from typing import Callable, Iterable, List
 
 import numpy as np
 import pandas as pd
@@ -12,8 +11,8 @@ from natug import settings
 from natug.constants.directions import DOWN, UP
 from natug.structures.domains import Domain
 from natug.structures.domains.subunit import Subunit
+from natug.structures.ids import live_id
 from natug.structures.profiles import NucleicAcidProfile
-from natug.utils import timer
 
 logger = logging.getLogger(__name__)
 
@@ -28,6 +27,10 @@ class Domains:
     with domains passed through the init), and then automatically creates copies of
     that subunit and the domains in it when the .domains() method is called.
 
+    The copies are cached, and are only rebuilt after the Domains is invalidated. The
+    Domains invalidates itself whenever the template subunit, symmetry, or
+    antiparallel setting changes. Each invalidation bumps the Domains' version.
+
     Attributes:
         nucleic_acid_profile: The nucleic acid configuration.
         subunit: The domains within a single subunit.
@@ -36,6 +39,9 @@ class Domains:
         count: The total number of domains. Includes domains from all subunits.
         antiparallel: Whether the domains are forced to have alternating
             upness/downness.
+        version: A number that is incremented every time the Domains is invalidated.
+        theta_is: The interior angle of every domain, as an array.
+        theta_es: The exterior angle of every domain, as an array.
 
     Methods:
         strands: Returns a Strands object containing all the strands in the domains.
@@ -45,6 +51,8 @@ class Domains:
         invert: Invert two domains deeper into the nanotube.
         subunits: Returns a list of subunits.
         closed: Whether the tube is closed or not.
+        closes: Whether the tube would be closed for many candidate interior angles.
+        invalidate: Clear the cached subunits and domains.
         update: Update the domains object in place.
         to_df: Export the domains to a dataframe.
         from_df: Import the domains from a dataframe.
@@ -68,6 +76,12 @@ class Domains:
             antiparallel: Whether the domains are forced to have alternating
                 upness/downness.
         """
+        # the cache of the subunits and domains, and the version it was built for
+        self._version = 0
+        self._cache = None
+        self._angles_cache = None
+        self._top_view_cache = None
+
         # store various settings
         self.nucleic_acid_profile = nucleic_acid_profile
         self.symmetry = symmetry
@@ -85,6 +99,47 @@ class Domains:
     def __len__(self):
         return self.count
 
+    @property
+    def version(self) -> int:
+        """
+        The version of the Domains.
+
+        The version is incremented every time the Domains is invalidated, so it can be
+        used to check whether data derived from the domains is stale.
+        """
+        return self._version
+
+    def invalidate(self) -> None:
+        """
+        Clear the cached subunits and domains, and increment the version.
+
+        This is automatically called when the template subunit, symmetry, or
+        antiparallel setting changes. It must be called manually after mutating a
+        domain of the template subunit in place.
+        """
+        self._version += 1
+        self._cache = None
+
+    @property
+    def symmetry(self) -> int:
+        """The symmetry type. Also known as "R"."""
+        return self._symmetry
+
+    @symmetry.setter
+    def symmetry(self, new_symmetry: int) -> None:
+        self._symmetry = new_symmetry
+        self.invalidate()
+
+    @property
+    def antiparallel(self) -> bool:
+        """Whether the domains are forced to have alternating upness/downness."""
+        return self._antiparallel
+
+    @antiparallel.setter
+    def antiparallel(self, new_antiparallel: bool) -> None:
+        self._antiparallel = new_antiparallel
+        self.invalidate()
+
     def update(self, domains: "Domains") -> None:
         """
         Update the domains object in place.
@@ -114,7 +169,11 @@ class Domains:
         self.antiparallel = domains.antiparallel
         self.subunit = domains.subunit
 
-    def to_df(self, include_uuid: bool = True) -> pd.DataFrame:
+    def to_df(
+        self,
+        include_uuid: bool = True,
+        file_ids: Callable[[object], int] = live_id,
+    ) -> pd.DataFrame:
         """
         Export all the current domains as a pandas dataframe.
 
@@ -132,12 +191,17 @@ class Domains:
             * Symmetry (int): The symmetry type
             * Antiparallel ("true" or "false"): Whether the domains are antiparallel
 
+        Args:
+            include_uuid: Whether to include the uuid column.
+            file_ids: Obtains the id to refer to each object by. Defaults to the
+                objects' own ids.
+
         Returns:
             A pandas dataframe containing the domains' data.
         """
         # extract all the data and compile it into lists
         domains = self.subunit.domains
-        uuids = [domain.uuid for domain in domains]
+        uuids = [file_ids(domain) for domain in domains]
         left_helix_joints = [
             "UP" if domain.left_helix_joint == UP else "DOWN" for domain in domains
         ]
@@ -199,7 +263,6 @@ class Domains:
             A Domains object.
         """
         # Extract the data from the dataframe
-        uuids = df["uuid"].to_list() if "uuid" in df.columns else None
         left_helix_joints = [
             UP if direction == "UP" else DOWN
             for direction in df["data:left_helix_joints"].to_list()
@@ -226,7 +289,6 @@ class Domains:
             domains.append(
                 Domain(
                     index=i,
-                    uuid=uuids[i] if uuids else None,
                     nucleic_acid_profile=nucleic_acid_profile,
                     theta_m_multiple=m[i],
                     left_helix_joint=left_helix_joints[i],
@@ -293,11 +355,13 @@ class Domains:
         sheet.write(1, 10, self.symmetry)
         sheet.write(1, 11, self.antiparallel)
 
-    @timer(logger=logger, task_name="Domains top view computation")
     def top_view(self) -> np.ndarray:
         """
         Create a set of coordinates that represent the top view of all the domains.
 
+        The coordinates are cached until the Domains is invalidated or the nucleic
+        acid profile changes.
+
         Returns:
             A numpy array of (u, v) coordinates for each domain. An additional coordinate
                 is added for a hypothetical self.count+1th domain, so that the direction
@@ -305,29 +369,17 @@ class Domains:
                 coordinate is prepended to the array to represent the origin entry
                 direction.
         """
-        domains = self.domains()
-        coords = np.zeros((self.count + 2, 2))
-        diameter = self.nucleic_acid_profile.D
-
-        coords[0] = (
-            -diameter * math.cos(math.radians(180 + domains[0].theta_i)),
-            -diameter * math.sin(math.radians(180 + domains[0].theta_i)),
+        key = (
+            self._version,
+            self.nucleic_acid_profile.derived,
+            self.nucleic_acid_profile.D,
         )
-        # coords[1] = (0, 0) (this is the default)
-        coords[2] = (diameter, 0)
-        absolute_angle = 180 - domains[1].theta_i
-
-        for index in range(3, self.count + 2):
-            coords[index] = (
-                coords[index - 1][0]
-                + diameter * math.cos(math.radians(absolute_angle)),
-                coords[index - 1][1]
-                + diameter * math.sin(math.radians(absolute_angle)),
+        if self._top_view_cache is None or self._top_view_cache[0] != key:
+            self._top_view_cache = key, top_view_coords(
+                self.theta_is, self.nucleic_acid_profile.D
             )
-            with suppress(IndexError):
-                absolute_angle += 180 - domains[index - 1].theta_i
-
-        return coords
+        # The coords are often modified in place by plotters, so return a copy.
+        return self._top_view_cache[1].copy()
 
     def closed(self):
         """
@@ -344,6 +396,34 @@ class Domains:
         coords = self.top_view()
         return math.dist(coords[0], coords[-2]) < settings.closed_threshold
 
+    def closes(self, theta_m_multiples: np.ndarray) -> np.ndarray:
+        """
+        Whether the Domains would be closed for many candidate theta_m_multiples.
+
+        The helix joints of the domains are kept as they are, so only the interior
+        angle multiples vary between candidates.
+
+        Args:
+            theta_m_multiples: A (candidate count, domain count) array. Each row is a
+                theta_m_multiple for every domain.
+
+        Returns:
+            A boolean array of whether each candidate closes.
+        """
+        constants = self.nucleic_acid_profile.derived
+        # The switch angles of the domains are the same for every candidate
+        theta_s = (
+            np.array(
+                [domain.theta_s_multiple for domain in self.domains()], dtype=float
+            )
+            * constants.theta_s
+        )
+        theta_is = np.asarray(theta_m_multiples) * constants.theta_c + theta_s
+        return (
+            closure_gaps(theta_is, self.nucleic_acid_profile.D)
+            < settings.closed_threshold
+        )
+
     @property
     def subunit(self) -> Subunit:
         """
@@ -369,6 +449,7 @@ class Domains:
         self._subunit = new_subunit
         for domain in self._subunit:
             domain.parent = self._subunit
+        self.invalidate()
 
     @property
     def count(self) -> int:
@@ -380,6 +461,81 @@ class Domains:
         """
         return len(self.domains())
 
+    @property
+    def theta_is(self) -> np.ndarray:
+        """
+        The interior angle of every domain, as an array.
+
+        This is equivalent to [domain.theta_i for domain in self.domains()].
+        """
+        return self._angles()[0]
+
+    @property
+    def theta_es(self) -> np.ndarray:
+        """
+        The exterior angle of every domain, as an array.
+
+        This is equivalent to [domain.theta_e for domain in self.domains()].
+        """
+        return self._angles()[1]
+
+    def _angles(self):
+        """
+        Obtain the interior and exterior angles of every domain.
+
+        The angles are cached until the Domains is invalidated or the nucleic acid
+        profile's derived constants change.
+
+        Returns:
+            A tuple of the interior angles and the exterior angles.
+        """
+        constants = self.nucleic_acid_profile.derived
+        if self._angles_cache is None or self._angles_cache[:2] != (
+            self._version,
+            constants,
+        ):
+            domains = self.domains()
+            theta_m_multiples = np.array(
+                [domain.theta_m_multiple for domain in domains], dtype=float
+            )
+            # The switch multiple is -1 for up to down, 0 for up to up or down to
+            # down, and 1 for down to up, which is the left joint minus the right.
+            theta_s_multiples = np.array(
+                [
+                    domain.left_helix_joint - domain.right_helix_joint
+                    for domain in domains
+                ],
+                dtype=float,
+            )
+            theta_is = (
+                theta_m_multiples * constants.theta_c
+                + theta_s_multiples * constants.theta_s
+            )
+            theta_es = 360 - theta_is
+            self._angles_cache = self._version, constants, theta_is, theta_es
+        return self._angles_cache[2], self._angles_cache[3]
+
+    def _cached(self):
+        """
+        Obtain the cached subunits and domains, rebuilding them if they are stale.
+
+        Returns:
+            A tuple of the subunits and the domains.
+        """
+        if self._cache is None or self._cache[0] != self._version:
+            logger.debug("Rebuilding the subunits and domains cache.")
+            subunits = self._subunits()
+            domains = []
+            for subunit in subunits:
+                domains.extend(subunit.domains.copy())
+
+            # Set the proper indexes for all the domains
+            for index, domain in enumerate(domains):
+                domain.index = index
+
+            self._cache = self._version, subunits, domains
+        return self._cache[1], self._cache[2]
+
     def subunits(self) -> List[Subunit]:
         """
         Obtain all subunits of the Domains object.
@@ -387,7 +543,14 @@ class Domains:
         Returns:
             List[Subunit]: Copies of the template subunit for all subunits except the first one.
             The first subunit in the returned list is a direct reference to the template subunit.
+
+        Notes:
+            The subunits are cached until the Domains is invalidated.
         """
+        return self._cached()[0]
+
+    def _subunits(self) -> List[Subunit]:
+        """Build all the subunits of the Domains object from the template subunit."""
         # Sometimes the user will set up the domains such that alternating subunits need
         # to be inverted to allow for a closed tube. In this case auto_antiparallel will
         # be True. (both requested (first condition) and needed (second condition))
@@ -416,21 +579,15 @@ class Domains:
 
         Returns:
             A list of all domains from all subunits.
+
+        Notes:
+            The domains are cached until the Domains is invalidated.
         """
         # If the structure is nonsymmetrical then self.subunit.domains := self.domains()
         if self.symmetry == 1:
             return self.subunit.domains
 
-        # Get all the domains from all the subunits
-        output = []
-        for subunit in self.subunits():
-            output.extend(subunit.domains.copy())
-
-        # Set the proper indexes for all the domains
-        for index, domain in enumerate(output):
-            output[index].index = index
-
-        return output
+        return self._cached()[1]
 
     def destroy_symmetry(self) -> None:
         """
@@ -440,7 +597,7 @@ class Domains:
         if self.symmetry != 1:
             self.subunit = Subunit(
                 self.nucleic_acid_profile,
-                self.domains(),
+                list(self.domains()),
                 template=True,
                 parent=self,
             )
@@ -493,6 +650,7 @@ class Domains:
             + domain_C.theta_m_multiple
             - self.nucleic_acid_profile.B
         )
+        self.invalidate()
 
     def __repr__(self) -> str:
         """
@@ -501,3 +659,56 @@ class Domains:
         Returns the template subunit, symmetry, and antiparallel status.
         """
         return f"Domains(subunit={self.subunit}, symmetry={self.symmetry}, antiparallel={self.antiparallel})"
+
+
+def top_view_coords(theta_is: np.ndarray, diameter: float) -> np.ndarray:
+    """
+    Compute the top view coordinates of domains from their interior angles.
+
+    Each domain is a step of length <diameter> away from the previous domain, in the
+    direction of the running sum of the exterior turns (180 - theta_i). The steps are
+    taken as complex exponentials and summed with one cumulative sum.
+
+    Args:
+        theta_is: The interior angles of the domains. The last axis is the domain
+            axis, and any leading axes are batch axes (for example, candidates).
+        diameter: The diameter of a domain.
+
+    Returns:
+        An array of shape (*batch, domain count + 2, 2) of (u, v) coordinates, laid
+        out the same way as Domains.top_view().
+    """
+    theta_is = np.asarray(theta_is, dtype=float)
+    count = theta_is.shape[-1]
+    coords = np.zeros((*theta_is.shape[:-1], count + 2), dtype=complex)
+
+    # The origin entry direction
+    coords[..., 0] = -diameter * np.exp(1j * np.radians(180 + theta_is[..., 0]))
+    # coords[..., 1] = 0 (this is the default)
+
+    # The second domain lies <diameter> to the right of the first, and every
+    # domain after that turns by the exterior angle of the domain before it.
+    steps = np.empty((*theta_is.shape[:-1], count), dtype=complex)
+    steps[..., 0] = diameter
+    absolute_angles = np.cumsum(180 - theta_is[..., 1:count], axis=-1)
+    steps[..., 1:] = diameter * np.exp(1j * np.radians(absolute_angles))
+    coords[..., 2:] = np.cumsum(steps, axis=-1)
+
+    return np.stack((coords.real, coords.imag), axis=-1)
+
+
+def closure_gaps(theta_is: np.ndarray, diameter: float) -> np.ndarray:
+    """
+    Compute the gap between the first and last domain of the top view of domains.
+
+    Args:
+        theta_is: The interior angles of the domains. The last axis is the domain
+            axis, and any leading axes are batch axes (for example, candidates).
+        diameter: The diameter of a domain.
+
+    Returns:
+        The distance between the first domain's origin entry coordinate and the
+        last domain's coordinate, for each batch entry. A closed tube has a gap of 0.
+    """
+    coords = top_view_coords(theta_is, diameter)
+    return np.hypot(*np.moveaxis(coords[..., 0, :] - coords[..., -2, :], -1, 0))
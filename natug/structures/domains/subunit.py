@@ -70,6 +70,7 @@ class Subunit:
         """
         self.domains.append(domain)
         domain.parent = self
+        self._changed()
 
     def remove(self, domain: "Domain") -> None:
         """
@@ -83,6 +84,7 @@ class Subunit:
         """
         self.domains.remove(domain)
         domain.parent = None
+        self._changed()
 
     def copy(self) -> "Subunit":
         """
@@ -168,6 +170,17 @@ class Subunit:
                     )
                 )
                 i += 1
+        self._changed()
+
+    def _changed(self) -> None:
+        """
+        Invalidate the parent Domains' cache if this is its template subunit.
+
+        The parent Domains caches copies of its template subunit, so it must be
+        notified when the template subunit's domains change.
+        """
+        if self.template and self.parent is not None:
+            self.parent.invalidate()
 
     def __getitem__(self, item):
         """
@@ -1,32 +1,21 @@
 import logging
-from typing import Iterable, Iterator
-from uuid import uuid1
+from typing import Callable, Iterable, Iterator
 
 import numpy as np
-from numpy import argmax
 
-from natug.constants.directions import DOWN
-from natug.structures.points.point import x_coord_from_angle
+from natug.constants.directions import DOWN, UP
+from natug.structures.helices.geometry import (
+    HelicesGeometry,
+    compute_geometry,
+    junctable_pairs,
+)
+from natug.structures.helices.junctions import JunctionTable
+from natug.structures.ids import live_id, new_id
 from natug.utils import Timer
 
 logger = logging.getLogger(__name__)
 
 
-vectorized_x_coords_from_angles = np.vectorize(x_coord_from_angle)
-
-def x_coords_from_angles(angles: np.ndarray, domain: "Domain") -> np.ndarray:
-    """
-    Compute the x coords from the angles.
-
-    Args:
-        angles: The angles to use for the computation.
-
-    Returns:
-        The x coords.
-    """
-    return vectorized_x_coords_from_angles(angles, domain)
-
-
 class DoubleHelices:
     """
     A container for multiple double helix objects.
@@ -39,7 +28,11 @@ class DoubleHelices:
     Attributes:
         double_helices: A list of DoubleHelix objects.
         nucleic_acid_profile: The nucleic acid profile to use for computations.
-        uuid (str): A unique identifier for the double helices. Automatically generated.
+        uuid (int): A unique identifier for the double helices. Automatically generated.
+        geometry: The HelicesGeometry holding the data of all helices. Set by
+            compute().
+        junctions: The JunctionTable of the junctable NEMid pairs of the design, and
+            which of them are active junctions. Set by strands().
 
     Methods:
         domains: Obtain all the domains of all the double helices in their respective
@@ -47,15 +40,25 @@ class DoubleHelices:
         compute: Compute the point data for each helix. The data will be stored in the
             helices respective x coord, z coord, and angle arrays.
         to_json: Convert the double helices to a JSON serializable dictionary.
+        mate_indices: Obtain the index of the mate of every point of every helix.
+        attach_junctions: Make a junction table the junction table of the design.
+        stable_joints: Obtain whether each helical joint is stable.
     """
 
-    __slots__ = "double_helices", "nucleic_acid_profile", "uuid", "_domains"
+    __slots__ = (
+        "double_helices",
+        "nucleic_acid_profile",
+        "uuid",
+        "geometry",
+        "junctions",
+        "_domains",
+    )
 
     def __init__(
         self,
         double_helices: Iterable["DoubleHelix"] | None,
         nucleic_acid_profile,
-        uuid: str | None = None,
+        uuid: int | None = None,
     ) -> None:
         """
         Initialize a container for DoubleHelix objects.
@@ -70,7 +73,9 @@ class DoubleHelices:
         """
         self.double_helices = double_helices
         self.nucleic_acid_profile = nucleic_acid_profile
-        self.uuid = uuid or str(uuid1())
+        self.uuid = uuid if uuid is not None else new_id()
+        self.geometry = None
+        self.junctions = None
 
     def __len__(self) -> int:
         return len(self.double_helices)
@@ -115,16 +120,20 @@ class DoubleHelices:
             double_helix.domain = new_domains_listed[i]
         self._domains = new_domains
 
-    def to_json(self) -> dict:
+    def to_json(self, file_ids: Callable[[object], int] = live_id) -> dict:
         """
         Convert the double helices to a JSON object.
 
+        Args:
+            file_ids: Obtains the id to refer to each object by. Defaults to the
+                objects' own ids.
+
         Returns:
             A JSON representation of the double helices.
         """
         return {
-            "uuid": self.uuid,
-            "items": [double_helix.uuid for double_helix in self],
+            "uuid": file_ids(self),
+            "items": [file_ids(double_helix) for double_helix in self],
         }
 
     def helices(self) -> Iterator["Helix"]:
@@ -135,6 +144,29 @@ class DoubleHelices:
             yield double_helix.up_helix
             yield double_helix.down_helix
 
+    def mate_indices(self) -> np.ndarray:
+        """
+        Obtain the index of the Watson-Crick mate of every point of every helix.
+
+        Points are indexed in helix id order and then by helical index, the same way
+        that they are laid out in the geometry's buffer.
+
+        Returns:
+            The index of the mate of each point among all the points, or -1 for points
+            that have no mate.
+        """
+        helices = tuple(self.helices())
+        offsets = np.cumsum([0] + [len(helix.data) for helix in helices])
+
+        mates = [np.zeros(0, dtype=int)]
+        for helix_id, helix in enumerate(helices):
+            helix_mates = helix.double_helix.mate_indices(helix.direction)
+            # The other helix of a double helix has the helix id with the other
+            # direction bit
+            other_offset = offsets[helix_id ^ 1]
+            mates.append(np.where(helix_mates < 0, -1, helix_mates + other_offset))
+        return np.concatenate(mates)
+
     def strands(self) -> "Strands":
         """
         Convert all the helices within the double helices within this container to
@@ -162,264 +194,164 @@ class DoubleHelices:
 
         with Timer("Junctability assignment", logger=logger):
             # Assign junctability to each NEMid that superposes a NEMid in a helix of the
-            # subsequent double helix.
-            for index, double_helix in enumerate(double_helices):
-                if index == len(double_helices) - 1:
-                    next_double_helix = double_helices[0]
-                else:
-                    next_double_helix = double_helices[index + 1]
-
-                # Iterate through all the points in the current double helix, and check
-                # if they superpose with any points in the next double helix. Note that
-                # each double helix contains two helices, so we must iterate through all
-                # the points in both helices.
-                for helix1 in double_helix:
-                    for helix2 in next_double_helix:
-                        for point1 in helix1.items[1::2]:
-                            for point2 in helix2.items[1::2]:
-                                # We know that all overlaps are going to be on the
-                                # integer line, so we only need to check points that
-                                # are on the integer line. True, the following
-                                # implementation may sometimes check points that happen
-                                # to have the same decimal value by chance, but we will
-                                # then run the full on overlaps() method afterwards
-                                # anyway. Comparing the decimal value once is much
-                                # faster than checking to see if the %1=0 two times (
-                                # ~2x as fast).
-                                if point1.x_coord % 1 == point2.x_coord % 1:
-                                    if point1.overlaps(
-                                        point2, width=self.domains.count
-                                    ):
-                                        point1.junctable = True
-                                        point1.juncmate = point2
-                                        point2.junctable = True
-                                        point2.juncmate = point1
-
-                                        # fmt: off
-                                        point1.helix.data.right_joint_points.append(point1)
-                                        point2.helix.data.left_joint_points.append(point2)
-                                        # fmt: on
+            # subsequent double helix. It is recorded into the helices' data, so that
+            # the NEMids are only made junctable as they are created.
+            if self.geometry is None or self.geometry.junctable_pair_table is None:
+                table = self._find_junctable_pairs()
+            else:
+                table = self.geometry.junctable_pair_table
+
+            helices = tuple(self.helices())
+            for helix_id1, index1, helix_id2, index2 in table.tolist():
+                helix1, helix2 = helices[helix_id1], helices[helix_id2]
+                helix1.data.set_juncmate(index1, helix2, index2)
+                helix2.data.set_juncmate(index2, helix1, index1)
 
         strands = [helix for double_helix in double_helices for helix in double_helix]
         strands = Strands(
             strands=strands, nucleic_acid_profile=self.nucleic_acid_profile
         )
 
+        self.attach_junctions(JunctionTable.from_pairs(table, len(self)), strands)
         strands.style()
         return strands
 
-    def compute(self) -> None:
+    def _find_junctable_pairs(self) -> np.ndarray:
         """
-        Compute the point data for each helix.
+        Find the pairs of NEMids that superpose a NEMid in the subsequent double helix.
 
-        This computes the x coord, z coord, and angle arrays for each helix. The data
-        is stored in the helices respective x coord, z coord, and angle arrays.
+        The search runs on the helices' coord arrays, so no points are obtained from
+        the helices.
+
+        The pairs are recorded into the geometry's junctable pair table, if there is
+        a geometry, so that they needn't be found again for the same geometry.
+
+        Returns:
+            A (pair count, 4) array of the junctable NEMid pairs. Each row is the
+            helix id and helical index of a NEMid, followed by the helix id and
+            helical index of the NEMid in the subsequent double helix that it
+            superposes.
         """
-        logger.debug("Computing helix data")
-        for index, double_helix in enumerate(self):
-            logger.debug("Starting domain #%s", index + 1)
-            # Create a reference to the previous double helix
-            previous_double_helix = self[index - 1]
-            # Create a reference to the current helical domain
-            domain = double_helix.domain
-
-            if index == 0:
-                # The first domain is a special case. The z coord of the first point
-                # of the first domain is 0.
-                aligned_z_coord = 0
-            else:
-                # The initial z coord for all domains except the zeroth domain is the
-                # z coordinate of the right-most NEMid of the previous double helix's
-                # right joint helix.
-
-                # We surf the list starting at the second item (which we know is a
-                # NEMid based on how we're constructing the helices), and then
-                # continuing every other item (since every other item is a
-                # nucleoside). This is because we only care about NEMids for the
-                # aligning process. Note that ALL helices will start and end with a
-                # nucleoside.
-                aligned_z_coord = previous_double_helix.right_helix.data.z_coords[1::2][
-                    argmax(
-                        previous_double_helix.right_helix.data.x_coords[
-                            1 : self.nucleic_acid_profile.B * 2 + 1 : 2
-                        ]
-                    )
-                ]
-                logger.debug("Aligned_z_coord = %s", aligned_z_coord)
-
-                # Shift down the initial z coord. We can shift it down in increments
-                # of Z_b * B, which we will call the "decrease_interval" (the
-                # interval at which the z coord decreases). This will ensure that all
-                # the aligned z coords are below the x-axis. We will then shift them
-                # upwards later.
-                decrease_interval = abs(
-                    self.nucleic_acid_profile.Z_b * self.nucleic_acid_profile.B
-                )
-                aligned_z_coord = aligned_z_coord % decrease_interval
-                logger.debug("Lowered aligned_z_coord to %s", aligned_z_coord)
-            aligned_angle = 0  # aligned angle is always 0 at left junctable Bill 3/1/23
-
-            # Now determine how many points (nucleosides/NEMids) the initial z coord
-            # is away from the x-axis. We are allowed to shift the z coords so long as
-            # we also increment the angles and x coords accordingly.
-
-            # Increment the starting z coord by the height between bases times the
-            # number of shifts that we must apply to force the initial z coord to be
-            # above the x-axis.
-            initial_z_coord = aligned_z_coord % self.nucleic_acid_profile.Z_b
-            logger.debug(
-                "Initial_z_coord (near x-axis) = %s aligned_z_coord = %s",
-                initial_z_coord,
-                aligned_z_coord,
-            )
-            shifts = round(
-                (initial_z_coord - aligned_z_coord) / self.nucleic_acid_profile.Z_b
-            )
-            # Since we've shifted the z coord, we must also shift the angle accordingly.
-            logger.debug("Shifts = %s", shifts)
-            initial_angle = shifts * self.nucleic_acid_profile.theta_b
-            logger.debug("Initial_angle (near x-axis) = %s", initial_angle)
-            # Note that the x coordinates are generated based off of the angles,
-            # so we don't need to even define an "initial_x_coord" variable.
-
-            # We must take into consideration the "bottom_count" of the zeroed helix.
-            # The bottom count is how many more NEMids down to go, below the "body
-            # count" number of NEMids. It is part of the group of three "count" values.
-            # We will apply these shifts to the initial z coord, and initial angle
-            # that we've just computed.
-            increments = double_helix.zeroed_helix.counts.bottom_count
-            logger.debug("Increments = %s", increments)
-            initial_z_coord = (
-                initial_z_coord
-                - (increments * self.nucleic_acid_profile.Z_b)
-                - (self.nucleic_acid_profile.Z_b / 2)  # Extra nucleoside on bottom
-            )
-            logger.debug("Last value of initial_z_coord = %s", initial_z_coord)
-            initial_angle = (
-                initial_angle
-                - (increments * self.nucleic_acid_profile.theta_b)
-                - (self.nucleic_acid_profile.theta_b / 2)
-            )
-            logger.debug("Initial_angle left strand (final value) = %s", initial_angle)
-            initial_angle = initial_angle % 360.0
-            # This makes the initial angle in range [0°,360°)
-            logger.debug(
-                "Initial_angle left strand (moduloed final value) = %s", initial_angle
+        width = self.domains.count
+        # The rounded coords of the NEMids (every other point) of each helix, in helix
+        # id order. Points are constructed with coords rounded to five decimal places.
+        coords = [
+            (
+                np.round(helix.data.x_coords[1::2], 5).tolist(),
+                np.round(helix.data.z_coords[1::2], 5).tolist(),
             )
+            for helix in self.helices()
+        ]
 
-            # Now we can determine the ending z coord and angle for the zeroed helix.
-            # It is the domain's body_count plus the domain's top_count number of
-            # increments up from the respective initial z coord and angle.
-            increments = (
-                -0.5
-                + double_helix.zeroed_helix.counts.bottom_count
-                + double_helix.zeroed_helix.counts.body_count
-                + double_helix.zeroed_helix.counts.top_count
-            )
-            final_z_coord = initial_z_coord + (
-                increments * self.nucleic_acid_profile.Z_b
-            )  # Extra nucleoside on top
-            final_angle = initial_angle + (
-                increments * self.nucleic_acid_profile.theta_b
-            )
+        table = []
+        for index in range(len(self)):
+            if index == len(self) - 1:
+                next_index = 0
+            else:
+                next_index = index + 1
+
+            # Find all the points in the current double helix that superpose points
+            # in the next double helix. Note that each double helix contains two
+            # helices, so we must check all pairs of helices.
+            for helix_id1 in (2 * index + UP, 2 * index + DOWN):
+                for helix_id2 in (2 * next_index + UP, 2 * next_index + DOWN):
+                    for index1, index2 in junctable_pairs(
+                        *coords[helix_id1], *coords[helix_id2], width
+                    ):
+                        # Convert from NEMid indices to helical indices
+                        index1, index2 = 2 * index1 + 1, 2 * index2 + 1
+                        table.append((helix_id1, index1, helix_id2, index2))
+
+        table = np.array(table, dtype=int).reshape(-1, 4)
+        if self.geometry is not None:
+            self.geometry.junctable_pair_table = table
+        return table
+
+    def attach_junctions(self, junctions: JunctionTable, strands: "Strands") -> None:
+        """
+        Make a junction table the junction table of the design.
 
-            # Compute the z coord and angle data for the zeroed helix; we will
-            # generate the angles based off of the x coords later. Recall that we're
-            # generating for the zeroed helix first because the initial z coord is
-            # defined to be the z coord of the right-most point of the previous
-            # double helix's right joint helix, which makes this domain's left helix
-            # the zeroed helix.
-            padding = -self.nucleic_acid_profile.Z_b / 16
-            double_helix.zeroed_helix.data.z_coords = np.arange(
-                start=initial_z_coord,
-                stop=final_z_coord + padding,  # Make inclusive w/padding
-                step=self.nucleic_acid_profile.Z_b / 2,  # Nucleosides & NEMids
-            )
-            padding = -self.nucleic_acid_profile.theta_b / 16
-            double_helix.zeroed_helix.data.angles = np.arange(
-                start=initial_angle,
-                stop=final_angle + padding,  # Make inclusive w/padding
-                step=self.nucleic_acid_profile.theta_b / 2,  # Nucleosides & NEMids
-            )
-            # The angles are computed based off of the x coords using the predefined
-            # x_coord_from_angles function. The function lives above the
-            # DoubleHelices class in this file.
-            double_helix.zeroed_helix.data.x_coords = x_coords_from_angles(
-                double_helix.zeroed_helix.data.angles, domain
-            )
+        The table is shared by the double helices, each double helix, and the strands
+        derived from them, which keep it up to date when junctions are made.
 
-            # Repeat the same process that we used for the zeroed strand of computing
-            # the arange start and stop values based on domain's helices' generation
-            # counts.
-
-            # However, note that there is an offset this time for the z coords and
-            # angles, which we must take into account.
-
-            modifier = -1 if double_helix.other_helix.direction == DOWN else 1
-            logger.debug("Modifier = %s, index = %s", modifier, index)
-
-            # Adjust the aligned z coord and angle since this is for the other helix.
-            # Note that we're overwriting the initial_z_coord and initial_angle,
-            # which is OK since we've already computed the zeroed helix's data and
-            # won't need the previous "initial" values.
-            increments = double_helix.other_helix.counts.bottom_count
-            initial_angle = (
-                aligned_angle  # The previously aligned angle of the left helix
-                + (
-                    shifts * self.nucleic_acid_profile.theta_b
-                )  # locates angle of NEMid nearest x-axis
-                + (
-                    -modifier * self.nucleic_acid_profile.g
-                )  # Helix switch to other helix
-                - (increments * self.nucleic_acid_profile.theta_b)
-                - (self.nucleic_acid_profile.theta_b / 2)  # Extra nucleoside on bottom
-            )
-            initial_z_coord = (
-                aligned_z_coord  # The previously aligned z coord
-                + (
-                    shifts * self.nucleic_acid_profile.Z_b
-                )  # locates z of NEMid nearest x-axis
-                + (-modifier * self.nucleic_acid_profile.Z_mate)  # Helix switch
-                - (increments * self.nucleic_acid_profile.Z_b)
-                - (self.nucleic_acid_profile.Z_b / 2)  # Extra nucleoside on bottom
-            )
+        Args:
+            junctions: The junction table.
+            strands: The strands derived from the double helices.
+        """
+        self.junctions = junctions
+        for double_helix in self:
+            double_helix.junctions = junctions
+        strands.junctions = junctions
 
-            # Same procedure as for the zeroed helix.
-            increments = (
-                -0.5
-                + double_helix.other_helix.counts.bottom_count
-                + double_helix.other_helix.counts.body_count
-                + double_helix.other_helix.counts.top_count
-            )
-            final_angle = initial_angle + increments * self.nucleic_acid_profile.theta_b
-            final_z_coord = initial_z_coord + increments * self.nucleic_acid_profile.Z_b
-
-            # Compute the z coord and angle data for the other helix.
-            padding = -self.nucleic_acid_profile.Z_b / 16
-            double_helix.other_helix.data.z_coords = np.arange(
-                start=initial_z_coord,
-                stop=final_z_coord + padding,  # Make inclusive w/padding
-                step=self.nucleic_acid_profile.Z_b / 2,  # Nucleosides & NEMids
-            )
-            padding = -self.nucleic_acid_profile.theta_b / 16
-            double_helix.other_helix.data.angles = np.arange(
-                start=initial_angle,
-                stop=final_angle + padding,  # Make inclusive w/padding
-                step=self.nucleic_acid_profile.theta_b / 2,  # Nucleosides & NEMids
-            )
-            double_helix.other_helix.data.x_coords = x_coords_from_angles(
-                double_helix.other_helix.data.angles, domain
-            )
+    def stable_joints(self, threshold: int = 2) -> np.ndarray:
+        """
+        Obtain whether each helical joint is stable.
 
-            # Now reverse the items in the down helix, whichever the zeroed helix may
-            # be. It could be either the zeroed helix or the other helix, but we'll
-            # just reference it with double_helix.down_helix.
-            double_helix.down_helix.data.z_coords = np.flip(
-                double_helix.down_helix.data.z_coords
-            )
-            double_helix.down_helix.data.angles = np.flip(
-                double_helix.down_helix.data.angles
-            )
-            double_helix.down_helix.data.x_coords = np.flip(
-                double_helix.down_helix.data.x_coords
+        Joint i is the joint between the right side of double helix i and the left
+        side of double helix i + 1, wrapping around to the first double helix.
+
+        Args:
+            threshold: The number of active junctions that must be present in order
+                for a joint to be considered stable.
+
+        Returns:
+            An array of whether each joint is stable.
+        """
+        if self.junctions is None:
+            return np.zeros(len(self), dtype=bool)
+        return self.junctions.stable(threshold)
+
+    def compute(
+        self,
+        previous: "DoubleHelices" = None,
+        geometry: HelicesGeometry | None = None,
+    ) -> None:
+        """
+        Compute the point data for each helix.
+
+        This computes the x coord, z coord, and angle arrays for each helix. The data
+        for all helices is computed into one shared buffer (see HelicesGeometry), and
+        each helix's x coord, z coord, and angle arrays are views into that buffer.
+
+        Args:
+            previous: Previously computed double helices. If passed, then double
+                helices whose domains are unchanged and still line up with their
+                previous domain the same way are taken over from the previous double
+                helices, along with their points, instead of being recomputed.
+            geometry: A precomputed geometry for these double helices, such as one
+                loaded from the geometry cache. If passed, then nothing is computed
+                and the helices' data arrays are pointed at it.
+        """
+        if geometry is not None:
+            logger.debug("Using precomputed helix data")
+            self.geometry = geometry
+        else:
+            logger.debug("Computing helix data")
+            self.geometry = compute_geometry(
+                [double_helix.domain for double_helix in self],
+                self.nucleic_acid_profile,
+                None if previous is None else previous.geometry,
             )
+
+        # Take over the unchanged double helices, which keeps their uuids and helices
+        # intact. Their domains are replaced with the (equivalent) new domains.
+        for index in np.flatnonzero(self.geometry.reused):
+            previous[index].domain = self[index].domain
+            self[index] = previous[index]
+        logger.debug("Reused %s double helices", np.count_nonzero(self.geometry.reused))
+
+        # Point each helix's data arrays at its region of the shared buffer. Helices
+        # are yielded up helix then down helix, for each double helix, which is the
+        # same order as the geometry's helix ids.
+        reused = np.repeat(self.geometry.reused, 2)
+        for helix_id, helix in enumerate(self.helices()):
+            (
+                helix.data.x_coords,
+                helix.data.z_coords,
+                helix.data.angles,
+            ) = self.geometry.views(helix_id)
+            # Points materialized from the old data arrays of changed helices are
+            # stale. The points and store of reused helices still match their data,
+            # so they are kept, and are handed to the new strands by strands().
+            if not reused[helix_id]:
+                helix.data.clear_points()
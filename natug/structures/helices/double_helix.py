@@ -1,16 +1,38 @@
 import logging
-from uuid import uuid1
+from typing import Callable
 
+import numpy as np
 import pandas as pd
 
 from natug.constants.directions import DOWN, UP
 from natug.structures.helices.helix import Helix
-from natug.structures.points import NEMid
-from natug.utils import inverse, remove_duplicates
+from natug.structures.ids import live_id, new_id
+from natug.utils import inverse
 
 logger = logging.getLogger(__name__)
 
 
+def mate_indices(size: int, other_size: int) -> np.ndarray:
+    """
+    Obtain the helical index of the Watson-Crick mate of each point of a helix.
+
+    The two helices of a double helix run antiparallel, so the mate of the point at
+    helical index i is the point at helical index other_size - 1 - i of the other
+    helix.
+
+    Args:
+        size: The number of points of the helix.
+        other_size: The number of points of the other helix of the double helix.
+
+    Returns:
+        The helical index of the mate of each point within the other helix, or -1
+        for points that have no mate.
+    """
+    mates = other_size - 1 - np.arange(size)
+    mates[mates < 0] = -1
+    return mates
+
+
 class DoubleHelix:
     """
     A container storing the two helices of a double helix.
@@ -40,8 +62,12 @@ class DoubleHelix:
             to be considered stable.
         right_joint_is_stable: Whether the right helical joint has enough active
             junctions to be considered stable.
-        uuid: The UUID of the double helix. This is automatically generated when the
-            double helix is created.
+        uuid: The compact integer id of the double helix. This is automatically
+            generated when the double helix is created.
+        junctions: The JunctionTable of the design that the double helix belongs to.
+            None until the design's double helices are converted to strands.
+        mates: The helical indices of the Watson-Crick mates of the points of each
+            helix, keyed by the sizes of the helices that they were computed for.
 
     Methods:
         to_csv: Write the double helix to a CSV file.
@@ -51,16 +77,17 @@ class DoubleHelix:
             junctions to be considered stable.
         right_helix_joint_is_stable: Whether the right helical joint has enough active
             junctions to be considered stable.
+        mate_indices: Obtain the helical index of the mate of each point of a helix.
     """
 
-    __slots__ = "domain", "helices", "uuid"
+    __slots__ = "domain", "helices", "uuid", "junctions", "mates"
 
     def __init__(
         self,
         domain: "Domain",
         up_helix: Helix | None = None,
         down_helix: Helix | None = None,
-        uuid: str | None = None,
+        uuid: int | None = None,
         resize_helices: bool = True,
     ) -> None:
         """
@@ -72,13 +99,15 @@ class DoubleHelix:
                 None, a new and empty helix will be created.
             down_helix: The helix that progresses downwards from its 5' to 3' end. If
                 None, a new and empty helix will be created.
-            uuid: The UUID of the double helix. If None, a new UUID will be created.
+            uuid: The id of the double helix. If None, a new id will be allocated.
             resize_helices: Whether to resize the helices to the size of the domain's
                 GenerationCount.
         """
         self.domain = domain
         self.helices = [None, None]
-        self.uuid = uuid or str(uuid1())
+        self.uuid = uuid if uuid is not None else new_id()
+        self.junctions = None
+        self.mates = None
 
         if up_helix is not None:
             logger.debug("Using passed up helix.")
@@ -120,6 +149,29 @@ class DoubleHelix:
         """
         return self.helices[index]
 
+    def mate_indices(self, direction: int) -> np.ndarray:
+        """
+        Obtain the helical index of the Watson-Crick mate of each point of a helix.
+
+        The indices are computed once for the current sizes of the helices, and are
+        then reused until the helices are resized.
+
+        Args:
+            direction: The direction of the helix. Either UP or DOWN.
+
+        Returns:
+            The helical index of the mate of each point of the helix within the other
+            helix, or -1 for points that have no mate.
+        """
+        sizes = (len(self.helices[UP].data), len(self.helices[DOWN].data))
+        if self.mates is None or self.mates[0] != sizes:
+            up_size, down_size = sizes
+            self.mates = (
+                sizes,
+                (mate_indices(up_size, down_size), mate_indices(down_size, up_size)),
+            )
+        return self.mates[1][direction]
+
     @property
     def left_helix(self) -> Helix:
         """
@@ -164,37 +216,57 @@ class DoubleHelix:
         """
         return self.helices[inverse(self.domain.left_helix_joint)]
 
+    def _joint_points(self, joint: int, side: int) -> list:
+        """
+        Get a list of the points of this double helix that lie on a helical joint.
+
+        Args:
+            joint: The joint to get the points of.
+            side: The column of the junction table that holds this double helix's
+                NEMids of the joint. 0 for the right joint and 2 for the left joint.
+
+        Returns:
+            The points of the joint.
+        """
+        if self.junctions is None:
+            return []
+        pairs = self.junctions.pairs[self.junctions.joint_rows(joint)]
+        return [
+            self.helices[helix_id % 2][index]
+            for helix_id, index in dict.fromkeys(
+                map(tuple, pairs[:, side : side + 2].tolist())
+            )
+        ]
+
     def left_helix_joint_points(self) -> list:
         """Get a list of all points on the left helix joint."""
-        return remove_duplicates(
-            self.left_helix.data.left_joint_points
-            + self.right_helix.data.left_joint_points
-        )
+        return self._joint_points(self._left_joint(), 2)
 
     def right_helix_joint_points(self) -> list:
         """Get a list of all points on the right helix joint."""
-        return remove_duplicates(
-            self.left_helix.data.right_joint_points
-            + self.right_helix.data.right_joint_points
-        )
+        return self._joint_points(self._right_joint(), 0)
 
-    def _joint_is_stable(self, threshold: int, points: list):
+    def _left_joint(self) -> int:
+        """The index of the left helical joint in the junction table."""
+        return (self.domain.index - 1) % self.junctions.joint_count
+
+    def _right_joint(self) -> int:
+        """The index of the right helical joint in the junction table."""
+        return self.domain.index
+
+    def _joint_is_stable(self, threshold: int, joint: int) -> bool:
         """
         Determine whether a helical joint is stable.
 
         Args:
             threshold: The number of active junctions that must be present in order
                 for the joint to be considered stable.
-            points: The points of the helical joint.
+            joint: The index of the helical joint in the junction table.
 
         Returns:
             Whether the helical joint is stable.
         """
-        active_junctions = 0
-        for point in points:
-            if isinstance(point, NEMid) and point.junction:
-                active_junctions += 1
-        return active_junctions >= threshold
+        return bool(self.junctions.stable(threshold)[joint])
 
     def left_joint_is_stable(self, threshold: int = 2):
         """
@@ -207,7 +279,9 @@ class DoubleHelix:
         Returns:
             Whether the left helical joint is stable.
         """
-        return self._joint_is_stable(threshold, self.left_helix_joint_points())
+        if self.junctions is None:
+            return threshold <= 0
+        return self._joint_is_stable(threshold, self._left_joint())
 
     def right_joint_is_stable(self, threshold: int = 2):
         """
@@ -220,22 +294,29 @@ class DoubleHelix:
         Returns:
             Whether the right helical joint is stable.
         """
-        return self._joint_is_stable(threshold, self.right_helix_joint_points())
+        if self.junctions is None:
+            return threshold <= 0
+        return self._joint_is_stable(threshold, self._right_joint())
 
 
-def to_df(double_helices) -> pd.DataFrame:
+def to_df(double_helices, file_ids: Callable[[object], int] = live_id) -> pd.DataFrame:
     """
     Obtain a pandas dataframe of many double helices.
 
+    Args:
+        double_helices: The double helices to export.
+        file_ids: Obtains the id to refer to each object by. Defaults to the
+            objects' own ids.
+
     Returns:
         A pandas dataframe containing many double helices.
     """
     data = {"uuid": [], "data:domain": [], "data:up_helix": [], "data:down_helix": []}
 
     for double_helix in double_helices:
-        data["uuid"].append(double_helix.uuid)
+        data["uuid"].append(file_ids(double_helix))
         data["data:domain"].append(double_helix.domain.index)
-        data["data:up_helix"].append(double_helix.up_helix.uuid)
-        data["data:down_helix"].append(double_helix.down_helix.uuid)
+        data["data:up_helix"].append(file_ids(double_helix.up_helix))
+        data["data:down_helix"].append(file_ids(double_helix.down_helix))
 
     return pd.DataFrame(data)
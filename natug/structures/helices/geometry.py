@@ -0,0 +1,514 @@
+import logging
+from dataclasses import dataclass
+from collections import defaultdict
+from typing import Dict, Iterator, List, Sequence, Tuple
+
+import numpy as np
+
+from natug.constants.directions import DOWN, UP
+from natug.structures.points.point import x_coords_from_angles
+
+logger = logging.getLogger(__name__)
+
+
+def arange_values(
+    start: np.ndarray, step: np.ndarray, positions: np.ndarray
+) -> np.ndarray:
+    """
+    Obtain the values that np.arange(start, <stop>, step) holds at given positions.
+
+    np.arange places start and start + step in its first two slots, and then fills
+    the remaining slots with start + i * delta, where delta is the (rounded) difference
+    between the first two slots. This function reproduces that exactly, so that
+    batched generation yields the same floats as generating each helix with its own
+    np.arange call.
+
+    Args:
+        start: The start value(s) of the range(s).
+        step: The step value(s) of the range(s).
+        positions: The position(s) within the range(s) to obtain values for.
+
+    Returns:
+        The values at the positions, in the broadcast shape of the inputs.
+    """
+    second = start + step
+    values = start + positions * (second - start)
+    values = np.where(positions == 1, second, values)
+    values = np.where(positions == 0, start, values)
+    return values
+
+
+@dataclass(slots=True)
+class HelicesGeometry:
+    """
+    The positional data of every helix of every domain, stored as structure of arrays.
+
+    All helices share one contiguous buffer. Helices are ordered the same way that
+    DoubleHelices.helices() yields them: the up helix and then the down helix of each
+    double helix, in domain order. The helix id of a helix is thus 2 * domain index +
+    direction. Data for down helices is stored top to bottom, so that the data for
+    every helix is ordered by helical index.
+
+    Attributes:
+        coords: A (3, point count) array. The rows are the x coords, z coords,
+            and angles of all the points of all the helices.
+        helix_ids: The helix id of each point.
+        helical_indices: The index of each point within its helix.
+        offsets: The index in the buffer that each helix begins at. There is one
+            extra trailing entry that is the total point count.
+        z_starts: The z coord that each helix's generation began at.
+        angle_starts: The angle that each helix's generation began at.
+        signatures: The signature of each domain that the geometry was computed for.
+        profile_key: The parameters of the nucleic acid profile that the geometry was
+            computed with.
+        reused: Whether each domain's data was reused from a previous geometry.
+        junctable_pair_table: A (pair count, 4) array of the junctable NEMid pairs,
+            recorded when the geometry is first converted to strands. Each row is the
+            helix id and helical index of a NEMid, followed by the helix id and
+            helical index of the NEMid that it is junctable with. None until recorded.
+
+    Methods:
+        from_arrays: Rebuild a geometry from the arrays that define it.
+        bounds: Obtain the start and stop index of a helix within the buffer.
+        views: Obtain views of the x coords, z coords, and angles of a helix.
+    """
+
+    coords: np.ndarray
+    helix_ids: np.ndarray
+    helical_indices: np.ndarray
+    offsets: np.ndarray
+    z_starts: np.ndarray
+    angle_starts: np.ndarray
+    signatures: List[tuple]
+    profile_key: tuple
+    reused: np.ndarray
+    junctable_pair_table: np.ndarray | None = None
+
+    @classmethod
+    def from_arrays(
+        cls,
+        coords: np.ndarray,
+        offsets: np.ndarray,
+        z_starts: np.ndarray,
+        angle_starts: np.ndarray,
+        signatures: List[tuple],
+        profile_key: tuple,
+        junctable_pair_table: np.ndarray | None = None,
+    ) -> "HelicesGeometry":
+        """
+        Rebuild a geometry from the arrays that define it.
+
+        The per-point helix ids and helical indices are derived from the offsets.
+
+        Args:
+            coords: The (3, point count) array of x coords, z coords, and angles.
+            offsets: The index in the buffer that each helix begins at, plus the
+                total point count.
+            z_starts: The z coord that each helix's generation began at.
+            angle_starts: The angle that each helix's generation began at.
+            signatures: The signature of each domain.
+            profile_key: The parameters of the nucleic acid profile.
+            junctable_pair_table: The junctable NEMid pairs, if they are known.
+
+        Returns:
+            The rebuilt HelicesGeometry.
+        """
+        sizes = np.diff(offsets)
+        helix_ids = np.repeat(np.arange(len(sizes)), sizes)
+        return cls(
+            coords=coords,
+            helix_ids=helix_ids,
+            helical_indices=np.arange(offsets[-1]) - offsets[helix_ids],
+            offsets=offsets,
+            z_starts=z_starts,
+            angle_starts=angle_starts,
+            signatures=signatures,
+            profile_key=profile_key,
+            reused=np.zeros(len(signatures), dtype=bool),
+            junctable_pair_table=junctable_pair_table,
+        )
+
+    def __len__(self) -> int:
+        """The number of points of all helices."""
+        return self.coords.shape[1]
+
+    @property
+    def x_coords(self) -> np.ndarray:
+        return self.coords[0]
+
+    @property
+    def z_coords(self) -> np.ndarray:
+        return self.coords[1]
+
+    @property
+    def angles(self) -> np.ndarray:
+        return self.coords[2]
+
+    @property
+    def helix_count(self) -> int:
+        """The number of helices that the geometry holds data for."""
+        return len(self.offsets) - 1
+
+    def bounds(self, helix_id: int) -> Tuple[int, int]:
+        """
+        Obtain the start and stop index of a helix's data within the buffer.
+
+        Args:
+            helix_id: The id of the helix.
+
+        Returns:
+            A tuple of the start and stop index.
+        """
+        return int(self.offsets[helix_id]), int(self.offsets[helix_id + 1])
+
+    def views(self, helix_id: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Obtain zero-copy views of a helix's data.
+
+        Args:
+            helix_id: The id of the helix.
+
+        Returns:
+            A tuple of the helix's x coords, z coords, and angles.
+        """
+        start, stop = self.bounds(helix_id)
+        return (
+            self.coords[0, start:stop],
+            self.coords[1, start:stop],
+            self.coords[2, start:stop],
+        )
+
+
+def profile_key(nucleic_acid_profile) -> tuple:
+    """
+    Obtain the parameters of a nucleic acid profile that helix geometry depends on.
+
+    Args:
+        nucleic_acid_profile: The nucleic acid profile.
+
+    Returns:
+        A tuple of Z_b, theta_b, g, Z_mate, and B.
+    """
+    return (
+        nucleic_acid_profile.derived.Z_b,
+        nucleic_acid_profile.derived.theta_b,
+        nucleic_acid_profile.g,
+        nucleic_acid_profile.Z_mate,
+        nucleic_acid_profile.B,
+    )
+
+
+def compute_geometry(
+    domains: List["Domain"],
+    nucleic_acid_profile,
+    previous: HelicesGeometry | None = None,
+) -> HelicesGeometry:
+    """
+    Compute the x coord, z coord, and angle data of all helices of many domains.
+
+    The computation runs in two stages:
+        1) An alignment pass over the domains. Each domain's helices are aligned to the
+            right joint helix of the previous domain, which is an inherently
+            sequential dependency. This pass only computes a handful of scalars per
+            helix (the start value of its z coords and angles) and looks at no more
+            than B NEMids of the previous domain.
+        2) A batched generation pass, which fills the shared buffer for every helix
+            of every domain at once. Helices whose angles are identical to those of
+            an earlier helix (such as the helices of all but the first subunit of a
+            symmetrical Domains) replicate that helix's angles and x coords.
+
+    If a previous geometry is passed, then domains that are unchanged since then are
+    reused. Alignment begins at the first changed domain, and an unchanged domain
+    whose helices align to the same start values as before (which happens once the
+    alignment "catches up" again after a change) is reused along with all the
+    unchanged domains that follow it. Reused data is copied from the previous
+    buffer instead of being generated.
+
+    Args:
+        domains: The domains to compute helix data for, in order.
+        nucleic_acid_profile: The nucleic acid profile to use for computations.
+        previous: A previously computed geometry to reuse unchanged domains from.
+
+    Returns:
+        The computed HelicesGeometry.
+    """
+    Z_b = nucleic_acid_profile.derived.Z_b
+    theta_b = nucleic_acid_profile.derived.theta_b
+    g = nucleic_acid_profile.g
+    Z_mate = nucleic_acid_profile.Z_mate
+    B = nucleic_acid_profile.B
+
+    signatures = [domain.signature for domain in domains]
+    key = profile_key(nucleic_acid_profile)
+    if previous is not None and previous.profile_key != key:
+        previous = None
+
+    helix_count = 2 * len(domains)
+    z_starts = np.zeros(helix_count)
+    angle_starts = np.zeros(helix_count)
+    sizes = np.zeros(helix_count, dtype=int)
+    theta_es = np.zeros(helix_count)
+    theta_is = np.zeros(helix_count)
+    indices = np.zeros(helix_count, dtype=int)
+    reused = np.zeros(len(domains), dtype=bool)
+
+    # Shift the aligned z coords down in increments of Z_b * B, which we call the
+    # "decrease interval." This ensures that all the aligned z coords lie below the
+    # x-axis. They get shifted upwards later.
+    decrease_interval = abs(Z_b * B)
+
+    for index, domain in enumerate(domains):
+        theta_e, theta_i = domain.theta_e, domain.theta_i
+        counts = (domain.up_helix_count, domain.down_helix_count)
+        zeroed, other = domain.left_helix_joint, int(not domain.left_helix_joint)
+        helices = slice(2 * index, 2 * index + 2)
+
+        for direction in (UP, DOWN):
+            helix_id = 2 * index + direction
+            # There is a NEMid and a nucleoside per count, less the last NEMid
+            sizes[helix_id] = max(2 * sum(counts[direction]) - 1, 0)
+            theta_es[helix_id] = theta_e
+            theta_is[helix_id] = theta_i
+            indices[helix_id] = domain.index
+
+        unchanged = (
+            previous is not None
+            and index < len(previous.signatures)
+            and signatures[index] == previous.signatures[index]
+        )
+
+        # An unchanged domain aligns to the previous domain exactly like it did last
+        # time if the previous domain was reused too, so it needn't be aligned.
+        if unchanged and (index == 0 or reused[index - 1]):
+            logger.debug("Reusing domain #%s", index + 1)
+            z_starts[helices] = previous.z_starts[helices]
+            angle_starts[helices] = previous.angle_starts[helices]
+            reused[index] = True
+            continue
+
+        logger.debug("Aligning domain #%s", index + 1)
+        if index == 0:
+            # The first domain is a special case. The z coord of the first point of
+            # the first domain is 0.
+            aligned_z_coord = 0
+        else:
+            # The initial z coord for all domains except the zeroth domain is the z
+            # coord of the right-most NEMid (of the first B NEMids) of the previous
+            # double helix's right joint helix.
+            aligned_z_coord = _right_most_NEMid_z_coord(
+                2 * (index - 1) + domains[index - 1].right_helix_joint,
+                z_starts,
+                angle_starts,
+                sizes,
+                theta_es,
+                theta_is,
+                indices,
+                Z_b,
+                theta_b,
+                B,
+            )
+            aligned_z_coord = aligned_z_coord % decrease_interval
+        aligned_angle = 0  # aligned angle is always 0 at left junctable Bill 3/1/23
+
+        # Determine how many points the aligned z coord is away from the x-axis. We
+        # are allowed to shift the z coords so long as we also increment the angles
+        # (and thus x coords) accordingly.
+        initial_z_coord = aligned_z_coord % Z_b
+        shifts = round((initial_z_coord - aligned_z_coord) / Z_b)
+        initial_angle = shifts * theta_b
+
+        # Apply the zeroed helix's bottom count, plus an extra nucleoside on the bottom.
+        increments = counts[zeroed].bottom_count
+        helix_id = 2 * index + zeroed
+        z_starts[helix_id] = initial_z_coord - (increments * Z_b) - (Z_b / 2)
+        angle_starts[helix_id] = (
+            initial_angle - (increments * theta_b) - (theta_b / 2)
+        ) % 360.0
+
+        # The other helix is offset from the zeroed helix by the nucleoside-mate
+        # angle and height.
+        modifier = -1 if other == DOWN else 1
+        increments = counts[other].bottom_count
+        helix_id = 2 * index + other
+        angle_starts[helix_id] = (
+            aligned_angle
+            + (shifts * theta_b)
+            + (-modifier * g)
+            - (increments * theta_b)
+            - (theta_b / 2)
+        )
+        z_starts[helix_id] = (
+            aligned_z_coord
+            + (shifts * Z_b)
+            + (-modifier * Z_mate)
+            - (increments * Z_b)
+            - (Z_b / 2)
+        )
+
+        # The alignment has caught up with the previous computation.
+        reused[index] = (
+            unchanged
+            and np.array_equal(z_starts[helices], previous.z_starts[helices])
+            and np.array_equal(angle_starts[helices], previous.angle_starts[helices])
+        )
+
+    # Build the shared buffer. Every point knows its helix and position along the
+    # helix, and the position along the helix determines how many steps away from
+    # the helix's start values the point lies.
+    offsets = np.zeros(helix_count + 1, dtype=int)
+    np.cumsum(sizes, out=offsets[1:])
+    helix_ids = np.repeat(np.arange(helix_count), sizes)
+    helical_indices = np.arange(offsets[-1]) - offsets[helix_ids]
+    coords = np.empty((3, offsets[-1]))
+
+    # Copy the data of the reused domains over from the previous buffer.
+    for index in np.flatnonzero(reused):
+        start, stop = offsets[2 * index], offsets[2 * index + 2]
+        previous_start = previous.offsets[2 * index]
+        coords[:, start:stop] = previous.coords[
+            :, previous_start : previous_start + stop - start
+        ]
+
+    # Helices that share a direction, size, starting angle, and domain angles have
+    # identical angles, and x coords that only differ by their domain's index. This is
+    # the case for most helices of symmetrical Domains, whose subunits are copies of
+    # one another. Only the first helix of each kind (its "source") has its angles
+    # and x coords computed; the rest replicate them.
+    sources = np.arange(helix_count)
+    first_of_kind = {}
+    for helix_id in np.flatnonzero(~np.repeat(reused, 2)):
+        kind = (
+            helix_id % 2,
+            sizes[helix_id],
+            angle_starts[helix_id],
+            theta_es[helix_id],
+            theta_is[helix_id],
+        )
+        sources[helix_id] = first_of_kind.setdefault(kind, helix_id)
+
+    # Generate the data of all the other domains in one pass. The z coords of
+    # replicas drift from those of their sources by a few ulps over many subunits,
+    # so they are generated for every helix.
+    generate = ~reused[helix_ids // 2]
+    generated_ids = helix_ids[generate]
+    generated_indices = helical_indices[generate]
+
+    # Down helices are stored top to bottom, so their steps run backwards.
+    steps = np.where(
+        generated_ids % 2 == DOWN,
+        sizes[generated_ids] - 1 - generated_indices,
+        generated_indices,
+    )
+    coords[1, generate] = arange_values(z_starts[generated_ids], Z_b / 2, steps)
+
+    # Compute the angles and the x coords of the sources, without their domain's
+    # index added to the x coords yet.
+    source = generate & (sources[helix_ids] == helix_ids)
+    is_source = source[generate]
+    source_ids = generated_ids[is_source]
+    angles = arange_values(angle_starts[source_ids], theta_b / 2, steps[is_source])
+    coords[2, source] = angles
+    coords[0, source] = x_coords_from_angles(
+        angles, theta_es[source_ids], theta_is[source_ids], 0
+    )
+
+    # Replicate the angles and x coords of the sources.
+    replicas = np.flatnonzero(sources != np.arange(helix_count))
+    logger.debug("Replicating %s of %s helices", len(replicas), helix_count)
+    for helix_id in replicas:
+        start, stop = offsets[helix_id], offsets[helix_id + 1]
+        source_start = offsets[sources[helix_id]]
+        source_stop = source_start + stop - start
+        coords[2, start:stop] = coords[2, source_start:source_stop]
+        coords[0, start:stop] = coords[0, source_start:source_stop] + indices[helix_id]
+    coords[0, source] += indices[source_ids]
+
+    return HelicesGeometry(
+        coords=coords,
+        helix_ids=helix_ids,
+        helical_indices=helical_indices,
+        offsets=offsets,
+        z_starts=z_starts,
+        angle_starts=angle_starts,
+        signatures=signatures,
+        profile_key=key,
+        reused=reused,
+    )
+
+
+def _right_most_NEMid_z_coord(
+    helix_id: int,
+    z_starts: np.ndarray,
+    angle_starts: np.ndarray,
+    sizes: np.ndarray,
+    theta_es: np.ndarray,
+    theta_is: np.ndarray,
+    indices: np.ndarray,
+    Z_b: float,
+    theta_b: float,
+    B: int,
+) -> float:
+    """
+    Obtain the z coord of the right-most of the first B NEMids of an aligned helix.
+
+    Only the NEMids (every other point, starting at the second) are considered, since
+    only NEMids matter for the aligning process.
+    """
+    size = sizes[helix_id]
+    helical_indices = np.arange(1, min(2 * B + 1, size), 2)
+    steps = size - 1 - helical_indices if helix_id % 2 == DOWN else helical_indices
+
+    angles = arange_values(angle_starts[helix_id], theta_b / 2, steps)
+    x_coords = x_coords_from_angles(
+        angles, theta_es[helix_id], theta_is[helix_id], indices[helix_id]
+    )
+    step = steps[np.argmax(x_coords)]
+    return float(arange_values(z_starts[helix_id], Z_b / 2, step))
+
+
+def junctable_pairs(
+    x_coords1: Sequence[float],
+    z_coords1: Sequence[float],
+    x_coords2: Sequence[float],
+    z_coords2: Sequence[float],
+    width: int,
+) -> Iterator[Tuple[int, int]]:
+    """
+    Find all pairs of overlapping points between two sets of point coords.
+
+    Rather than checking every point of the first set against every point of the
+    second set, the points of the second set are hashed by their lattice key (their
+    position), and each point of the first set looks up its partners. The side view
+    wraps around, so x=0 and x=width are treated as the same seam: a point on one
+    edge of the seam also looks up the key of the matching location on the other
+    edge.
+
+    Args:
+        x_coords1: The x coords of the first set of points.
+        z_coords1: The z coords of the first set of points.
+        x_coords2: The x coords of the second set of points.
+        z_coords2: The z coords of the second set of points.
+        width: The width of the side view, which is the number of domains.
+
+    Yields:
+        Tuples of (index1, index2) for each pair of overlapping points, in the same
+        order as checking every point of the second set for every point of the first.
+
+    Notes:
+        The coords must already be rounded to the lattice that Point.overlaps()
+        checks for equality, which is five decimal places (the precision that points
+        are constructed with).
+    """
+    lattice: Dict[Tuple[float, float], List[int]] = defaultdict(list)
+    for index, key in enumerate(zip(x_coords2, z_coords2)):
+        lattice[key].append(index)
+
+    for index1, (x_coord, z_coord) in enumerate(zip(x_coords1, z_coords1)):
+        matches = lattice.get((x_coord, z_coord), [])
+        # Points on the seam also overlap with points on the other edge of the seam
+        if x_coord == 0 and (width, z_coord) in lattice:
+            matches = sorted((*matches, *lattice[width, z_coord]))
+        elif x_coord == width and (0, z_coord) in lattice:
+            matches = sorted((*matches, *lattice[0, z_coord]))
+        for index2 in matches:
+            yield index1, index2
@@ -0,0 +1,195 @@
+import hashlib
+import json
+import logging
+import os
+from typing import List
+
+import numpy as np
+
+from natug.structures.helices.geometry import HelicesGeometry, profile_key
+
+logger = logging.getLogger(__name__)
+
+
+class GeometryCache:
+    """
+    An on-disk cache of computed helix geometries.
+
+    Geometries are keyed by a hash of the domains' settings (their dataframe without
+    uuids) and the nucleic acid profile's numeric parameters. Each entry is a
+    compact binary NumPy archive holding the x coord, z coord, and angle buffer, the
+    helix offsets and start values, and the junctable pair table.
+
+    The cache holds at most <capacity> entries. Entries are touched whenever they
+    are loaded, and the least recently used entries are removed once the cache is
+    full.
+
+    Attributes:
+        directory: The directory that the cache's entries are stored in.
+        capacity: The maximum number of entries that the cache holds.
+
+    Methods:
+        key: Obtain the cache key of a domains and nucleic acid profile.
+        load: Load a cached geometry.
+        store: Store a geometry in the cache.
+        clear: Remove all entries from the cache.
+    """
+
+    # The version of the entries' format. Entries of other versions are stale.
+    format_version = 1
+
+    def __init__(self, directory: str, capacity: int) -> None:
+        """
+        Initialize a geometry cache.
+
+        Args:
+            directory: The directory to store the cache's entries in. It is created
+                if it does not exist.
+            capacity: The maximum number of entries that the cache holds.
+        """
+        self.directory = directory
+        self.capacity = capacity
+        os.makedirs(self.directory, exist_ok=True)
+
+    @staticmethod
+    def key(domains: "Domains", nucleic_acid_profile) -> str:
+        """
+        Obtain the cache key of a domains and nucleic acid profile.
+
+        Args:
+            domains: The domains that the geometry is for.
+            nucleic_acid_profile: The nucleic acid profile that the geometry is for.
+
+        Returns:
+            A hex digest that is the same for identical settings.
+        """
+        profile = {
+            parameter: getattr(nucleic_acid_profile, parameter)
+            for parameter in ("D", "H", "g", "T", "B", "Z_c", "Z_mate")
+        }
+        digest = hashlib.sha256()
+        digest.update(domains.to_df(include_uuid=False).to_csv(index=False).encode())
+        digest.update(json.dumps(profile, sort_keys=True).encode())
+        return digest.hexdigest()
+
+    def _filepath(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.npz")
+
+    def load(
+        self, key: str, domains: List["Domain"], nucleic_acid_profile
+    ) -> HelicesGeometry | None:
+        """
+        Load a cached geometry.
+
+        The entry is checked against the domains it is being loaded for. Entries that
+        are corrupt, of an old format, or that don't fit the domains are stale, and
+        are removed.
+
+        Args:
+            key: The cache key of the geometry.
+            domains: The domains that the geometry is being loaded for.
+            nucleic_acid_profile: The nucleic acid profile that the geometry is being
+                loaded for.
+
+        Returns:
+            The cached geometry, or None if there is no fresh entry for the key.
+        """
+        filepath = self._filepath(key)
+        if not os.path.exists(filepath):
+            return None
+
+        try:
+            with np.load(filepath) as entry:
+                arrays = {name: entry[name] for name in entry.files}
+            fresh = (
+                int(arrays["format_version"]) == self.format_version
+                and str(arrays["key"]) == key
+                and len(arrays["offsets"]) == 2 * len(domains) + 1
+                and np.array_equal(np.diff(arrays["offsets"]), _sizes(domains))
+                and arrays["coords"].shape == (3, arrays["offsets"][-1])
+            )
+        except (OSError, ValueError, KeyError, EOFError):
+            fresh = False
+        if not fresh:
+            logger.info("Removing stale geometry cache entry %s", key)
+            os.remove(filepath)
+            return None
+
+        # Mark the entry as recently used
+        os.utime(filepath)
+        logger.info("Loaded geometry cache entry %s", key)
+        return HelicesGeometry.from_arrays(
+            coords=arrays["coords"],
+            offsets=arrays["offsets"],
+            z_starts=arrays["z_starts"],
+            angle_starts=arrays["angle_starts"],
+            signatures=[domain.signature for domain in domains],
+            profile_key=profile_key(nucleic_acid_profile),
+            junctable_pair_table=arrays["junctable_pair_table"],
+        )
+
+    def store(self, key: str, geometry: HelicesGeometry) -> None:
+        """
+        Store a geometry in the cache.
+
+        Only geometries whose junctable pair table has been recorded are stored, since
+        a cache hit should not need to search for junctable pairs again.
+
+        Args:
+            key: The cache key of the geometry.
+            geometry: The geometry to store.
+        """
+        if geometry.junctable_pair_table is None:
+            return
+
+        filepath = self._filepath(key)
+        if os.path.exists(filepath):
+            return
+
+        # Write to a temporary file first so that a partially written entry is never
+        # read.
+        temporary_filepath = f"{filepath}.tmp"
+        with open(temporary_filepath, "wb") as file:
+            np.savez(
+                file,
+                format_version=self.format_version,
+                key=key,
+                coords=geometry.coords,
+                offsets=geometry.offsets,
+                z_starts=geometry.z_starts,
+                angle_starts=geometry.angle_starts,
+                junctable_pair_table=geometry.junctable_pair_table,
+            )
+        os.replace(temporary_filepath, filepath)
+        logger.info("Stored geometry cache entry %s", key)
+
+        self._evict()
+
+    def _evict(self) -> None:
+        """Remove the least recently used entries until the cache is within capacity."""
+        entries = [
+            os.path.join(self.directory, filename)
+            for filename in os.listdir(self.directory)
+            if filename.endswith(".npz")
+        ]
+        entries.sort(key=os.path.getmtime)
+        for filepath in entries[: max(len(entries) - self.capacity, 0)]:
+            logger.debug("Evicting geometry cache entry %s", filepath)
+            os.remove(filepath)
+
+    def clear(self) -> None:
+        """Remove all entries from the cache."""
+        for filename in os.listdir(self.directory):
+            if filename.endswith(".npz"):
+                os.remove(os.path.join(self.directory, filename))
+
+
+def _sizes(domains: List["Domain"]) -> np.ndarray:
+    """The number of points of each helix of the domains, in helix id order."""
+    return np.array(
+        [
+            max(2 * sum(count) - 1, 0)
+            for domain in domains
+            for count in (domain.up_helix_count, domain.down_helix_count)
+        ]
+    )
@@ -1,17 +1,20 @@
-import itertools
 import logging
 from dataclasses import dataclass, field
-from typing import Iterable, Literal, Type
-from uuid import uuid1
+from typing import Callable, Dict, Iterable, Literal, Tuple, Type
 
 import numpy as np
 import pandas as pd
 
 from natug.constants.directions import DOWN, UP
 from natug.structures.domains.domain import GenerationCount
+from natug.structures.helices.point_store import NO_STRAND, PointStore
+from natug.structures.ids import FileIds, live_id, new_id
 from natug.structures.points import NEMid, Nucleoside
+from natug.structures.points.nick import Nick
 from natug.structures.profiles import NucleicAcidProfile
 from natug.structures.strands import Strand
+from natug.structures.strands.segment import Segment
+from natug.structures.strands.strand import StrandItems
 
 logger = logging.getLogger(__name__)
 
@@ -26,9 +29,30 @@ class HelixData:
         x_coords: The x-coordinates of the points in the helix.
         z_coords: The z-coordinates of the points in the helix.
         angles: The angles of the points in the helix.
-        points: References to Point objects in the strand derived from this data.
-        left_joint_points: The points that are on the left joint of the helix.
-        right_joint_points: The points that are on the right joint of the helix.
+        points: An identity cache of the Point objects derived from this data. Each
+            entry is None until its point is first accessed through the helix, after
+            which the same point object is always returned for that index. Entries
+            may be None, so the points should be accessed through the helix.
+        store: The typed data of the points of the helix (their kinds, states,
+            strands, bases and junctability), which is kept in step with the
+            identity cache. The strands of the points are only recorded here.
+        juncmates: The helix and helical index of the juncmate of each junctable
+            NEMid, keyed by the NEMid's helical index. Points are given their
+            junctability and juncmates from this and the store when they are created.
+        begin: The type of the first point of the helix. Either Nucleoside or NEMid.
+            Points alternate between the two types along the helix.
+
+    Methods:
+        size: Get the size of the helix.
+        resize: Resize the data arrays of the helix.
+        clear_points: Empty the identity cache of the points of the helix.
+        reset_points: Return the cached points to the state of new points.
+        set_points: Replace the identity cache with existing points.
+        set_point: Replace the point at a helical index.
+        record: Record changes to a point of the helix into the store.
+        strand_of: Obtain the strand of the point at a helical index.
+        record_strand: Record the strand of points of the helix into the store.
+        set_juncmate: Make the NEMid at a helical index junctable with another NEMid.
     """
 
     helix: Type["Helix"] | None = None
@@ -37,8 +61,9 @@ class HelixData:
     z_coords: np.ndarray | None = None
     angles: np.ndarray | None = None
     points: np.ndarray | None = None
-    left_joint_points: list = field(default_factory=list)
-    right_joint_points: list = field(default_factory=list)
+    store: PointStore | None = None
+    juncmates: Dict[int, Tuple["Helix", int]] = field(default_factory=dict)
+    begin: Type[Nucleoside] | Type[NEMid] = Nucleoside
 
     _data_arrays = ("x_coords", "z_coords", "angles", "points")
 
@@ -68,7 +93,151 @@ class HelixData:
         self.x_coords = np.zeros(size)
         self.z_coords = np.zeros(size)
         self.angles = np.zeros(size)
-        self.points = np.zeros(size, dtype=object)
+        self.clear_points()
+
+    def clear_points(self) -> None:
+        """
+        Empty the identity cache of the points of the helix.
+
+        Points are materialized from the data arrays again when they are next
+        accessed, so this must be called whenever the data arrays are replaced.
+        """
+        size = 0 if self.x_coords is None else len(self.x_coords)
+        self.points = np.full(size, None, dtype=object)
+        self.store = PointStore.empty(size, self.begin)
+        self.juncmates = {}
+
+    def reset_points(self) -> None:
+        """
+        Return the cached points of the helix to the state of newly computed points.
+
+        This lets the points of a helix whose data did not change be handed to a new
+        strand instead of being materialized again. Nicks are replaced with the points
+        that they nicked, and the points are detached from their strands, junctions
+        and linkages. The store keeps its rows, which are reset in place.
+        """
+        if self.points is None:
+            self.clear_points()
+            return
+
+        domain = self.helix.domain if self.helix.double_helix else None
+        for index, point in enumerate(self.points):
+            if point is None:
+                continue
+            if isinstance(point, Nick):
+                point = point.original_item
+                self.points[index] = point
+            point.strand = None
+            point.linkage = None
+            point.domain = domain
+            if isinstance(point, NEMid):
+                point.juncmate = None
+                point.junctable = False
+                point.junction = False
+            elif point.base is not None:
+                point.base = None
+            point.styles.change_state("default")
+        self.store.reset()
+        self.juncmates = {}
+
+    def set_points(self, points: Iterable["Point | Nick"]) -> None:
+        """
+        Replace the identity cache with existing points, like ones loaded from a file.
+
+        The type of the first point becomes the beginning type of the helix, and the
+        store is rebuilt from the points.
+
+        Args:
+            points: The points of the helix, in helical index order.
+        """
+        self.points = np.array(tuple(points), dtype=object)
+        if len(self.points):
+            first = getattr(self.points[0], "original_item", self.points[0])
+            self.begin = NEMid if isinstance(first, NEMid) else Nucleoside
+        self.store = PointStore.empty(len(self.points), self.begin)
+        self.store.record_many(self.points)
+        self.juncmates = {}
+
+    def set_point(self, index: int, point: "Point | Nick") -> None:
+        """
+        Replace the point at a helical index, like when a NEMid is nicked.
+
+        Args:
+            index: The helical index.
+            point: The point or nick to place at the index.
+        """
+        self.points[index] = point
+        self.store.record(index, point)
+
+    def record(self, point: "Point") -> None:
+        """
+        Record changes to a point of the helix into the store.
+
+        Points that are not the points of the helix's identity cache (like copies of
+        them) are ignored, since they are not the points that the store describes.
+
+        Args:
+            point: The point whose strand, base or junction state may have changed.
+        """
+        index = point.helical_index
+        if self.points is None or index is None:
+            return
+        cached = self.points[index]
+        if cached is point:
+            self.store.record(index, point)
+        elif getattr(cached, "original_item", None) is point:
+            # The point has been nicked, so the nick is what the store describes
+            self.store.record(index, cached)
+
+    def strand_of(self, index: int) -> "Strand | None":
+        """
+        Obtain the strand of the point at a helical index.
+
+        Args:
+            index: The helical index.
+
+        Returns:
+            The strand recorded for the point, or None if the point doesn't belong to
+            a strand.
+        """
+        if self.store is None:
+            return None
+        return Strand.of_uuid(int(self.store.strand_ids[index]))
+
+    def record_strand(self, key: int | slice, strand: "Strand | None") -> None:
+        """
+        Record the strand of points of the helix into the store.
+
+        Args:
+            key: The helical index of the point, or a slice of the helical indices of
+                many points.
+            strand: The strand that the points belong to, or None.
+        """
+        if self.store is None:
+            self.clear_points()
+        self.store.strand_ids[key] = NO_STRAND if strand is None else strand.uuid
+
+    def set_juncmate(self, index: int, helix: "Helix", mate_index: int) -> None:
+        """
+        Make the NEMid at a helical index junctable with another NEMid.
+
+        The junctability is recorded into the store, so the NEMid is only updated if
+        it has already been created. Otherwise, it is made junctable when it is
+        created.
+
+        Args:
+            index: The helical index of the NEMid.
+            helix: The helix of the NEMid's juncmate.
+            mate_index: The helical index of the NEMid's juncmate.
+        """
+        if self.store is None:
+            self.clear_points()
+        self.store.junctables[index] = True
+        self.juncmates[index] = (helix, mate_index)
+        point = self.points[index]
+        if point is not None:
+            point.junctable = True
+            point.juncmate = helix[mate_index]
 
 
 @dataclass(slots=True)
@@ -89,13 +258,14 @@ class Helix:
         point: Generate a specific point object parented to this helix.
         points: Generate all the points along the helix.
         strand: Generate a strand full of points for this helix.
+        mate: Obtain the Watson-Crick mate of a point of the helix.
         other_helix: Obtain the other helix in the double helix.
     """
 
     direction: Literal[UP, DOWN]
     double_helix: Type["DoubleHelix"] | None
     data: HelixData = field(default_factory=HelixData)
-    uuid: str = field(default_factory=lambda: str(uuid1()))
+    uuid: int = field(default_factory=new_id)
 
     def __post_init__(self):
         self.data.helix = self
@@ -107,9 +277,60 @@ class Helix:
         )
         return len(self.data.angles)
 
-    def __getitem__(self, index: int) -> None:
-        """Get a point at a given index along the helix."""
-        return self.data.points[index]
+    def __getitem__(self, index: int) -> "Point":
+        """
+        Get a point at a given index along the helix.
+
+        The point is materialized from the data arrays on first access, and then
+        cached, so that the same index always returns the same point object.
+        """
+        if self.data.points is None:
+            self.data.clear_points()
+        point = self.data.points[index]
+        if point is None:
+            point = self._materialize(range(len(self.data.points))[index])
+        return point
+
+    def _materialize(self, index: int) -> "Point":
+        """
+        Create the point at a given (non-negative) index and cache it.
+
+        The point is created from the data arrays, and is given its strand and
+        junctability from the store, so it is styled the way that it would have been
+        had it been created along with the helix.
+
+        Args:
+            index: The helical index of the point.
+
+        Returns:
+            The newly created point.
+        """
+        extra = {}
+        if (index % 2 == 0) == (self.data.begin == Nucleoside):
+            cls = Nucleoside
+        else:
+            cls = NEMid
+            if self.data.store.junctables[index]:
+                extra["junctable"] = True
+        point = cls(  # type: ignore
+            angle=self.data.angles[index],
+            x_coord=round(self.data.x_coords[index], 5),
+            z_coord=round(self.data.z_coords[index], 5),
+            direction=self.direction,
+            domain=self.double_helix.domain if self.double_helix else None,
+            helix=self,
+            helical_index=index,
+            **extra,
+        )
+        self.data.points[index] = point
+        # The juncmate may be created in turn, and is then given this point as its
+        # juncmate from the cache. A juncmate that has been nicked since is the
+        # NEMid that the nick replaced.
+        if index in self.data.juncmates:
+            helix, mate_index = self.data.juncmates[index]
+            juncmate = helix[mate_index]
+            point.juncmate = getattr(juncmate, "original_item", juncmate)
+        return point
 
     @property
     def domain(self):
@@ -149,35 +370,22 @@ class Helix:
         """
         Yield alternating NEMids and Nucleosides from the data in the arrays.
 
+        Points that have already been accessed are yielded from the helix's identity
+        cache, and the rest are materialized as they are reached.
+
         Args:
             begin: The type of the first item yielded. Either Nucleoside or NEMid.
 
         Yields:
             Nucleoside or NEMid: The next item in the strand.
         """
-        self.data.points = np.zeros(len(self.data.angles), dtype=object)
-        domain = self.double_helix.domain if self.double_helix else None
+        # The cached points alternate the other way around, so they can't be reused
+        if begin != self.data.begin:
+            self.data.begin = begin
+            self.data.clear_points()
 
-        for index, cls, angle, x_coord, z_coord in zip(
-            itertools.count(),
-            itertools.cycle(
-                (NEMid, Nucleoside) if begin == NEMid else (Nucleoside, NEMid)
-            ),
-            self.data.angles,
-            self.data.x_coords,
-            self.data.z_coords,
-        ):
-            point = cls(  # type: ignore
-                angle=angle,
-                x_coord=round(x_coord, 5),
-                z_coord=round(z_coord, 5),
-                direction=self.direction,
-                domain=domain,
-                helix=self,
-                helical_index=index,
-            )
-            self.data.points[index] = point
-            yield point
+        for index in range(len(self.data.angles)):
+            yield self[index]
 
     def strand(
         self,
@@ -189,6 +397,9 @@ class Helix:
         """
         Convert the strand builder to a Strand object.
 
+        The strand holds the points of the helix as one segment, so no points are
+        materialized. Points that were already materialized are reused.
+
         Args:
             nucleic_acid_profile: The nucleic acid profile to use for the strand.
             strand: The strand to fill with the data in the arrays. If None, a new
@@ -204,9 +415,32 @@ class Helix:
         strand = strand or Strand(
             nucleic_acid_profile=nucleic_acid_profile, helix=self, **kwargs
         )
-        strand.extend(tuple(self.points(begin=begin)))
+        # A point can only belong to one strand, so the points are detached from
+        # any strand that they previously belonged to
+        self.data.reset_points()
+        # The cached points alternate the other way around, so they can't be reused
+        if begin != self.data.begin:
+            self.data.begin = begin
+            self.data.clear_points()
+        strand.extend(StrandItems.from_pieces((Segment(self, range(len(self))),)))
         return strand
 
+    def mate(self, index: int) -> "Point | None":
+        """
+        Obtain the Watson-Crick mate of a point of the helix.
+
+        Args:
+            index: The helical index of the point.
+
+        Returns:
+            The point of the other helix that is the mate of the point, or None if
+            the point has no mate.
+        """
+        mate_index = self.double_helix.mate_indices(self.direction)[index]
+        if mate_index < 0:
+            return None
+        return self.other_helix()[mate_index]
+
     def other_helix(self) -> "Helix":
         """
         Obtain the other helix in the double helix.
@@ -217,7 +451,9 @@ class Helix:
         return self.double_helix[int(not bool(self.direction))]
 
 
-def to_df(helices: Iterable[Helix]) -> pd.DataFrame:
+def to_df(
+    helices: Iterable[Helix], file_ids: Callable[[object], int] = live_id
+) -> pd.DataFrame:
     """
     Export many helices to a pandas dataframe.
 
@@ -239,6 +475,8 @@ def to_df(helices: Iterable[Helix]) -> pd.DataFrame:
 
     Arguments:
         helices: All the double helices to be exported.
+        file_ids: Obtains the id to refer to each object by. Defaults to the
+            objects' own ids.
 
     Returns:
         A pandas dataframe containing data for many helices.
@@ -253,14 +491,21 @@ def to_df(helices: Iterable[Helix]) -> pd.DataFrame:
         "data:points": [],
     }
     for helix in helices:
-        data["uuid"].append(helix.uuid)
-        data["data:double_helix"].append(helix.double_helix.uuid)
+        data["uuid"].append(file_ids(helix))
+        data["data:double_helix"].append(file_ids(helix.double_helix))
         data["data:direction"].append("UP" if helix.direction == UP else "DOWN")
         data["data:x_coords"].append(";".join(map(str, helix.data.x_coords)))
         data["data:z_coords"].append(";".join(map(str, helix.data.z_coords)))
         data["data:angles"].append(";".join(map(str, helix.data.angles)))
-        data["data:points"].append(
-            ";".join(map(lambda point: point.uuid, helix.data.points))
-        )
+        # Points that were given file ids through their strands' segments aren't
+        # created, and the rest (like nicks) are found through themselves
+        if isinstance(file_ids, FileIds) and id(helix) in file_ids.point_ids:
+            point_ids = file_ids.point_ids[id(helix)].tolist()
+        else:
+            point_ids = [-1] * len(helix)
+        for index, point_id in enumerate(point_ids):
+            if point_id < 0:
+                point_ids[index] = file_ids(helix[index])
+        data["data:points"].append(";".join(map(str, point_ids)))
 
     return pd.DataFrame(data)
@@ -0,0 +1,204 @@
+import logging
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+
+from natug.structures.points import NEMid
+from natug.structures.points.nick import Nick
+
+logger = logging.getLogger(__name__)
+
+
+def helix_id(NEMid_: NEMid) -> int:
+    """
+    Obtain the helix id of the helix that a NEMid lies on.
+
+    The helix id of a helix is 2 * domain index + direction (see HelicesGeometry).
+
+    Args:
+        NEMid_: The NEMid to obtain the helix id of.
+
+    Returns:
+        The helix id.
+    """
+    return 2 * NEMid_.domain.index + NEMid_.direction
+
+
+@dataclass(slots=True)
+class JunctionTable:
+    """
+    The junctable NEMid pairs of a design, and which of them are active junctions.
+
+    Joint i is the helical joint between the right side of double helix i and the
+    left side of double helix i + 1 (wrapping around to the first double helix). Each
+    pair of junctable NEMids lies on exactly one joint, so the stability of every
+    joint can be determined at once by counting the active pairs of each joint.
+
+    Attributes:
+        pairs: A (pair count, 4) array of the junctable NEMid pairs. Each row is the
+            helix id and helical index of a NEMid on the right side of a joint,
+            followed by the helix id and helical index of the NEMid on the left side
+            of the joint that it is junctable with.
+        joints: The joint that each pair lies on.
+        active: Whether each pair is an active junction.
+        joint_count: The number of joints. This is the number of double helices.
+        rows: The rows of the pairs that each NEMid belongs to, keyed by the NEMid's
+            helix id and helical index. A NEMid may superpose more than one NEMid of
+            the next double helix, so it may belong to more than one pair.
+
+    Methods:
+        from_pairs: Create a junction table from a table of junctable NEMid pairs.
+        from_juncmates: Create a junction table from the juncmates of NEMids.
+        update: Update whether the pairs of NEMids are active junctions.
+        counts: Obtain the number of active junctions of each joint.
+        stable: Obtain whether each joint is stable.
+        joint_rows: Obtain the rows of the pairs of a joint.
+    """
+
+    pairs: np.ndarray
+    joints: np.ndarray
+    active: np.ndarray
+    joint_count: int
+    rows: Dict[Tuple[int, int], List[int]] = field(default_factory=dict, repr=False)
+
+    @classmethod
+    def from_pairs(cls, pairs: np.ndarray, joint_count: int) -> "JunctionTable":
+        """
+        Create a junction table from a table of junctable NEMid pairs.
+
+        All the pairs begin as inactive.
+
+        Args:
+            pairs: A (pair count, 4) array of the junctable NEMid pairs. Each row is
+                the helix id and helical index of the NEMid on the right side of the
+                joint, followed by those of the NEMid on the left side of the joint.
+            joint_count: The number of joints.
+
+        Returns:
+            The junction table.
+        """
+        pairs = np.asarray(pairs, dtype=int).reshape(-1, 4)
+
+        rows = {}
+        for row, (helix_id1, index1, helix_id2, index2) in enumerate(pairs.tolist()):
+            rows.setdefault((helix_id1, index1), []).append(row)
+            rows.setdefault((helix_id2, index2), []).append(row)
+
+        return cls(
+            pairs=pairs,
+            # The NEMid on the right side of joint i lies on a helix of double helix i
+            joints=pairs[:, 0] // 2,
+            active=np.zeros(len(pairs), dtype=bool),
+            joint_count=joint_count,
+            rows=rows,
+        )
+
+    @classmethod
+    def from_juncmates(cls, double_helices: "DoubleHelices") -> "JunctionTable":
+        """
+        Create a junction table from the juncmates of the NEMids of double helices.
+
+        This is used when the junctable pairs weren't found by the double helices
+        themselves, like when a design is loaded from a file. The pairs are then
+        marked as active based on the junction attributes of their NEMids.
+
+        Args:
+            double_helices: The double helices to create the junction table for.
+                The points of their helices must already be materialized.
+
+        Returns:
+            The junction table.
+        """
+        pairs = []
+        for helix_id1, helix in enumerate(double_helices.helices()):
+            # NEMids on the right side of a joint lie on the right half of their
+            # helix, since the joints are the edges of the helices' domains
+            middle = (helix.data.x_coords.min() + helix.data.x_coords.max()) / 2
+            for index1, point in enumerate(helix.data.points):
+                if isinstance(point, Nick):
+                    point = point.original_item
+                if (
+                    not isinstance(point, NEMid)
+                    or point.juncmate is None
+                    or point.x_coord < middle
+                ):
+                    continue
+                juncmate = point.juncmate
+                pairs.append(
+                    (helix_id1, index1, helix_id(juncmate), juncmate.helical_index)
+                )
+
+        junctions = cls.from_pairs(np.array(pairs, dtype=int), len(double_helices))
+        junctions.update(
+            point.original_item if isinstance(point, Nick) else point
+            for helix in double_helices.helices()
+            for point in helix.data.points
+        )
+        return junctions
+
+    def __len__(self) -> int:
+        """The number of junctable NEMid pairs."""
+        return len(self.pairs)
+
+    def update(self, NEMids: Iterable[NEMid]) -> None:
+        """
+        Update whether the pairs of NEMids are active junctions.
+
+        A pair is an active junction when its NEMids are each other's juncmates and
+        both of them are junctions. The other pairs of a NEMid that belongs to many
+        pairs are inactive.
+
+        Args:
+            NEMids: The NEMids whose junction attributes may have changed. Points
+                that are not junctable NEMids are skipped.
+        """
+        for NEMid_ in NEMids:
+            if not isinstance(NEMid_, NEMid) or NEMid_.juncmate is None:
+                continue
+            key = (helix_id(NEMid_), NEMid_.helical_index)
+            juncmate = NEMid_.juncmate
+            juncmate_key = (helix_id(juncmate), juncmate.helical_index)
+            active = (
+                juncmate.juncmate is NEMid_ and NEMid_.junction and juncmate.junction
+            )
+            for row in self.rows.get(key, ()):
+                helix_id1, index1, helix_id2, index2 = self.pairs[row].tolist()
+                if {(helix_id1, index1), (helix_id2, index2)} == {key, juncmate_key}:
+                    self.active[row] = active
+                else:
+                    self.active[row] = False
+
+    def counts(self) -> np.ndarray:
+        """
+        Obtain the number of active junctions of each joint.
+
+        Returns:
+            An array of the number of active junctions of each joint.
+        """
+        return np.bincount(self.joints[self.active], minlength=self.joint_count)
+
+    def stable(self, threshold: int = 2) -> np.ndarray:
+        """
+        Obtain whether each joint is stable.
+
+        Args:
+            threshold: The number of active junctions that must be present in order
+                for a joint to be considered stable.
+
+        Returns:
+            An array of whether each joint is stable.
+        """
+        return self.counts() >= threshold
+
+    def joint_rows(self, joint: int) -> np.ndarray:
+        """
+        Obtain the rows of the pairs of a joint.
+
+        Args:
+            joint: The joint to obtain the rows of.
+
+        Returns:
+            The rows of the pairs that lie on the joint.
+        """
+        return np.flatnonzero(self.joints == joint)
@@ -0,0 +1,171 @@
+import logging
+from dataclasses import dataclass
+from typing import Iterable, List, Type
+
+import numpy as np
+
+from natug.constants import bases
+from natug.structures.points import NEMid, Nucleoside
+from natug.structures.points.nick import Nick
+
+logger = logging.getLogger(__name__)
+
+# The codes of the kinds of points
+NUCLEOSIDE = 0
+NEMID = 1
+
+# The codes of the states of points
+NORMAL = 0
+NICKED = 1
+JUNCTION = 2
+
+# The codes of the bases of nucleosides. Points without a base have the UNSET code.
+UNSET = -1
+BASE_CODES = {base: code for code, base in enumerate(bases.RNA)}
+BASE_CODES[None] = UNSET
+BASES = {code: base for base, code in BASE_CODES.items()}
+
+# The strand id of points that don't belong to a strand
+NO_STRAND = -1
+
+
+@dataclass(slots=True)
+class PointStore:
+    """
+    The typed data of the points of a helix.
+
+    Each array holds one entry per point of the helix, indexed by helical index, so
+    that questions about all the points of a helix (like which of them are nicked,
+    or which have no base) are answered with array masks instead of by visiting the
+    point objects. The point objects remain the way to access and modify single
+    points; the store is kept up to date when they change.
+
+    Attributes:
+        kinds: The kind of each point. Either NUCLEOSIDE or NEMID.
+        states: The state of each point. NORMAL, NICKED (the point has been replaced
+            with a nick), or JUNCTION (the point is a NEMid of an active junction).
+        strand_ids: The uuid of the strand of each point, or NO_STRAND.
+        bases: The base code of each point (see BASE_CODES), or UNSET for points that
+            are not nucleosides or that have no base.
+        junctables: Whether each point is a junctable NEMid.
+
+    Methods:
+        empty: Create the store of a helix whose points have not been created yet.
+        reset: Return every point of the store to a normal point of no strand.
+        record: Record the data of a point into the store.
+        record_many: Record the data of many points into the store.
+        NEMids: Obtain a mask of the NEMids that have not been nicked.
+        nicks: Obtain a mask of the points that have been nicked.
+        junctions: Obtain a mask of the NEMids of active junctions.
+        unset_bases: Obtain a mask of the nucleosides without a base.
+        junctable: Obtain a mask of the junctable NEMids that have not been nicked.
+        sequence: Obtain the bases of points.
+    """
+
+    kinds: np.ndarray
+    states: np.ndarray
+    strand_ids: np.ndarray
+    bases: np.ndarray
+    junctables: np.ndarray
+
+    @classmethod
+    def empty(
+        cls, size: int, begin: Type[Nucleoside] | Type[NEMid] = Nucleoside
+    ) -> "PointStore":
+        """
+        Create the store of a helix whose points have not been created yet.
+
+        Args:
+            size: The number of points of the helix.
+            begin: The type of the first point of the helix. Points alternate between
+                nucleosides and NEMids along the helix.
+
+        Returns:
+            A store of normal points that belong to no strand, have no base, and
+            are not junctable.
+        """
+        kinds = np.zeros(size, dtype=np.int8)
+        kinds[int(begin is Nucleoside) :: 2] = NEMID
+        return cls(
+            kinds=kinds,
+            states=np.full(size, NORMAL, dtype=np.int8),
+            strand_ids=np.full(size, NO_STRAND, dtype=np.int64),
+            bases=np.full(size, UNSET, dtype=np.int8),
+            junctables=np.zeros(size, dtype=bool),
+        )
+
+    def __len__(self) -> int:
+        return len(self.kinds)
+
+    def reset(self) -> None:
+        """Return every point of the store to a normal point of no strand."""
+        self.states[:] = NORMAL
+        self.strand_ids[:] = NO_STRAND
+        self.bases[:] = UNSET
+        self.junctables[:] = False
+
+    def record(self, index: int, point: "Point | Nick") -> None:
+        """
+        Record the data of a point into the store.
+
+        Args:
+            index: The helical index of the point.
+            point: The point, or the nick that has replaced the point.
+        """
+        if isinstance(point, Nick):
+            self.states[index] = NICKED
+            self.strand_ids[index] = NO_STRAND
+            point = point.original_item
+        else:
+            self.states[index] = (
+                JUNCTION if getattr(point, "junction", False) else NORMAL
+            )
+            self.strand_ids[index] = (
+                NO_STRAND if point.strand is None else point.strand.uuid
+            )
+        self.bases[index] = BASE_CODES.get(getattr(point, "base", None), UNSET)
+        self.junctables[index] = getattr(point, "junctable", False)
+
+    def record_many(self, points: Iterable["Point | Nick | None"]) -> None:
+        """
+        Record the data of many points into the store.
+
+        Args:
+            points: The points of the helix, in helical index order. Entries that
+                are None (points that have not been created) are skipped.
+        """
+        for index, point in enumerate(points):
+            if point is not None:
+                self.record(index, point)
+
+    def NEMids(self) -> np.ndarray:
+        """Obtain a mask of the NEMids that have not been nicked."""
+        return (self.kinds == NEMID) & (self.states != NICKED)
+
+    def nicks(self) -> np.ndarray:
+        """Obtain a mask of the points that have been nicked."""
+        return self.states == NICKED
+
+    def junctions(self) -> np.ndarray:
+        """Obtain a mask of the NEMids of active junctions."""
+        return self.states == JUNCTION
+
+    def unset_bases(self) -> np.ndarray:
+        """Obtain a mask of the nucleosides without a base."""
+        return (self.kinds == NUCLEOSIDE) & (self.bases == UNSET)
+
+    def junctable(self) -> np.ndarray:
+        """Obtain a mask of the junctable NEMids that have not been nicked."""
+        return self.NEMids() & self.junctables
+
+    def sequence(self, key: slice | np.ndarray) -> List[str | None]:
+        """
+        Obtain the bases of points.
+
+        Args:
+            key: The helical indices of the points, as a slice or an index array.
+
+        Returns:
+            The base of each point, or None for points without a base.
+        """
+        return [BASES[code] for code in self.bases[key].tolist()]
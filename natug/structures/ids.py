@@ -0,0 +1,173 @@
+import logging
+from typing import Dict, Iterable
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class IdAllocator:
+    """
+    Hands out compact integer ids for the objects of the program.
+
+    Ids are allocated sequentially, so allocating an id is just an increment, and
+    each id is a small integer rather than a 36 character uuid string.
+
+    Attributes:
+        next_id: The id that will be handed out next.
+    """
+
+    __slots__ = ("next_id",)
+
+    def __init__(self, start: int = 0) -> None:
+        """
+        Initialize an id allocator.
+
+        Args:
+            start: The first id to hand out.
+        """
+        self.next_id = start
+
+    def __call__(self) -> int:
+        """Obtain a new id."""
+        id_ = self.next_id
+        self.next_id += 1
+        return id_
+
+
+class FileIds:
+    """
+    The ids that a save file refers to the objects of a document by.
+
+    File ids are consecutive, starting at zero, so that a file has a dense id space
+    that is the same each time that a document is saved. They only exist while a
+    file is being written, and the ids of the objects themselves are left untouched.
+
+    The points of helices are given file ids a segment at a time, by their helix and
+    helical index, so that points that haven't been created yet needn't be created
+    to be saved. A point that has been created is then found through its helix.
+
+    Attributes:
+        ids: The file id of each object, keyed by the object's identity.
+        point_ids: The file id of each point of each helix that points were given
+            file ids of, keyed by the helix's identity. Points without a file id
+            have -1.
+        count: The number of file ids that have been given.
+
+    Methods:
+        add: Give objects the next file ids.
+        point_id: Obtain the file id of a point of a helix.
+        segment_ids: Obtain the file ids of the points of a segment.
+    """
+
+    __slots__ = "ids", "point_ids", "count"
+
+    def __init__(self, objects: Iterable[object] = ()) -> None:
+        """
+        Initialize the file ids of a save file.
+
+        Args:
+            objects: The objects to give file ids to, in order.
+        """
+        self.ids: Dict[int, int] = {}
+        self.point_ids: Dict[int, np.ndarray] = {}
+        self.count = 0
+        self.add(objects)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __call__(self, obj: object) -> int:
+        """Obtain the file id of an object."""
+        file_id = self.ids.get(id(obj))
+        if file_id is not None:
+            return file_id
+        # The point may have been given a file id through its helix
+        helix = getattr(obj, "helix", None)
+        if (
+            helix is not None
+            and helix.data.points is not None
+            and helix.data.points[obj.helical_index] is obj
+        ):
+            return self.point_id(helix, obj.helical_index)
+        raise KeyError(obj)
+
+    def point_id(self, helix: "Helix", index: int) -> int:
+        """
+        Obtain the file id of a point of a helix.
+
+        Args:
+            helix: The helix of the point.
+            index: The helical index of the point.
+
+        Returns:
+            The file id of the point.
+
+        Raises:
+            KeyError: If the point was not given a file id.
+        """
+        point_ids = self.point_ids.get(id(helix))
+        if point_ids is None or point_ids[index] < 0:
+            raise KeyError((helix, index))
+        return int(point_ids[index])
+
+    def segment_ids(self, segment: "Segment") -> np.ndarray:
+        """
+        Obtain the file ids of the points of a segment.
+
+        Args:
+            segment: The segment.
+
+        Returns:
+            The file id of each point of the segment, in order.
+
+        Raises:
+            KeyError: If any of the points were not given file ids.
+        """
+        file_ids = self.point_ids[id(segment.helix)][segment.as_slice()]
+        if (file_ids < 0).any():
+            raise KeyError(segment)
+        return file_ids
+
+    def add(self, objects: Iterable[object]) -> None:
+        """
+        Give objects the next file ids.
+
+        Objects that already have a file id keep it. The objects must outlive the
+        file ids, since they are keyed by identity. Segments give the next file ids
+        to their points, in order.
+
+        Args:
+            objects: The objects to give file ids to, in order.
+        """
+        from natug.structures.strands.segment import Segment
+
+        for obj in objects:
+            if isinstance(obj, Segment):
+                point_ids = self.point_ids.get(id(obj.helix))
+                if point_ids is None:
+                    point_ids = np.full(len(obj.helix), -1)
+                    self.point_ids[id(obj.helix)] = point_ids
+                indices = np.array(obj.indices, dtype=int)
+                new = indices[point_ids[indices] < 0]
+                point_ids[new] = np.arange(self.count, self.count + len(new))
+                self.count += len(new)
+            elif id(obj) not in self.ids:
+                self.ids[id(obj)] = self.count
+                self.count += 1
+        logger.debug("Gave %s objects file ids.", self.count)
+
+
+def live_id(obj: object) -> int:
+    """Obtain the id that an object has in the open document."""
+    return obj.uuid
+
+
+# The id allocator of the program. It is never restarted, so that ids stay unique
+# among objects that outlive a document, like nucleic acid profiles.
+allocator = IdAllocator()
+
+
+def new_id() -> int:
+    """Obtain a new id from the program's id allocator."""
+    return allocator()
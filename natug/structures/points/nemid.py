@@ -1,12 +1,13 @@
 from dataclasses import dataclass
-from typing import Iterable
+from typing import Callable, Iterable, List
 
 import pandas as pd
 
+from natug.structures.ids import live_id
 from natug.structures.points.point import Point
 
 
-@dataclass
+@dataclass(slots=True)
 class NEMid(Point):
     """
     NEMid object.
@@ -30,17 +31,20 @@ class NEMid(Point):
         """
         from natug.structures.points import Nucleoside
 
-        return Nucleoside(
+        nucleoside = Nucleoside(
             x_coord=self.x_coord,
             z_coord=self.z_coord,
             angle=self.angle,
             direction=self.direction,
-            strand=self.strand,
             domain=self.domain,
         )
+        nucleoside.strand = self.strand
+        return nucleoside
 
 
-def to_df(NEMids: Iterable[NEMid]) -> pd.DataFrame:
+def to_df(
+    NEMids: Iterable[NEMid], file_ids: Callable[[object], int] = live_id
+) -> pd.DataFrame:
     """
     Export many NEMids as either a pandas dataframe or a csv file.
 
@@ -51,22 +55,76 @@ def to_df(NEMids: Iterable[NEMid]) -> pd.DataFrame:
         added to the dataframe under the new column.
 
     Args:
-        NEMids: The NEMids to export.
+        NEMids: The NEMids to export. Segments of NEMids may be passed in their place
+            (see the points module's to_df function).
+        file_ids: Obtains the id to refer to each object by. Defaults to the
+            objects' own ids.
 
     Returns:
         A pandas dataframe with all the NEMid data.
     """
     from natug.structures.points.point import to_df as fetch_points_dataframe
+    from natug.structures.strands.segment import Segment
 
     # Get the dataframe of all the Point data
-    data = fetch_points_dataframe(NEMids)
+    data = fetch_points_dataframe(NEMids, file_ids)
 
     # Add the NEMid specific data to the dataframe
-    data["NEMid:junctable"] = [NEMid_.junctable for NEMid_ in NEMids]
-    data["NEMid:junction"] = [NEMid_.junction for NEMid_ in NEMids]
-    data["NEMid:juncmate"] = [
-        (NEMid_.juncmate.uuid if NEMid_.juncmate is not None else None)
-        for NEMid_ in NEMids
-    ]
+    junctables, junctions, juncmates = [], [], []
+    for NEMid_ in NEMids:
+        if isinstance(NEMid_, Segment):
+            segment_rows(NEMid_, file_ids, junctables, junctions, juncmates)
+            continue
+        junctables.append(NEMid_.junctable)
+        junctions.append(NEMid_.junction)
+        juncmates.append(
+            file_ids(NEMid_.juncmate) if NEMid_.juncmate is not None else None
+        )
+    data["NEMid:junctable"] = junctables
+    data["NEMid:junction"] = junctions
+    data["NEMid:juncmate"] = juncmates
 
     return data
+
+
+def segment_rows(
+    segment: "Segment",
+    file_ids: "FileIds",
+    junctables: List[bool],
+    junctions: List[bool],
+    juncmates: List[int | None],
+) -> None:
+    """
+    Add the NEMid specific data of the NEMids of a segment to the columns of to_df.
+
+    The data is read from the store of the segment's helix, so NEMids that haven't
+    been created yet aren't created.
+
+    Args:
+        segment: The segment of NEMids.
+        file_ids: The file ids, which must have given the NEMids and their juncmates
+            ids.
+        junctables: The junctable column to add to.
+        junctions: The junction column to add to.
+        juncmates: The juncmate column to add to.
+    """
+    from natug.structures.helices.point_store import JUNCTION
+
+    data, key = segment.helix.data, segment.as_slice()
+    junctables.extend(data.store.junctables[key].tolist())
+    junctions.extend((data.store.states[key] == JUNCTION).tolist())
+    for index, NEMid_ in zip(segment.indices, data.points[key].tolist()):
+        if NEMid_ is not None:
+            juncmate = NEMid_.juncmate
+            juncmates.append(file_ids(juncmate) if juncmate is not None else None)
+        elif index in data.juncmates:
+            # A juncmate that has been created (or nicked) is found through itself
+            helix, mate_index = data.juncmates[index]
+            juncmate = helix.data.points[mate_index]
+            if juncmate is None:
+                juncmates.append(file_ids.point_id(helix, mate_index))
+            else:
+                juncmate = getattr(juncmate, "original_item", juncmate)
+                juncmates.append(file_ids(juncmate))
+        else:
+            juncmates.append(None)
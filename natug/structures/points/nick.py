@@ -1,25 +1,37 @@
 from dataclasses import dataclass, field
-from typing import Iterable
-from uuid import uuid1
+from typing import Callable, Iterable
 
 import pandas as pd
 
+from natug.structures.ids import live_id, new_id
 from natug.structures.points.point import Point
 
 
-@dataclass(slots=True)
+@dataclass(slots=True, eq=False)
 class Nick:
     """
     A Nick object.
 
-    All attributes of the original NEMid object are directly accessible through this
-    object.
+    The positional and helix attributes of the original NEMid object are exposed as
+    read-only properties of this object, and all other attributes must be accessed
+    through the original NEMid.
+
+    Nicks are compared by identity, since each nick stands in for one specific NEMid.
 
     Attributes:
         uuid: The unique identifier of the nick.
         original_item: The NEMid object that was transformed into a nick.
         previously_closed_strand: Whether the strand the nick used to belong to was
             closed.
+        x_coord: The x coord of the original NEMid.
+        z_coord: The z coord of the original NEMid.
+        angle: The angle of the original NEMid.
+        direction: The direction of the original NEMid.
+        domain: The domain of the original NEMid.
+        helix: The helix that the original NEMid lies on.
+        strand: The strand of the original NEMid. This is None while it is nicked.
+        helical_index: The index of the original NEMid within its helix.
+        styles: The styles of the original NEMid.
 
     Methods:
         next_item: The next item along the helix that this nick is located in.
@@ -29,41 +41,76 @@ class Nick:
     original_item: Point
     previously_closed_strand: "Strand" = None
 
-    uuid: str = field(default_factory=lambda: str(uuid1()))
+    uuid: int = field(default_factory=new_id)
+
+    @property
+    def x_coord(self) -> float:
+        return self.original_item.x_coord
+
+    @property
+    def z_coord(self) -> float:
+        return self.original_item.z_coord
+
+    @property
+    def angle(self) -> float:
+        return self.original_item.angle
+
+    @property
+    def direction(self) -> int:
+        return self.original_item.direction
+
+    @property
+    def domain(self) -> "Domain":
+        return self.original_item.domain
+
+    @property
+    def helix(self) -> "Helix":
+        return self.original_item.helix
+
+    @property
+    def strand(self) -> "Strand | None":
+        return self.original_item.strand
+
+    @property
+    def helical_index(self) -> int:
+        return self.original_item.helical_index
+
+    @property
+    def styles(self) -> "PointStyles":
+        return self.original_item.styles
 
     def next_item(self) -> "Point":
-        return self.helix[self.helical_index + 1]
+        original_item = self.original_item
+        return original_item.helix[original_item.helical_index + 1]
 
     def previous_item(self) -> "Point":
-        return self.helix[self.helical_index - 1]
-
-    def __getattr__(self, key: str) -> object:
-        """
-        When __getattribute__ fails, this method is called. This method searches for
-        the attribute in the original NEMid object.
-        """
-        return getattr(self.original_item, key)
+        original_item = self.original_item
+        return original_item.helix[original_item.helical_index - 1]
 
     def __repr__(self) -> str:
         """Determine what to print when instance is printed directly."""
         return f"Nick@{round(self.x_coord, 4), round(self.z_coord, 4)}"
 
 
-def to_df(nicks: Iterable[Nick]) -> pd.DataFrame:
+def to_df(
+    nicks: Iterable[Nick], file_ids: Callable[[object], int] = live_id
+) -> pd.DataFrame:
     """
     Export many Nicks as either a pandas dataframe or a csv file.
 
     Args:
         nicks: The Nicks to export.
+        file_ids: Obtains the id to refer to each object by. Defaults to the
+            objects' own ids.
 
     Returns:
         A pandas dataframe with all the Nick data.
 
     Notes:
-        The original NEMid objects are referenced by uuid.
+        The original NEMid objects are referenced by id.
     """
     data = {
-        "uuid": [nick.uuid for nick in nicks],
-        "data:original_item": [nick.original_item.uuid for nick in nicks],
+        "uuid": [file_ids(nick) for nick in nicks],
+        "data:original_item": [file_ids(nick.original_item) for nick in nicks],
     }
     return pd.DataFrame(data)
@@ -1,15 +1,16 @@
 from dataclasses import dataclass
 from types import NoneType
-from typing import Iterable, Union
+from typing import Callable, Iterable, Union
 
 import pandas as pd
 
 from natug.constants import bases
 from natug.constants.bases import COMPLEMENTS
+from natug.structures.ids import live_id
 from natug.structures.points.point import Point
 
 
-@dataclass
+@dataclass(slots=True)
 class Nucleoside(Point):
     """
     Nucleoside object.
@@ -25,24 +26,29 @@ class Nucleoside(Point):
 
     @property
     def matching(self):
-        try:
-            other_helix = self.helix.other_helix()
-            return other_helix.data.points[len(other_helix) - 1 - self.helical_index]
-        except IndexError:
+        if self.helix is None:
             return None
+        return self.helix.mate(self.helical_index)
 
     @matching.setter
     def matching(self, value):
-        other_helix = self.helix.other_helix()
-        other_helix.data.points[len(other_helix) - 1 - self.helical_index] = value
+        mate_indices = self.helix.double_helix.mate_indices(self.helix.direction)
+        mate_index = mate_indices[self.helical_index]
+        if mate_index < 0:
+            raise IndexError("The nucleoside has no matching nucleoside.")
+        self.helix.other_helix().data.set_point(mate_index, value)
 
     def __setattr__(self, key, value):
         """
-        Restyle the nucleoside if a new base is set.
+        Restyle the nucleoside and record its base code if a new base is set.
         """
-        super().__setattr__(key, value)
-        if key == "base" and self.styles is not None and self.strand is not None:
-            self.styles.reset()
+        # Zero-argument super() doesn't work in slotted dataclasses, since the
+        # dataclass decorator replaces the class that the method was defined in
+        Point.__setattr__(self, key, value)
+        if key == "base":
+            if self.styles is not None and self.strand is not None:
+                self.styles.reset()
+            self.record()
 
     def to_NEMid(self):
         """
@@ -52,14 +58,15 @@ class Nucleoside(Point):
         """
         from natug.structures.points import NEMid
 
-        return NEMid(
+        NEMid_ = NEMid(
             x_coord=self.x_coord,
             z_coord=self.z_coord,
             angle=self.angle,
             direction=self.direction,
-            strand=self.strand,
             domain=self.domain,
         )
+        NEMid_.strand = self.strand
+        return NEMid_
 
     @property
     def complement(self) -> str:
@@ -83,7 +90,9 @@ class Nucleoside(Point):
         )
 
 
-def to_df(nucleosides: Iterable[Nucleoside]) -> None | pd.DataFrame:
+def to_df(
+    nucleosides: Iterable[Nucleoside], file_ids: Callable[[object], int] = live_id
+) -> None | pd.DataFrame:
     """
     Export the Nucleoside data to a pandas dataframe.
 
@@ -94,18 +103,30 @@ def to_df(nucleosides: Iterable[Nucleoside]) -> None | pd.DataFrame:
         added to the dataframe under the new header.
 
     Args:
-        nucleosides: The Nucleosides to export.
+        nucleosides: The Nucleosides to export. Segments of Nucleosides may be passed
+            in their place (see the points module's to_df function).
+        file_ids: Obtains the id to refer to each object by. Defaults to the
+            objects' own ids.
 
     Returns:
         None: If a filename is provided.
         pd.DataFrame: If a filename is not provided.
     """
     from natug.structures.points.point import to_df as fetch_points_dataframe
+    from natug.structures.strands.segment import Segment
 
     # Get the dataframe of all the Point data
-    data = fetch_points_dataframe(nucleosides)
-
-    # Add the NEMid specific data to the dataframe
-    data["nucleoside:base"] = [nucleoside.base for nucleoside in nucleosides]
+    data = fetch_points_dataframe(nucleosides, file_ids)
+
+    # Add the NEMid specific data to the dataframe, reading the bases of segments
+    # from their helices' stores
+    column = []
+    for nucleoside in nucleosides:
+        if isinstance(nucleoside, Segment):
+            store = nucleoside.helix.data.store
+            column.extend(store.sequence(nucleoside.as_slice()))
+        else:
+            column.append(nucleoside.base)
+    data["nucleoside:base"] = column
 
     return data
@@ -1,12 +1,14 @@
 import logging
 from dataclasses import dataclass, field
-from typing import Iterable, Tuple
-from uuid import uuid1
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
 
+import numpy as np
 import pandas as pd
 
 from natug import settings
 from natug.constants.directions import DOWN, UP
+from natug.structures.ids import live_id, new_id
 from natug.utils import rgb_to_hex
 
 logger = logging.getLogger(__name__)
@@ -41,13 +43,68 @@ def x_coord_from_angle(angle: float, domain: "Domain") -> float:
     return x_coord
 
 
-@dataclass
-class PointStyles:
+def x_coords_from_angles(
+    angles: np.ndarray,
+    theta_e: float | np.ndarray,
+    theta_i: float | np.ndarray,
+    index: int | np.ndarray,
+) -> np.ndarray:
     """
-    A container for the styles of a Point.
+    Compute x coords for an entire array of angles at once.
+
+    This is the array counterpart of x_coord_from_angle, and produces bitwise
+    identical results. Rather than reading the domain's properties for every angle,
+    the domain's theta_e, theta_i and index are passed in directly. They may either be
+    scalars (for a single domain) or arrays that broadcast against the angles (for
+    many domains at once, e.g. column vectors of shape (domain count, 1) against an
+    angle matrix of shape (domain count, points per helix)).
+
+    Args:
+        angles: The angles to compute x coords for.
+        theta_e: The exterior angle(s) of the domain(s) that the angles lie in.
+        theta_i: The interior angle(s) of the domain(s) that the angles lie in.
+        index: The index (or indices) of the domain(s) that the angles lie in.
+
+    Returns:
+        The x coords, in an array of the broadcast shape of the inputs.
+    """
+    # Broadcast every input against the others, so that the output has the
+    # broadcast shape of all of them (an array of indices against scalar angles
+    # included)
+    angles, theta_e, theta_i, index = np.broadcast_arrays(
+        angles, theta_e, theta_i, index
+    )
+
+    # modulo the angles between 0 and 360
+    angles = np.mod(angles, 360.0)
+
+    # Angles that come before the exterior angle are on the exterior side of the
+    # domain; the rest wrap back around through the interior angle.
+    exterior = angles < theta_e
+
+    x_coords = np.empty(angles.shape, dtype=float)
+    np.divide(angles, theta_e, out=x_coords, where=exterior)
+    np.divide(360 - angles, theta_i, out=x_coords, where=~exterior)
+
+    # domain n lies between [n, n+1] on the x axis
+    x_coords += index
+
+    return x_coords
+
+
+@dataclass(frozen=True, slots=True, eq=False)
+class PointStyle:
+    """
+    A resolved style record for a point.
+
+    Style records are immutable, and are shared between all the points that are
+    styled the same way, rather than each point having its own copy of its colors.
+    Use PointStyle.shared() to obtain a record. Since equal records are always the
+    same object, records compare and hash by identity. The shared records belong to
+    the open design, and are forgotten by clear_shared_styles() when another design
+    is loaded.
 
     Attributes:
-        point: The point that the styles are for.
         symbol: The symbol of the Point. Either a subset of pyqtgraph symbols or a str.
         size: The size of the symbol. This is in pixels.
         rotation: The rotation of the symbol. This only is checked when the symbol
@@ -56,21 +113,255 @@ class PointStyles:
         font: The font of the Point. This is only checked when the symbol is a custom
             symbol. This is a str.
         outline: The color of the outline of the Point. Tuple of (color, width).
-        state: The state of the Point. This is a str.
     """
 
-    point: "Point" = None
     symbol: str = None
-    size: int = None
+    size: float = None
     rotation: float = None
-    fill: Tuple[int, int, int] = None
+    fill: Tuple[float, float, float] = None
     font: str = None
-    outline: Tuple[Tuple[int, int, int], float] = None, None
-    state = "default"
+    outline: Tuple[Tuple[float, float, float], float] = None, None
+
+    @classmethod
+    def shared(
+        cls,
+        symbol: str = None,
+        size: float = None,
+        rotation: float = None,
+        fill: Iterable[float] = None,
+        font: str = None,
+        outline: Tuple[Iterable[float], float] = (None, None),
+    ) -> "PointStyle":
+        """
+        Obtain the shared style record with the given styles.
+
+        Colors may be passed as any iterable, and are stored as tuples.
+
+        Returns:
+            The style record. Equal records are always the same object.
+        """
+        key = (
+            symbol,
+            size,
+            rotation,
+            None if fill is None else tuple(fill),
+            font,
+            (None if outline[0] is None else tuple(outline[0]), outline[1]),
+        )
+        record = _point_style_records.get(key)
+        if record is None:
+            record = _point_style_records[key] = cls(*key)
+        return record
+
+
+# All the style records of the open design, by their styles, so that equal records
+# are shared
+_point_style_records: Dict[tuple, PointStyle] = {}
+
+
+def clear_shared_styles() -> None:
+    """
+    Forget the shared style records of the open design.
+
+    This is called when another design is loaded, so that the styles of previous
+    designs are not kept alive for the life of the program. Points that still refer
+    to a forgotten record keep it, but it is no longer shared with new points.
+    """
+    _point_style_records.clear()
+    _state_point_style.cache_clear()
+    _default_point_style.cache_clear()
+
+
+@lru_cache(maxsize=256)
+def _state_point_style(style: PointStyle, state: str) -> PointStyle:
+    """
+    Resolve the style record of a highlighted or selected point.
+
+    Args:
+        style: The point's current style record. Its symbol and font are kept.
+        state: Either "highlighted" or "selected".
+
+    Returns:
+        The style record for the state.
+    """
+    from natug.ui.plotters.utils import dim_color
+
+    fill = settings.colors[state]
+    return PointStyle.shared(
+        symbol=style.symbol,
+        size=18,
+        rotation=0,
+        fill=fill,
+        font=style.font,
+        outline=(dim_color(fill, 0.7), 1),
+    )
+
+
+@lru_cache(maxsize=4096)
+def _default_point_style(
+    style: PointStyle,
+    kind: str,
+    direction: int,
+    junctable: bool,
+    base: str | None,
+    color: Tuple[float, ...],
+    highlighted: bool,
+) -> PointStyle:
+    """
+    Resolve the style record of a point in the default state.
+
+    The record only depends on the arguments, so recently used combinations are
+    cached, and the record is shared by all points that it applies to.
+
+    Args:
+        style: The point's current style record. Styles that aren't set for the
+            point's kind (such as the font of a NEMid) are kept from it.
+        kind: The type of the point. Either "Nucleoside" or "NEMid".
+        direction: The direction of the point.
+        junctable: Whether the point is a junctable NEMid.
+        base: The base of the point if it is a Nucleoside.
+        color: The color of the point's strand.
+        highlighted: Whether the point's strand is highlighted.
+
+    Returns:
+        The style record.
+    """
+    from natug.ui.plotters.utils import dim_color
+
+    symbol, size, rotation, fill, font, outline = (
+        style.symbol,
+        style.size,
+        style.rotation,
+        style.fill,
+        style.font,
+        style.outline,
+    )
+
+    # If strand color is light use dark outline else use a light outline
+    contrasting_outline = (
+        ((200, 200, 200), 0.65) if (sum(color) < (255 * 3) / 2) else ((0, 0, 0), 0.5)
+    )
+
+    if kind == "Nucleoside":
+        if base is None:
+            # Baseless nucleosides are normally colored
+            fill = dim_color(color, 0.9)
+            outline = contrasting_outline
+
+            # Since there is no base make he symbol an arrow
+            symbol = "V"
+            rotation = {UP: 180, DOWN: 0}[direction]
+            font = "Monaco"
+
+            # Since there's no base make the point smaller
+            size = 6.4
+        else:
+            # Based nucleosides are dimly colored
+            fill = dim_color(color, 0.3)
+            outline = dim_color(color, 0.5), 0.3
+
+            # Since there is a base make the symbol the base
+            symbol = base
+
+            # Make the base orient based off of the symbol direction
+            rotation = -90 if direction is UP else 90
+
+            # Since there is a base make it bigger
+            size = 6
+    elif kind == "NEMid":
+        # All NEMids share some common styles
+        symbol = "t1" if direction is UP else "t"
+        rotation = 0
+        size = 6
+
+        if junctable:
+            # junctable NEMids are dimly colored
+            fill = (244, 244, 244)
+            outline = dim_color(color, 0.5), 0.3
+        else:
+            # non-junctable NEMids are normally colored
+            fill = dim_color(color, 0.9)
+            outline = contrasting_outline
+
+    # Enlarge the point if the strands strand exists and is highlighted
+    if highlighted:
+        size *= 2
+
+    return PointStyle.shared(
+        symbol=symbol,
+        size=size,
+        rotation=rotation,
+        fill=fill,
+        font=font,
+        outline=outline,
+    )
+
+
+@dataclass(slots=True)
+class PointStyles:
+    """
+    A container for the styles of a Point.
+
+    The styles themselves are stored in a shared PointStyle record, so restyling a
+    point only swaps which record it refers to.
+
+    Attributes:
+        point: The point that the styles are for.
+        style: The shared style record of the point.
+        state: The state of the Point. This is a str.
+        symbol: The symbol of the Point. Either a subset of pyqtgraph symbols or a str.
+        size: The size of the symbol. This is in pixels.
+        rotation: The rotation of the symbol. This only is checked when the symbol
+            isn't a default symbol (is not in all_symbols). This is in degrees.
+        fill: The color of the Point. Tuple of (r, g, b) values.
+        font: The font of the Point. This is only checked when the symbol is a custom
+            symbol. This is a str.
+        outline: The color of the outline of the Point. Tuple of (color, width).
+    """
+
+    point: "Point" = field(default=None, repr=False)
+    style: PointStyle = field(default_factory=PointStyle.shared)
+    state: str = "default"
 
     all_states = ("default", "highlighted", "selected")
     all_symbols = ("o", "t", "t1", "t2", "t3", "s", "p", "h", "star", "+", "d", "x")
 
+    @classmethod
+    def from_values(cls, point: "Point" = None, state: str = "default", **styles):
+        """
+        Create point styles from individual style values.
+
+        Args:
+            point: The point that the styles are for.
+            state: The state of the point.
+            **styles: The styles, which are passed to PointStyle.shared().
+        """
+        return cls(point=point, style=PointStyle.shared(**styles), state=state)
+
+    @property
+    def symbol(self) -> str:
+        return self.style.symbol
+
+    @property
+    def size(self) -> float:
+        return self.style.size
+
+    @property
+    def rotation(self) -> float:
+        return self.style.rotation
+
+    @property
+    def fill(self) -> Tuple[float, float, float]:
+        return self.style.fill
+
+    @property
+    def font(self) -> str:
+        return self.style.font
+
+    @property
+    def outline(self) -> Tuple[Tuple[float, float, float], float]:
+        return self.style.outline
+
     def is_state(self, state: str):
         """Return whether the point is in the given state."""
         return self.state == state
@@ -89,79 +380,194 @@ class PointStyles:
         Automatically set the styles of the point based on the state.
         """
         from natug.structures.points import NEMid, Nucleoside
-        from natug.ui.plotters.utils import dim_color
 
         strand, point = self.point.strand, self.point  # Create easy references
 
-        if self.point.strand is None:
+        if strand is None:
             return
-        if self.state == "highlighted":
-            self.fill = settings.colors["highlighted"]
-            self.size = 18
-            self.rotation = 0
-            self.outline = dim_color(self.fill, 0.7), 1
-        elif self.state == "selected":
-            self.fill = settings.colors["selected"]
-            self.size = 18
-            self.rotation = 0
-            self.outline = dim_color(self.fill, 0.7), 1
+        if self.state in ("highlighted", "selected"):
+            self.style = _state_point_style(self.style, self.state)
         elif self.state == "default":
             if isinstance(point, Nucleoside):
-                if point.base is None:
-                    # Baseless nucleosides are normally colored
-                    self.fill = dim_color(strand.styles.color.value, 0.9)
-
-                    # If strand color is light use dark outline else use a light outline
-                    self.outline = (
-                        ((200, 200, 200), 0.65)
-                        if (sum(strand.styles.color.value) < (255 * 3) / 2)
-                        else ((0, 0, 0), 0.5)
-                    )
-
-                    # Since there is no base make he symbol an arrow
-                    self.symbol = "V"
-                    self.rotation = {UP: 180, DOWN: 0}[point.direction]
-                    self.font = "Monaco"
-
-                    # Since there's no base make the point smaller
-                    self.size = 6.4
-                else:
-                    # Based nucleosides are dimly colored
-                    self.fill = dim_color(strand.styles.color.value, 0.3)
-                    self.outline = dim_color(strand.styles.color.value, 0.5), 0.3
-
-                    # Since there is a base make the symbol the base
-                    self.symbol = point.base  # type: ignore
-
-                    # Make the base orient based off of the symbol direction
-                    self.rotation = -90 if point.direction is UP else 90
-
-                    # Since there is a base make it bigger
-                    self.size = 6
+                kind, junctable, base = "Nucleoside", False, point.base
+            elif isinstance(point, NEMid):
+                kind, junctable, base = "NEMid", point.junctable, None
+            else:
+                return
+            self.style = _default_point_style(
+                self.style,
+                kind,
+                point.direction,
+                junctable,
+                base,
+                tuple(strand.styles.color.value),
+                bool(strand.styles.highlighted),
+            )
+
+    @staticmethod
+    def default_style(
+        kind: str, direction: int, junctable: bool, base: str | None, strand: "Strand"
+    ) -> PointStyle:
+        """
+        Obtain the style record of a point in the default state that is new.
+
+        This is the record that a point is given when it is created, so points that
+        haven't been created yet can be styled from their data.
+
+        Args:
+            kind: The type of the point. Either "Nucleoside" or "NEMid".
+            direction: The direction of the point.
+            junctable: Whether the point is a junctable NEMid.
+            base: The base of the point if it is a Nucleoside.
+            strand: The strand that the point belongs to.
+
+        Returns:
+            The style record.
+        """
+        return _default_point_style(
+            PointStyle.shared(),
+            kind,
+            direction,
+            junctable,
+            base,
+            tuple(strand.styles.color.value),
+            bool(strand.styles.highlighted),
+        )
+
+    @staticmethod
+    def reset_many(points: Iterable["Point"], strand: "Strand") -> None:
+        """
+        Put many points of a strand into the default state at once.
+
+        This is equivalent to calling change_state("default") on the styles of each
+        point, but the strand's styles are only looked up once.
+
+        Args:
+            points: The points to reset. They must all belong to the strand.
+            strand: The strand that the points belong to.
+        """
+        from natug.structures.points import NEMid, Nucleoside
+
+        color = tuple(strand.styles.color.value)
+        highlighted = bool(strand.styles.highlighted)
+        for point in points:
+            styles = point.styles
+            styles.state = "default"
+            if isinstance(point, Nucleoside):
+                kind, junctable, base = "Nucleoside", False, point.base
             elif isinstance(point, NEMid):
-                # All NEMids share some common styles
-                self.symbol = "t1" if point.direction is UP else "t"
-                self.rotation = 0
-                self.size = 6
-
-                if point.junctable:
-                    # junctable NEMids are dimly colored
-                    self.fill = (244, 244, 244)
-                    self.outline = dim_color(strand.styles.color.value, 0.5), 0.3
-                else:
-                    # non-junctable NEMids are normally colored
-                    self.fill = dim_color(strand.styles.color.value, 0.9)
-
-                    # If strand color is light use dark outline else use a light outline
-                    self.outline = (
-                        ((200, 200, 200), 0.65)
-                        if (sum(strand.styles.color.value) < (255 * 3) / 2)
-                        else ((0, 0, 0), 0.5)
-                    )
-
-            # Enlarge the point if the strands strand exists and is highlighted
-            if strand is not None and strand.styles.highlighted:
-                self.size *= 2
+                kind, junctable, base = "NEMid", point.junctable, None
+            else:
+                continue
+            styles.style = _default_point_style(
+                styles.style,
+                kind,
+                point.direction,
+                junctable,
+                base,
+                color,
+                highlighted,
+            )
+
+
+@dataclass(slots=True)
+class PointStyleColumns:
+    """
+    The styles of many points, stored as columns.
+
+    Points share their style records, so the distinct records are gathered once,
+    and each point refers to its record by index. The per-point columns are then
+    filled from the records with a single fancy index each.
+
+    Attributes:
+        records: The distinct style records of the points.
+        codes: The index of each point's record within records.
+        symbol: The symbol of each point.
+        size: The size of each point.
+        rotation: The rotation of each point.
+        fill: The fill color of each point, in rows of (r, g, b). Rows are NaN for
+            points without a fill.
+        font: The font of each point.
+        outline_color: The outline color of each point, in rows of (r, g, b). Rows
+            are NaN for points without an outline color.
+        outline_width: The outline width of each point.
+    """
+
+    records: List[PointStyle]
+    codes: np.ndarray
+    symbol: np.ndarray
+    size: np.ndarray
+    rotation: np.ndarray
+    fill: np.ndarray
+    font: np.ndarray
+    outline_color: np.ndarray
+    outline_width: np.ndarray
+
+    @classmethod
+    def from_points(cls, points: Sequence["Point"]) -> "PointStyleColumns":
+        """
+        Gather the styles of many points into columns.
+
+        Args:
+            points: The points to gather the styles of.
+
+        Returns:
+            The styles of the points, in the same order as the points.
+        """
+        return cls.from_records([point.styles.style for point in points])
+
+    @classmethod
+    def from_records(cls, styles: Sequence[PointStyle]) -> "PointStyleColumns":
+        """
+        Gather the style records of many points into columns.
+
+        Args:
+            styles: The style record of each point.
+
+        Returns:
+            The styles of the points, in the same order as the records.
+        """
+        # Records are shared, so they are told apart by identity
+        indices: Dict[int, int] = {}
+        records: List[PointStyle] = []
+
+        def code(style: PointStyle) -> int:
+            """The index of a record within records, adding it if it is new."""
+            index = indices.get(id(style))
+            if index is None:
+                index = indices[id(style)] = len(records)
+                records.append(style)
+            return index
+
+        codes = np.fromiter(map(code, styles), dtype=int, count=len(styles))
+
+        def column(values, dtype=float):
+            """Create a per-point column from a per-record column."""
+            if dtype is float:
+                values = [np.nan if value is None else value for value in values]
+            table = np.empty(len(records), dtype=dtype)
+            table[:] = values
+            return table[codes]
+
+        def color_column(colors):
+            """Create a per-point column of colors from a per-record column."""
+            table = np.full((len(records), 3), np.nan)
+            for index, color in enumerate(colors):
+                if color is not None:
+                    table[index] = color[:3]
+            return table[codes]
+
+        return cls(
+            records=records,
+            codes=codes,
+            symbol=column([record.symbol for record in records], dtype=object),
+            size=column([record.size for record in records]),
+            rotation=column([record.rotation for record in records]),
+            fill=color_column([record.fill for record in records]),
+            font=column([record.font for record in records], dtype=object),
+            outline_color=color_column([record.outline[0] for record in records]),
+            outline_width=column([record.outline[1] for record in records]),
+        )
 
 
 @dataclass(kw_only=True, slots=True)
@@ -177,7 +583,8 @@ class Point:
         angle: Angle from this domain and next domains' line of tangency going
             counterclockwise.
         direction: The direction of the helix at this point.
-        strand: The strand that this point belongs to. Can be None.
+        strand: The strand that this point belongs to. Can be None. The strands of
+            points that lie on a helix are recorded in the store of the helix.
         helix: The helix that this point belongs to. Can be None. A helix is like a
             strand, but does not traverse domains. It represents the original strand
             that the point started out in. The helix is used to identify the
@@ -187,7 +594,8 @@ class Point:
         linkage: The linkage that this point belongs to. Can be None.
         domain: The domain this point belongs to.
         styles: The styles of the point.
-        uuid (str): The uuid of the point. This is automatically generated post init.
+        uuid (int): The compact integer id of the point. This is automatically
+            generated.
 
     Methods:
         x_coord_from_angle: Obtain the x coord of the point from the angle.
@@ -195,6 +603,7 @@ class Point:
         is_endpoint: Return whether the point is an endpoint in the strand.
         is_head: Whether the point is the last point in the strand.
         is_tail: Whether the point is the first point in the strand.
+        record: Record the point's data into the store of its helix.
         midpoint: Obtain the midpoint between this point and a different point.
         overlaps: Return whether the point overlaps with another point.
     """
@@ -206,7 +615,7 @@ class Point:
 
     # nucleic acid attributes
     direction: int = None
-    strand: "Strand" = field(default=None, repr=False)
+    _strand: "Strand" = field(default=None, init=False, repr=False, compare=False)
     helix: "Helix" = field(default=None, repr=False)
     helical_index: int = field(default=None, repr=False)
     linkage: "Linkage" = None
@@ -215,7 +624,7 @@ class Point:
     # plotting attributes
     styles: PointStyles = field(default=None, repr=False)
 
-    uuid: str = field(default_factory=lambda: str(uuid1()))
+    uuid: int = field(default_factory=new_id)
 
     def __post_init__(self):
         """
@@ -248,6 +657,22 @@ class Point:
 
         self.styles.reset()
 
+    @property
+    def strand(self) -> "Strand | None":
+        # Strands record themselves into the stores of the helices of their points a
+        # segment at a time, so only points that don't lie on a helix refer to their
+        # strand directly
+        if self.helix is None or self.helical_index is None:
+            return self._strand
+        return self.helix.data.strand_of(self.helical_index)
+
+    @strand.setter
+    def strand(self, strand: "Strand | None") -> None:
+        if self.helix is None or self.helical_index is None:
+            self._strand = strand
+        else:
+            self.helix.data.record_strand(self.helical_index, strand)
+
     def overlaps(self, point: "Point", width=None) -> bool:
         """
         Return whether the point overlaps with another point.
@@ -336,7 +761,7 @@ class Point:
         assert self.strand is not None, "Point has no strand"
 
         if of_its_type:
-            items = self.strand.items.by_type(type(self))
+            items = self.strand.items.typed(type(self))
             return self == items[0] or self == items[-1]
         else:
             return self == self.strand.items[0] or self == self.strand.items[-1]
@@ -362,7 +787,7 @@ class Point:
         assert self.strand is not None, "Point has no strand"
 
         if of_its_type:
-            items = self.strand.items.by_type(type(self))
+            items = self.strand.items.typed(type(self))
             return self == items[-1]
         else:
             return self == self.strand.items[-1]
@@ -388,7 +813,7 @@ class Point:
         assert self.strand is not None, "Point has no strand"
 
         if of_its_type:
-            items = self.strand.items.by_type(type(self))
+            items = self.strand.items.typed(type(self))
             return self == items[0]
         else:
             return self == self.strand.items[0]
@@ -410,6 +835,16 @@ class Point:
         else:
             return self.strand.index(self)
 
+    def record(self) -> None:
+        """
+        Record the point's strand, base and junction state into its helix's store.
+
+        This must be called after those attributes change, so that the store stays in
+        step with the point. Points without a helix have nothing to record into.
+        """
+        if self.helix is not None:
+            self.helix.data.record(self)
+
     def position(self) -> Tuple[float, float]:
         """
         Obtain coords of the point as a tuple of form (x, z).
@@ -429,7 +864,9 @@ class Point:
         )
 
 
-def to_df(points: Iterable[Point]) -> pd.DataFrame:
+def to_df(
+    points: Iterable["Point | Segment"], file_ids: Callable[[object], int] = live_id
+) -> pd.DataFrame:
     """
     Export an iterable of points to a csv file or pandas dataframe.
 
@@ -437,11 +874,17 @@ def to_df(points: Iterable[Point]) -> pd.DataFrame:
     the point styles.
 
     Args:
-        points: The points to export.
+        points: The points to export. Segments may be passed in place of the points
+            of helices when the file ids are FileIds, and the points of the segments
+            are then exported from the data of their helices (see segment_rows).
+        file_ids: Obtains the id to refer to each object by. Defaults to the
+            objects' own ids.
 
     Returns:
         pd.DataFrame: A dataframe that has all the points and their attributes.
     """
+    from natug.structures.strands.segment import Segment
+
     # create a dataframe from the points
     data = {
         "uuid": [],
@@ -458,7 +901,11 @@ def to_df(points: Iterable[Point]) -> pd.DataFrame:
         "style:state": [],
     }
     for point in points:
-        data["uuid"].append(point.uuid)
+        if isinstance(point, Segment):
+            for column, values in segment_rows(point, file_ids).items():
+                data[column].extend(values)
+            continue
+        data["uuid"].append(file_ids(point))
         data["data:x_coord"].append(point.x_coord)
         data["data:z_coord"].append(point.z_coord)
         data["data:angle"].append(point.angle)
@@ -476,3 +923,78 @@ def to_df(points: Iterable[Point]) -> pd.DataFrame:
         data["style:state"].append(point.styles.state)
 
     return pd.DataFrame(data)
+
+
+def segment_rows(segment: "Segment", file_ids: "FileIds") -> Dict[str, list]:
+    """
+    Obtain the columns of the rows of the points of a segment, like to_df does.
+
+    The data of the points is read from the data arrays and store of the segment's
+    helix, so points that haven't been created yet aren't created. They are given
+    the styles that they would be given when they are created. Points that have
+    been created are exported from themselves.
+
+    Args:
+        segment: The segment.
+        file_ids: The file ids, which must have given the segment's points ids.
+
+    Returns:
+        The columns of to_df, for the points of the segment.
+    """
+    from natug.structures.helices.point_store import BASES, NEMID
+    from natug.structures.strands.strand import Strand
+
+    helix, key = segment.helix, segment.as_slice()
+    data, store = helix.data, helix.data.store
+    kinds = store.kinds[key].tolist()
+    junctables = store.junctables[key].tolist()
+    bases = store.bases[key].tolist()
+    strand_ids = store.strand_ids[key].tolist()
+
+    rows = {
+        "uuid": file_ids.segment_ids(segment).tolist(),
+        "data:x_coord": np.round(data.x_coords[key], 5).tolist(),
+        "data:z_coord": np.round(data.z_coords[key], 5).tolist(),
+        "data:angle": (data.angles[key] % 360).tolist(),
+        "data:domain": [helix.domain.index] * len(segment),
+        "data:direction": ["UP" if helix.direction == UP else "DOWN"] * len(segment),
+    }
+    styles, states = [], []
+    for position, point in enumerate(data.points[key].tolist()):
+        if point is not None:
+            for column, value in (
+                ("data:x_coord", point.x_coord),
+                ("data:z_coord", point.z_coord),
+                ("data:angle", point.angle),
+                ("data:domain", point.domain.index),
+                ("data:direction", "UP" if point.direction == UP else "DOWN"),
+            ):
+                rows[column][position] = value
+            styles.append(point.styles.style)
+            states.append(point.styles.state)
+            continue
+
+        strand = Strand.of_uuid(strand_ids[position])
+        if strand is None:
+            styles.append(PointStyle.shared())
+        else:
+            styles.append(
+                PointStyles.default_style(
+                    "NEMid" if kinds[position] == NEMID else "Nucleoside",
+                    helix.direction,
+                    junctables[position],
+                    BASES[bases[position]],
+                    strand,
+                )
+            )
+        states.append("default")
+
+    rows["style:symbol"] = [style.symbol for style in styles]
+    rows["style:size"] = [style.size for style in styles]
+    rows["style:rotation"] = [style.rotation for style in styles]
+    rows["style:fill"] = [rgb_to_hex(style.fill) for style in styles]
+    rows["style:outline"] = [
+        f"{rgb_to_hex(style.outline[0])}, " f"{style.outline[1]}px" for style in styles
+    ]
+    rows["style:state"] = states
+    return rows
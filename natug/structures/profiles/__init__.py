@@ -1 +1 @@
-from .nucleic_acid_profile import NucleicAcidProfile
+from .nucleic_acid_profile import DerivedConstants, NucleicAcidProfile
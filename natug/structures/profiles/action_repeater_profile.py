@@ -37,6 +37,10 @@ class ActionRepeaterProfile:
         Args:
             point: The point to start the action at. Must have a "helix" attribute.
             action: The action to run.
+
+        Notes:
+            The action is run along the point's helix, whose store is used to skip
+            the points of the helix that the action can't apply to.
         """
         self.strands.do_many(
             action,
@@ -44,5 +48,5 @@ class ActionRepeaterProfile:
             self.repeat_every * self.repeat_every_multiplier,
             self.repeat_for,
             self.bidirectional,
-            point.helix.data.points,
+            point.helix,
         )
@@ -1,12 +1,54 @@
 import json
 from dataclasses import asdict, dataclass, field
-from typing import Iterable, List
-from uuid import uuid1
+from typing import Callable, Iterable, List
 
 import pandas as pd
 from openpyxl.worksheet.worksheet import Worksheet as pyxlWorksheet
 from xlsxwriter.utility import xl_col_to_name
 
+from natug.structures.ids import live_id, new_id
+
+
+@dataclass(frozen=True, slots=True)
+class DerivedConstants:
+    """
+    Constants that are derived from the parameters of a nucleic acid profile.
+
+    Attributes:
+        Z_b: The base height.
+        theta_b: The base angle.
+        theta_c: The characteristic angle.
+        theta_s: The angle adjustment switching from down strand to up strand.
+    """
+
+    Z_b: float
+    theta_b: float
+    theta_c: float
+    theta_s: float
+
+    @classmethod
+    def from_profile(cls, profile: "NucleicAcidProfile") -> "DerivedConstants":
+        """
+        Compute the derived constants of a nucleic acid profile.
+
+        Args:
+            profile: The nucleic acid profile to derive the constants from.
+
+        Returns:
+            The derived constants.
+        """
+        theta_c = 360 / profile.B
+        if profile.g % theta_c <= theta_c / 2:
+            theta_s = profile.g % theta_c  # Bill 2/12/23
+        else:
+            theta_s = profile.g % -theta_c
+        return cls(
+            Z_b=(profile.T * profile.H) / profile.B,
+            theta_b=360 * (profile.T / profile.B),
+            theta_c=theta_c,
+            theta_s=theta_s,
+        )
+
 
 @dataclass(kw_only=True)
 class NucleicAcidProfile:
@@ -24,7 +66,10 @@ class NucleicAcidProfile:
         Z_mate: Nucleoside-Mate Vertical Distance.
         theta_s: Switch angle.
         notes: Notes about the nucleic acid profile.
-        uuid: The uuid of the nucleic acid profile. This is automatically generated.
+        uuid: The unique identifier of the nucleic acid profile. This is automatically
+            generated.
+        derived: The constants derived from the parameters, such as Z_b and theta_b.
+            This is recomputed whenever a parameter is set.
 
     Methods:
         update: Update our nucleic_acid_profile in place.
@@ -43,22 +88,32 @@ class NucleicAcidProfile:
     notes: str = ""
     Z_mate: float = 0.094
 
-    uuid: str = field(default_factory=lambda: str(uuid1()))
+    uuid: int | str = field(default_factory=new_id)
+
+    def __post_init__(self):
+        self.derived = DerivedConstants.from_profile(self)
+
+    def __setattr__(self, name, value):
+        super().__setattr__(name, value)
+        # Refresh the derived constants when a parameter changes. They don't exist
+        # yet while the dataclass's __init__ is still setting the parameters.
+        if name in ("H", "g", "T", "B") and "derived" in self.__dict__:
+            self.derived = DerivedConstants.from_profile(self)
 
     @property
     def Z_b(self) -> float:
         """The base height."""
-        return (self.T * self.H) / self.B
+        return self.derived.Z_b
 
     @property
     def theta_b(self) -> float:
         """The base angle."""
-        return 360 * (self.T / self.B)
+        return self.derived.theta_b
 
     @property
     def theta_c(self) -> float:
         """The characteristic angle."""
-        return 360 / self.B
+        return self.derived.theta_c
 
     @property
     def theta_s(self) -> float:
@@ -68,10 +123,7 @@ class NucleicAcidProfile:
         Notes:
             Bill 2/12/23
         """
-        if self.g % self.theta_c <= self.theta_c / 2:
-            return self.g % self.theta_c
-        else:
-            return self.g % -self.theta_c
+        return self.derived.theta_s
 
     def update(self, profile: "NucleicAcidProfile") -> None:
         """
@@ -212,18 +264,23 @@ class NucleicAcidProfile:
         return all(getattr(self, attr) == getattr(other, attr) for attr in asdict(self))
 
 
-def to_df(nucleic_acid_profiles: Iterable[NucleicAcidProfile]) -> pd.DataFrame:
+def to_df(
+    nucleic_acid_profiles: Iterable[NucleicAcidProfile],
+    file_ids: Callable[[object], int] = live_id,
+) -> pd.DataFrame:
     """
     Export one or more nucleic acid profile(s) to a dataframe.
 
     Args:
         nucleic_acid_profiles: The nucleic acid profiles to export.
+        file_ids: Obtains the id to refer to each object by. Defaults to the
+            objects' own ids.
 
     Returns:
         A dataframe containing the nucleic acid profiles.
     """
     data = {
-        "uuid": [nap.uuid for nap in nucleic_acid_profiles],
+        "uuid": [file_ids(nap) for nap in nucleic_acid_profiles],
         "name": [nap.name for nap in nucleic_acid_profiles],
         "data:D": [nap.D for nap in nucleic_acid_profiles],
         "data:H": [nap.H for nap in nucleic_acid_profiles],
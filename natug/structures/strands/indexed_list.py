@@ -0,0 +1,142 @@
+import logging
+from typing import Dict, Iterable, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class IndexedList(list):
+    """
+    A list that finds its items by identity, through a map of their positions.
+
+    The position of each item is kept in a map keyed by the identity of the item, so
+    that finding an item, checking whether an item is present, and removing an item
+    are lookups rather than scans. The map is built when it is first needed, kept up
+    to date when items are appended, and dropped when the items are otherwise changed
+    (to be rebuilt when it is next needed).
+
+    Items are compared by identity rather than equality, so an item is only found
+    if it is the very object that was added.
+
+    Subclasses that keep more data about the items can extend _appended and _changed
+    to keep that data up to date too.
+
+    Methods:
+        index: The position of an item.
+        remove: Remove an item.
+    """
+
+    __slots__ = ("_positions",)
+
+    def __init__(self, items: Iterable = ()) -> None:
+        super().__init__(items)
+        # The position of each item, keyed by the id of the item. None until built.
+        self._positions: Dict[int, int] | None = None
+
+    def __reduce__(self):
+        # The position map is keyed by the ids of the items, so copies must build
+        # their own
+        return type(self), (list(self),)
+
+    def _appended(self, items: Tuple) -> None:
+        """Update the position map before items are appended to the end."""
+        if self._positions is not None:
+            for position, item in enumerate(items, start=len(self)):
+                self._positions.setdefault(id(item), position)
+
+    def _changed(self) -> None:
+        """Drop the position map, after the items were changed out of order."""
+        self._positions = None
+
+    def _positions_of(self) -> Dict[int, int]:
+        """Obtain the position map of the items, building it if needed."""
+        if self._positions is None:
+            # Map the items in reverse, so that items that appear more than once keep
+            # their first position, like list.index finds
+            self._positions = dict(
+                zip(map(id, reversed(self)), range(len(self) - 1, -1, -1))
+            )
+        return self._positions
+
+    def append(self, item) -> None:
+        self._appended((item,))
+        super().append(item)
+
+    def extend(self, items: Iterable) -> None:
+        items = tuple(items)
+        self._appended(items)
+        super().extend(items)
+
+    def __iadd__(self, items: Iterable) -> "IndexedList":
+        self.extend(items)
+        return self
+
+    def insert(self, position: int, item) -> None:
+        self._changed()
+        super().insert(position, item)
+
+    def remove(self, item) -> None:
+        """
+        Remove an item.
+
+        Args:
+            item: The item to remove. It is found by identity.
+
+        Raises:
+            ValueError: If the item is not in the list.
+        """
+        del self[self.index(item)]
+
+    def pop(self, position: int = -1):
+        self._changed()
+        return super().pop(position)
+
+    def clear(self) -> None:
+        self._changed()
+        super().clear()
+
+    def reverse(self) -> None:
+        self._changed()
+        super().reverse()
+
+    def sort(self, *args, **kwargs) -> None:
+        self._changed()
+        super().sort(*args, **kwargs)
+
+    def __setitem__(self, key, value) -> None:
+        self._changed()
+        super().__setitem__(key, value)
+
+    def __delitem__(self, key) -> None:
+        self._changed()
+        super().__delitem__(key)
+
+    def __imul__(self, count: int) -> "IndexedList":
+        self._changed()
+        return super().__imul__(count)
+
+    def __contains__(self, item) -> bool:
+        return id(item) in self._positions_of()
+
+    def index(self, item, *args) -> int:
+        """
+        Obtain the position of an item.
+
+        Items are found by identity, which is a lookup in the position map.
+
+        Args:
+            item: The item to find.
+            *args: The start and end positions to search between, like list.index.
+                Searches that are bounded fall back to list.index.
+
+        Returns:
+            The position of the item.
+
+        Raises:
+            ValueError: If the item is not in the list.
+        """
+        if args:
+            return super().index(item, *args)
+        try:
+            return self._positions_of()[id(item)]
+        except KeyError:
+            raise ValueError(f"{item} is not in the list.") from None
@@ -1,12 +1,12 @@
 from dataclasses import InitVar, dataclass
-from typing import Iterable, List, Literal, Tuple
-from uuid import uuid1
+from typing import Callable, Iterable, List, Literal, Tuple
 
 import numpy as np
 import pandas as pd
 
 from natug import settings
 from natug.constants.directions import DOWN, UP
+from natug.structures.ids import live_id, new_id
 from natug.structures.points import Nucleoside
 from natug.ui.plotters.utils import chaikins_corner_cutting
 from natug.utils import rgb_to_hex
@@ -63,7 +63,7 @@ class Linkage:
             initialisation, and the third is the average of the two, with a boost in its
             z coord.
         inflection: Whether the linkage is bent upwards or downwards when plotted.
-        uuid (str): The unique identifier of the linkage. Automatically generated post
+        uuid (int): The unique identifier of the linkage. Automatically generated post
             init.
 
     Methods:
@@ -79,7 +79,7 @@ class Linkage:
         strand: "Strand" = None,  # type: ignore
         items: Iterable[Nucleoside] = None,
         count: int = 6,
-        uuid: str = None,
+        uuid: int = None,
         styles: LinkageStyles = None,
     ):
         self.inflection = inflection
@@ -107,7 +107,7 @@ class Linkage:
         self.plot_points = chaikins_corner_cutting(basic_plot_points, refinements=3)
 
         # Set the uuid of the linkage.
-        self.uuid = uuid or str(uuid1())
+        self.uuid = uuid if uuid is not None else new_id()
 
     def generate(self, length: int):
         """
@@ -193,7 +193,7 @@ class Linkage:
         self.items.extend(items)
 
 
-def to_df(linkages: Iterable[Linkage]):
+def to_df(linkages: Iterable[Linkage], file_ids: Callable[[object], int] = live_id):
     """
     Export an iterable of linkages to a pandas dataframe.
 
@@ -203,6 +203,8 @@ def to_df(linkages: Iterable[Linkage]):
 
     Args:
         linkages: The linkages to export.
+        file_ids: Obtains the id to refer to each object by. Defaults to the
+            objects' own ids.
     """
     data = {
         "uuid": [],
@@ -220,12 +222,12 @@ def to_df(linkages: Iterable[Linkage]):
         for nucleoside in linkage:
             sequence += nucleoside.base or "X"
 
-        data["uuid"].append(linkage.uuid)
+        data["uuid"].append(file_ids(linkage))
         data["data:sequence"].append(sequence)
         data["data:inflection"].append(linkage.inflection)
         data["data:coord_one"].append(", ".join(map(str, linkage.plot_points[0])))
         data["data:coord_two"].append(", ".join(map(str, linkage.plot_points[-1])))
-        data["data:strand"].append(linkage.strand.uuid if linkage.strand else None)
+        data["data:strand"].append(file_ids(linkage.strand) if linkage.strand else None)
         data["style:color"].append(rgb_to_hex(linkage.styles.color))
         data["style:thickness"].append(linkage.styles.thickness)
 
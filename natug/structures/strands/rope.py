@@ -0,0 +1,261 @@
+import logging
+import random
+from typing import Iterable, Iterator, List, Tuple
+
+from natug.structures.strands.segment import Segment
+
+logger = logging.getLogger(__name__)
+
+# The priorities of the nodes of ropes are random, which keeps ropes balanced. They
+# are drawn from their own generator so that they don't disturb the module's.
+_priorities = random.Random()
+
+
+def _piece_size(piece) -> int:
+    """Obtain the number of items in a piece."""
+    return len(piece) if isinstance(piece, Segment) else 1
+
+
+class _Node:
+    """
+    A node of a rope.
+
+    Nodes are never changed once they are created, so that ropes can share them.
+
+    Attributes:
+        piece: The piece of the node.
+        priority: The priority of the node. Nodes have lower priorities than their
+            parents.
+        left: The node of the pieces before the piece, or None.
+        right: The node of the pieces after the piece, or None.
+        size: The number of items in the pieces of the node and its descendants.
+        count: The number of pieces of the node and its descendants.
+    """
+
+    __slots__ = "piece", "priority", "left", "right", "size", "count"
+
+    def __init__(self, piece, priority: float, left, right) -> None:
+        self.piece = piece
+        self.priority = priority
+        self.left = left
+        self.right = right
+        self.size = _piece_size(piece)
+        self.count = 1
+        for child in (left, right):
+            if child is not None:
+                self.size += child.size
+                self.count += child.count
+
+
+def _merge(left: _Node | None, right: _Node | None) -> _Node | None:
+    """Obtain the node of the pieces of one node followed by those of another."""
+    if left is None:
+        return right
+    if right is None:
+        return left
+    if left.priority > right.priority:
+        return _Node(left.piece, left.priority, left.left, _merge(left.right, right))
+    return _Node(right.piece, right.priority, _merge(left, right.left), right.right)
+
+
+def _split(node: _Node | None, position: int) -> Tuple[_Node | None, _Node | None]:
+    """Obtain the nodes of the items before and after a position of a node."""
+    if node is None:
+        return None, None
+    left_size = 0 if node.left is None else node.left.size
+    piece_size = _piece_size(node.piece)
+    if position <= left_size:
+        left, right = _split(node.left, position)
+        return left, _Node(node.piece, node.priority, right, node.right)
+    if position >= left_size + piece_size:
+        left, right = _split(node.right, position - left_size - piece_size)
+        return _Node(node.piece, node.priority, node.left, left), right
+
+    # The position falls within a segment, so the segment is split in two
+    offset = position - left_size
+    first = _Node(node.piece.sliced(0, offset), _priorities.random(), None, None)
+    second = _Node(
+        node.piece.sliced(offset, piece_size), _priorities.random(), None, None
+    )
+    return _merge(node.left, first), _merge(second, node.right)
+
+
+def _build(pieces: List) -> _Node | None:
+    """Build the node of pieces, in time linear in the number of pieces."""
+    priorities = [_priorities.random() for _ in pieces]
+
+    # Each piece's parent is the nearest piece on either side with a higher priority,
+    # which a stack of the pieces whose right children are still open finds
+    lefts, rights = [None] * len(pieces), [None] * len(pieces)
+    stack = []
+    for number, priority in enumerate(priorities):
+        last = None
+        while stack and priorities[stack[-1]] < priority:
+            last = stack.pop()
+        lefts[number] = last
+        if stack:
+            rights[stack[-1]] = number
+        stack.append(number)
+
+    def node(number: int | None) -> _Node | None:
+        if number is None:
+            return None
+        return _Node(
+            pieces[number],
+            priorities[number],
+            node(lefts[number]),
+            node(rights[number]),
+        )
+
+    return node(stack[0]) if stack else None
+
+
+class Rope:
+    """
+    A persistent sequence of pieces of strand items.
+
+    The pieces are held in a treap (a binary tree whose nodes have random priorities,
+    which keeps it balanced) of the numbers of items in them, so a rope is split at
+    any position and joined to another rope in time logarithmic in the number of
+    pieces. Positions within segments are found the same way, and a segment that a
+    split falls within is split in two.
+
+    Ropes are never changed once they are created. Splitting and joining ropes
+    creates new ropes that share most of their nodes with the ropes that they were
+    created from, so a rope and its parts can all be used afterwards.
+
+    Attributes:
+        root: The root node of the rope, or None if the rope is empty.
+
+    Methods:
+        of: Create a rope of pieces.
+        pieces: The pieces of the rope, in order.
+        nodes: The nodes of the rope.
+        locate: The piece that holds the item at a position.
+        split: The ropes of the items before and after a position.
+        reversed: The rope of the pieces in reverse order.
+    """
+
+    __slots__ = ("root",)
+
+    def __init__(self, root: _Node | None = None) -> None:
+        self.root = root
+
+    @classmethod
+    def of(cls, pieces: Iterable) -> "Rope":
+        """
+        Create a rope of pieces.
+
+        Args:
+            pieces: The pieces, in order. Segments that continue one another are
+                joined.
+
+        Returns:
+            The rope.
+        """
+        joined = []
+        for piece in pieces:
+            if isinstance(piece, Segment):
+                if not len(piece):
+                    continue
+                if joined and isinstance(joined[-1], Segment):
+                    segment = joined[-1].joined(piece)
+                    if segment is not None:
+                        joined[-1] = segment
+                        continue
+            joined.append(piece)
+        return cls(_build(joined))
+
+    def __len__(self) -> int:
+        """Obtain the number of items in the rope."""
+        return 0 if self.root is None else self.root.size
+
+    def count(self) -> int:
+        """Obtain the number of pieces in the rope."""
+        return 0 if self.root is None else self.root.count
+
+    def pieces(self) -> Iterator:
+        """Obtain the pieces of the rope, in order."""
+        stack, node = [], self.root
+        while stack or node is not None:
+            while node is not None:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            yield node.piece
+            node = node.right
+
+    def nodes(self) -> Iterator[_Node]:
+        """Obtain the nodes of the rope, in no particular order."""
+        stack = [] if self.root is None else [self.root]
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(child for child in (node.left, node.right) if child)
+
+    def locate(self, position: int) -> Tuple[object, int]:
+        """
+        Obtain the piece that holds the item at a position.
+
+        Args:
+            position: The (non-negative) position of the item.
+
+        Returns:
+            The piece, and the position that the piece begins at.
+
+        Raises:
+            IndexError: If the position is not within the rope.
+        """
+        if not 0 <= position < len(self):
+            raise IndexError("Rope index out of range.")
+        node, start = self.root, 0
+        while True:
+            left_size = 0 if node.left is None else node.left.size
+            if position < start + left_size:
+                node = node.left
+                continue
+            start += left_size
+            piece_size = _piece_size(node.piece)
+            if position < start + piece_size:
+                return node.piece, start
+            start += piece_size
+            node = node.right
+
+    def split(self, position: int) -> Tuple["Rope", "Rope"]:
+        """
+        Obtain the ropes of the items before and after a position.
+
+        Args:
+            position: The (non-negative) position to split at.
+
+        Returns:
+            The rope of the items before the position, and the rope of the items from
+            the position on.
+        """
+        left, right = _split(self.root, position)
+        return Rope(left), Rope(right)
+
+    def __add__(self, other: "Rope") -> "Rope":
+        """Obtain the rope of the items of this rope followed by another's."""
+        if self.root is None or other.root is None:
+            return Rope(self.root if other.root is None else other.root)
+
+        # The last piece of this rope and the first of the other are joined if they
+        # are segments that continue one another
+        last = self.locate(len(self) - 1)[0]
+        first = other.locate(0)[0]
+        if isinstance(last, Segment) and isinstance(first, Segment):
+            joined = last.joined(first)
+            if joined is not None:
+                left = _split(self.root, len(self) - len(last))[0]
+                right = _split(other.root, len(first))[1]
+                middle = _Node(joined, _priorities.random(), None, None)
+                return Rope(_merge(_merge(left, middle), right))
+        return Rope(_merge(self.root, other.root))
+
+    def reversed(self) -> "Rope":
+        """Obtain the rope of the pieces in reverse order."""
+        return Rope.of(
+            piece.reversed() if isinstance(piece, Segment) else piece
+            for piece in reversed(tuple(self.pieces()))
+        )
@@ -0,0 +1,141 @@
+import logging
+from dataclasses import dataclass
+from typing import Iterator, Tuple, Type
+
+from natug.structures.points import NEMid, Nucleoside
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, slots=True, eq=False, repr=False)
+class Segment:
+    """
+    A run of points of a helix, in the order that a strand visits them.
+
+    Strands mostly consist of long runs of consecutive points along helices, so the
+    runs are stored as the helix and the range of helical indices that they cover,
+    rather than as point objects. The points are obtained from the helix when they
+    are accessed.
+
+    Attributes:
+        helix: The helix that the points lie on.
+        indices: The helical indices of the points, in order. The step is 1 or -1 for
+            runs of consecutive points, or 2 or -2 for runs of the points of one type.
+
+    Methods:
+        sliced: Obtain a segment of part of the points.
+        reversed: Obtain a segment of the points in reverse order.
+        joined: Obtain a segment of the points of this segment followed by another's.
+        of_type: Obtain a segment of the points of specific types.
+        position: Obtain the position of a point within the segment.
+        as_slice: Obtain a slice of the helix's arrays that covers the segment.
+    """
+
+    helix: "Helix"
+    indices: range
+
+    def __len__(self) -> int:
+        return len(self.indices)
+
+    def __repr__(self) -> str:
+        return f"Segment(helix=#{self.helix.uuid}, indices={self.indices})"
+
+    def __getitem__(self, position: int) -> "Point":
+        return self.helix[self.indices[position]]
+
+    def __iter__(self) -> Iterator["Point"]:
+        helix, points = self.helix, self.helix.data.points
+        for index in self.indices:
+            point = points[index]
+            yield helix[index] if point is None else point
+
+    def sliced(self, start: int, stop: int) -> "Segment":
+        """
+        Obtain a segment of part of the points.
+
+        Args:
+            start: The position of the first point, within this segment.
+            stop: The position after the last point, within this segment.
+
+        Returns:
+            A segment of the points between the positions.
+        """
+        return Segment(self.helix, self.indices[start:stop])
+
+    def reversed(self) -> "Segment":
+        """Obtain a segment of the points in reverse order."""
+        return Segment(self.helix, self.indices[::-1])
+
+    def joined(self, other: "Segment") -> "Segment | None":
+        """
+        Obtain a segment of the points of this segment followed by another's.
+
+        Args:
+            other: The segment whose points follow this segment's.
+
+        Returns:
+            The joined segment, or None if the points of the two segments don't form
+            one run (because they lie on different helices, or aren't evenly spaced).
+        """
+        if other.helix is not self.helix:
+            return None
+        step = other.indices[0] - self.indices[-1]
+        if step == 0:
+            return None
+        for segment in (self, other):
+            if len(segment) > 1 and segment.indices.step != step:
+                return None
+        return Segment(
+            self.helix, range(self.indices[0], other.indices[-1] + step, step)
+        )
+
+    def of_type(self, types: Tuple[Type, ...]) -> "Segment":
+        """
+        Obtain a segment of the points of specific types.
+
+        Points alternate between nucleosides and NEMids along a helix, so the points
+        of one type are every other point of the segment.
+
+        Args:
+            types: The types of points to keep.
+
+        Returns:
+            A segment of the points that are instances of any of the types. It may be
+            empty.
+        """
+        kept = [cls for cls in (Nucleoside, NEMid) if issubclass(cls, types)]
+        if len(kept) == 2:
+            return self
+        if not kept or not self.indices:
+            return Segment(self.helix, self.indices[0:0])
+        first = self.indices[0]
+        first_type = (
+            Nucleoside
+            if (first % 2 == 0) == (self.helix.data.begin is Nucleoside)
+            else NEMid
+        )
+        if abs(self.indices.step) == 2:
+            return self if first_type is kept[0] else self.sliced(0, 0)
+        return Segment(self.helix, self.indices[int(first_type is not kept[0]) :: 2])
+
+    def position(self, point: "Point") -> int | None:
+        """
+        Obtain the position of a point within the segment.
+
+        Args:
+            point: The point to find. It is found by identity.
+
+        Returns:
+            The position of the point, or None if the point is not in the segment.
+        """
+        index = point.helical_index
+        if index not in self.indices or self.helix.data.points[index] is not point:
+            return None
+        return self.indices.index(index)
+
+    def as_slice(self) -> slice:
+        """Obtain a slice of the helix's arrays that covers the segment."""
+        indices = self.indices
+        if indices.step > 0 or indices.stop >= 0:
+            return slice(indices.start, indices.stop, indices.step)
+        return slice(indices.start, None, indices.step)
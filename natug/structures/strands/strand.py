@@ -1,19 +1,22 @@
-import itertools
 import logging
 import random
 from copy import copy, deepcopy
 from dataclasses import dataclass, field
-from typing import Iterable, Iterator, List, Set, Tuple, Type
-from uuid import uuid1
+from typing import Callable, Dict, Iterable, Iterator, List, Set, Tuple, Type
+from weakref import WeakValueDictionary
 
+import numpy as np
 import pandas as pd
 
 from natug.constants.bases import DNA
 from natug.constants.directions import *
+from natug.structures.ids import FileIds, live_id, new_id
 from natug.structures.points import NEMid, Nucleoside
 from natug.structures.points.point import Point
 from natug.structures.profiles import NucleicAcidProfile
 from natug.structures.strands.linkage import Linkage
+from natug.structures.strands.rope import Rope
+from natug.structures.strands.segment import Segment
 from natug.structures.strands.utils import shuffled
 from natug.utils import rgb_to_hex
 
@@ -105,12 +108,12 @@ class StrandStyles:
     def highlight(self):
         """Highlight the strand."""
         self.highlighted = True
-        self.strand.strands.style()
+        self.strand.strands.style(only_changed=True)
 
     def reset(self):
         """Reset the strand to its default state."""
         self.highlighted = False
-        self.strand.strands.style()
+        self.strand.strands.style(only_changed=True)
 
     def __deepcopy__(self, memodict={}):
         return StrandStyles(
@@ -121,87 +124,511 @@ class StrandStyles:
         )
 
 
-class StrandItems(list):
+class StrandItems:
     """
     A container for the items in a Strand.
 
-    This is a subclass of deque with various utility methods.
+    The items are stored as pieces. Runs of consecutive points of a helix are stored
+    as segments (see Segment), and every other item (linkages, and points that don't
+    lie on a helix) is a piece of its own. The pieces are held in a rope (see Rope),
+    so the items are split at any position, joined to other items, and rotated in
+    time logarithmic in the number of pieces. Ropes are never changed once they are
+    created, so slices and copies of the items share the rope's nodes rather than
+    copying the pieces, and changing the items replaces their rope.
+
+    The points of segments are only obtained from their helices when they are
+    accessed. Items are found by identity. A point of a segment is found through its
+    helical index, and any other item through a map of the pieces keyed by identity.
+    That map is built when it is first needed and dropped whenever the items change.
+    The items of each combination of types are cached the same way.
+
+    Attributes:
+        rope: The rope of the pieces of the items.
+        pieces: The segments and items that make up the items, in order.
+        strand: The strand that was last recorded as the strand of the items, or None.
 
     Methods:
-        NEMids: A list of all the NEMids in the StrandItems.
-        nucleosides: A list of all the nucleosides in the StrandItems.
-        unpacked: A list of all the items in the StrandItems where all iterables are
-            unpacked.
-        unpack: Replace all the items in the StrandItems with the unpacked version of
-            the StrandItems.
-        item_types: A list of all the types of items in the StrandItems.
+        from_pieces: Create the items from pieces.
+        by_type: The items of specific types.
+        typed: The items of specific types, which are cached.
+        index: The position of an item.
+        index_of_type: The position of an item among the items of specific types.
+        rotated: The items rotated so that they begin at a position.
+        type_count: The number of items of specific types.
+        unpacked_count: The number of items once iterables are unpacked.
+        split: Split the items at the items of a type.
+        unpacked: The items where all iterables are unpacked.
+        item_types: The types of the items.
+        created: The items of specific types whose objects have been created.
+        domain_at: The domain of the item at a position.
+        record: Record a strand as the strand of the items.
     """
 
+    __slots__ = "rope", "strand", "_pieces", "_lookup", "_typed"
+
+    def __init__(self, items: Iterable = ()) -> None:
+        self.rope = Rope()
+        self.strand: "Strand | None" = None
+        # The pieces of the rope, in order. None until built.
+        self._pieces: Tuple | None = None
+        # The pieces of each helix (for segments) and of each other item, with the
+        # positions that they begin at, keyed by their ids. None until built.
+        self._lookup: Dict[int, List[Tuple[object, int]]] | None = None
+        # The items of each combination of types
+        self._typed: Dict[Tuple[Type, ...], StrandItems] = {}
+        self.extend(items)
+
+    @classmethod
+    def from_pieces(cls, pieces: Iterable) -> "StrandItems":
+        """
+        Create the items from pieces.
+
+        Args:
+            pieces: Segments, and items that are pieces of their own.
+
+        Returns:
+            The items. Segments that continue one another are joined.
+        """
+        return cls._of_rope(Rope.of(pieces))
+
+    @classmethod
+    def _of_rope(cls, rope: Rope) -> "StrandItems":
+        """Create the items of a rope."""
+        items = cls()
+        items.rope = rope
+        return items
+
+    @staticmethod
+    def _piece_of(item) -> "Segment | object":
+        """Obtain the piece that holds a single item."""
+        helix = item.helix if isinstance(item, Point) else None
+        if (
+            helix is not None
+            and helix.data.points is not None
+            and helix.data.points[item.helical_index] is item
+        ):
+            index = item.helical_index
+            return Segment(helix, range(index, index + 1))
+        return item
+
+    @staticmethod
+    def _rope_of(items: Iterable) -> Rope:
+        """Obtain the rope of some items, which may already be StrandItems."""
+        if isinstance(items, StrandItems):
+            return items.rope
+        return Rope.of(map(StrandItems._piece_of, items))
+
+    def _replace(self, rope: Rope) -> None:
+        """Replace the rope of the items."""
+        self.rope = rope
+        self._pieces = self._lookup = None
+        self._typed.clear()
+
+    @property
+    def pieces(self) -> Tuple:
+        """Obtain the pieces of the items, in order."""
+        if self._pieces is None:
+            self._pieces = tuple(self.rope.pieces())
+        return self._pieces
+
+    def _lookup_of(self) -> Dict[int, List[Tuple[object, int]]]:
+        """Obtain the pieces by their ids, building them if needed."""
+        if self._lookup is None:
+            self._lookup = {}
+            start = 0
+            for piece in self.pieces:
+                if isinstance(piece, Segment):
+                    key, size = id(piece.helix), len(piece)
+                else:
+                    key, size = id(piece), 1
+                self._lookup.setdefault(key, []).append((piece, start))
+                start += size
+        return self._lookup
+
+    def _sliced(self, start: int, stop: int) -> "StrandItems":
+        """Obtain the items between two (non-negative) positions."""
+        if start >= stop:
+            return StrandItems()
+        return StrandItems._of_rope(self.rope.split(stop)[0].split(start)[1])
+
+    def __len__(self) -> int:
+        return len(self.rope)
+
+    def __bool__(self) -> bool:
+        return self.rope.root is not None
+
+    def __iter__(self) -> Iterator:
+        for piece in self.rope.pieces():
+            if isinstance(piece, Segment):
+                yield from piece
+            else:
+                yield piece
+
+    def __reversed__(self) -> Iterator:
+        for piece in reversed(self.pieces):
+            if isinstance(piece, Segment):
+                yield from piece.reversed()
+            else:
+                yield piece
+
+    def __repr__(self) -> str:
+        return f"StrandItems({list(self.pieces)})"
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            start, stop, step = key.indices(len(self))
+            if step == 1:
+                return self._sliced(start, stop)
+            return StrandItems(self[position] for position in range(start, stop, step))
+
+        length = len(self)
+        position = key + length if key < 0 else key
+        if not 0 <= position < length:
+            raise IndexError("StrandItems index out of range.")
+        piece, piece_start = self.rope.locate(position)
+        if isinstance(piece, Segment):
+            return piece[position - piece_start]
+        return piece
+
+    def __setitem__(self, key, value) -> None:
+        if isinstance(key, slice):
+            positions = range(len(self))[key]
+            if positions.step != 1:
+                items = list(self)
+                items[key] = value
+                self._replace(self._rope_of(items))
+                return
+            start, stop = positions.start, max(positions.start, positions.stop)
+            replacement = self._rope_of(value)
+        else:
+            start = range(len(self))[key]
+            stop = start + 1
+            replacement = self._rope_of((value,))
+        before, after = self.rope.split(start)
+        self._replace(before + replacement + after.split(stop - start)[1])
+
+    def __delitem__(self, key) -> None:
+        if not isinstance(key, slice):
+            position = range(len(self))[key]
+            key = slice(position, position + 1)
+        self[key] = ()
+
+    def __contains__(self, item) -> bool:
+        try:
+            self.index(item)
+        except ValueError:
+            return False
+        return True
+
+    def __add__(self, other: Iterable) -> "StrandItems":
+        return StrandItems._of_rope(self.rope + self._rope_of(other))
+
+    def __iadd__(self, other: Iterable) -> "StrandItems":
+        self.extend(other)
+        return self
+
+    def __copy__(self) -> "StrandItems":
+        return StrandItems._of_rope(self.rope)
+
+    def append(self, item) -> None:
+        self._replace(self.rope + Rope.of((self._piece_of(item),)))
+
+    def extend(self, items: Iterable) -> None:
+        self._replace(self.rope + self._rope_of(items))
+
+    def appendleft(self, item) -> None:
+        self._replace(Rope.of((self._piece_of(item),)) + self.rope)
+
+    def extendleft(self, items: Iterable) -> None:
+        """Extend the items to the left, like deque.extendleft (so in reverse)."""
+        self._replace(self._rope_of(items).reversed() + self.rope)
+
+    def insert(self, position: int, item) -> None:
+        self[position:position] = (item,)
+
+    def remove(self, item) -> None:
+        """
+        Remove an item.
+
+        Args:
+            item: The item to remove. It is found by identity.
+
+        Raises:
+            ValueError: If the item is not in the items.
+        """
+        del self[self.index(item)]
+
+    def pop(self, position: int = -1):
+        item = self[position]
+        del self[position]
+        return item
+
+    def clear(self) -> None:
+        self._replace(Rope())
+
+    def reverse(self) -> None:
+        self._replace(self.rope.reversed())
+
+    def index(self, item, *args) -> int:
+        """
+        Obtain the position of an item.
+
+        Items are found by identity, through the pieces that may hold them.
+
+        Args:
+            item: The item to find.
+            *args: The start and end positions to search between, like list.index.
+
+        Returns:
+            The position of the item.
+
+        Raises:
+            ValueError: If the item is not in the items.
+        """
+        if args:
+            positions = range(len(self))[slice(*args)]
+            for position, candidate in zip(positions, self[positions.start :]):
+                if candidate is item:
+                    return position
+            raise ValueError(f"{item} is not in the strand items.")
+
+        lookup = self._lookup_of()
+        found = []
+        if isinstance(item, Point) and item.helix is not None:
+            for piece, start in lookup.get(id(item.helix), ()):
+                position = piece.position(item)
+                if position is not None:
+                    found.append(start + position)
+                    break
+        for piece, start in lookup.get(id(item), ())[:1]:
+            found.append(start)
+        if not found:
+            raise ValueError(f"{item} is not in the strand items.")
+        return min(found)
+
+    def rotated(self, position: int) -> "StrandItems":
+        """
+        Obtain the items rotated so that they begin at a position.
+
+        This is how a closed strand is opened at a given item. Only the pieces that
+        the position falls in are split.
+
+        Args:
+            position: The position of the item to begin at. Negative positions count
+                from the end of the items.
+
+        Returns:
+            The rotated items.
+        """
+        return self[position:] + self[:position]
+
+    def typed(self, *types) -> "StrandItems":
+        """
+        Obtain all the items of specific types.
+
+        This is like by_type, but the result is cached until the items change, so it
+        must not be modified.
+
+        Args:
+            types: The types of items to obtain.
+
+        Returns:
+            The items of the types, in order.
+        """
+        if types not in self._typed:
+            self._typed[types] = self.by_type(*types)
+        return self._typed[types]
+
+    def type_count(self, *types) -> int:
+        """
+        Obtain the number of items of specific types.
+
+        This is the same as len(by_type(*types)). The points of segments are counted
+        without being obtained from their helices.
+
+        Args:
+            types: The types of items to count.
+
+        Returns:
+            The number of items that are instances of any of the types.
+        """
+        return len(self.typed(*types))
+
+    def unpacked_count(self) -> int:
+        """
+        Obtain the number of items once iterables are unpacked.
+
+        This is the same as len(unpacked()). Only linkages are iterable, so only the
+        linkages are visited.
+
+        Returns:
+            The number of items, with each linkage counted as its nucleosides.
+        """
+        linkages = self.typed(Linkage).pieces
+        return len(self) - len(linkages) + sum(map(len, linkages))
+
+    def index_of_type(self, item, *types) -> int:
+        """
+        Obtain the position of an item among the items of specific types.
+
+        This is the same as by_type(*types).index(item), but the items of the types
+        are cached until the items change.
+
+        Args:
+            item: The item to find.
+            types: The types of the items to count positions among.
+
+        Returns:
+            The position of the item among the items of the types.
+
+        Raises:
+            ValueError: If the item is not among the items of the types.
+        """
+        return self.typed(*types).index(item)
+
     def by_type(self, *types) -> "StrandItems":
         """
-        Obtain a list of all the items of a specific type.
+        Obtain all the items of specific types.
+
+        Points alternate between types along segments, so the points of one type in
+        a segment are kept as a segment of every other point.
 
         Args:
             types: The types of items to obtain. If multiple types are specified, the
                 items of the types will be returned. Include types in the
                 function call as arguments.
+
         Returns:
-            list: A list of all the items of the specified type.
+            The items of the types, in order.
         """
-        return StrandItems((item for item in self if isinstance(item, types)))
-
-    def __add__(self, other):
-        new_strand_items = self
-        new_strand_items.extend(other)
-        return new_strand_items
+        return StrandItems.from_pieces(
+            piece.of_type(types) if isinstance(piece, Segment) else piece
+            for piece in self.pieces
+            if isinstance(piece, (Segment, *types))
+        )
 
-    def split(self, type_: Type) -> List[List[object]]:
+    def split(self, type_: Type) -> List["StrandItems"]:
         """
-        Split the items into a list of lists. A new list is created whenever an item
+        Split the items into a list of items. A new entry is created whenever an item
         of the specified type is encountered. The items of the specified type are not
-        included in the returned lists.
+        included in the returned entries.
 
         Args:
             type_: The type of items to split on.
 
         Returns:
-            list: A list of lists of items split on the specified type.
+            The items split on the specified type.
         """
         split = [[]]
-        for item in self:
-            if isinstance(item, type_):
-                split.append([])
+        for piece in self.pieces:
+            if isinstance(piece, Segment) and len(piece.of_type((type_,))):
+                # Points of the type split the segment, so it is split into points
+                pieces = map(self._piece_of, piece)
             else:
-                split[-1].append(item)
-        return split[:-1] if split[-1] == [] else split
+                pieces = (piece,)
+            for piece_ in pieces:
+                if not isinstance(piece_, Segment) and isinstance(piece_, type_):
+                    split.append([])
+                else:
+                    split[-1].append(piece_)
+        if not split[-1]:
+            del split[-1]
+        return [StrandItems.from_pieces(pieces) for pieces in split]
 
     def unpacked(self) -> "StrandItems":
         """
         Obtain an unpacked version of the items.
 
-        Return a list of all the contained items, and for each item, if it is an
-        iterable, unpack it.
+        Obtain all the contained items, and for each item, if it is an iterable,
+        unpack it.
 
         Returns:
-            list: A list of all the items in the StrandItems where all iterables are
-            unpacked.
+            The items where all iterables are unpacked.
         """
-        unpacked = []
-        for item in self:
-            if isinstance(item, Iterable):
-                unpacked.extend(item)
+        pieces = []
+        for piece in self.pieces:
+            if not isinstance(piece, Segment) and isinstance(piece, Iterable):
+                pieces.extend(map(self._piece_of, piece))
             else:
-                unpacked.append(item)
-        return StrandItems(unpacked)
+                pieces.append(piece)
+        return StrandItems.from_pieces(pieces)
 
     def item_types(self) -> Set[Type]:
         """
-        Obtain a list of all the types of items in the StrandItems.
+        Obtain all the types of items in the StrandItems.
 
         Returns:
-            list: A list of all the types of items in the StrandItems.
+            The types of the items.
         """
-        return set([type(item) for item in self])
+        types = set()
+        for piece in self.pieces:
+            if isinstance(piece, Segment):
+                types.update(
+                    type_
+                    for type_ in (Nucleoside, NEMid)
+                    if len(piece.of_type((type_,)))
+                )
+            else:
+                types.add(type(piece))
+        return types
+
+    def created(self, *types) -> Iterator:
+        """
+        Obtain the items of specific types whose objects have been created.
+
+        Points of segments that have not been accessed yet are skipped without being
+        obtained from their helices. Every other item has been created.
+
+        Args:
+            types: The types of items to obtain.
+
+        Yields:
+            The items of the types that have been created, in order.
+        """
+        for piece in self.pieces:
+            if isinstance(piece, Segment):
+                for point in piece.helix.data.points[piece.as_slice()]:
+                    if isinstance(point, types):
+                        yield point
+            elif isinstance(piece, types):
+                yield piece
+
+    def domain_at(self, position: int) -> "Domain":
+        """
+        Obtain the domain of the item at a position.
+
+        The domain of a point of a segment is the domain of its helix, so the point
+        is not obtained from the helix.
+
+        Args:
+            position: The position of the item. Negative positions count from the end
+                of the items.
+
+        Returns:
+            The domain of the item.
+        """
+        piece = self.rope.locate(range(len(self))[position])[0]
+        if isinstance(piece, Segment):
+            return piece.helix.domain
+        return piece.domain
+
+    def record(self, strand: "Strand | None") -> None:
+        """
+        Record a strand as the strand of the items.
+
+        The strand of the points of a segment is recorded into the store of their
+        helix with one array assignment, and every other item refers to its strand
+        directly.
+
+        Args:
+            strand: The strand that the items belong to, or None.
+        """
+        self.strand = strand
+        for piece in self.pieces:
+            if isinstance(piece, Segment):
+                piece.helix.data.record_strand(piece.as_slice(), strand)
+            else:
+                piece.strand = strand
 
 
 class Strand:
@@ -212,7 +639,8 @@ class Strand:
         name: The user-set name of the strand. This appears when exporting, and is used
             as a title.
         styles: The styles of the strand.
-        items: The items in the strand. This is a deque of Points.
+        items: The items in the strand, which are stored in segments (see
+            StrandItems).
         nucleic_acid_profile: The nucleic acid settings used.
         sequence (list): The sequence of the strand.
             This is a list of all the bases of all the nucleosides in the strand.
@@ -227,7 +655,7 @@ class Strand:
         cross_screen: Whether the strand wraps around the screen in the side view plot.
             This is automatically set during plotting with the SideViewPlotter, but can be
             set manually.
-        uuid (str): The unique identifier of the strand. This is automatically
+        uuid (int): The unique identifier of the strand. This is automatically
             generated.
 
     Methods:
@@ -248,15 +676,23 @@ class Strand:
         interdomain(): Whether there are items of differing domains in the strand.
         split(index or NEMid): Split the strand into two strands.
         index(item): Determine the index of an item.
-        sliced(from, to): Return self.NEMids as a list.
+        sliced(from, to): Obtain the items between two positions.
         clear_sequence(overwrite): Clear the sequence of the strand.
         randomize_sequence(overwrite): Randomize the sequence of the strand.
+        unset_bases(): Obtain whether each nucleoside is without a base.
         startswith(point): Determine whether the strand starts with a point.
         endswith(point): Determine whether the strand ends with a point.
         has_linkage(): Determine whether the strand has any linkages.
+        record(): Record the strand as the strand of its items.
+        of_uuid(uuid): Obtain the strand that has a uuid.
         clear(): Clear the strand.
     """
 
+    # The strands that exist, keyed by their uuids. The points that lie on helices
+    # have the uuids of their strands recorded in the stores of the helices, and
+    # their strands are looked up here.
+    _registry: "WeakValueDictionary[int, Strand]" = WeakValueDictionary()
+
     def __init__(
         self,
         items: Iterable[Point] = None,
@@ -268,10 +704,11 @@ class Strand:
         strands=None,
         helix=None,
         cross_screen=None,
-        uuid: str = None,
+        uuid: int = None,
     ):
         self.name = name
-        self.uuid = uuid or str(uuid1())
+        self.uuid = uuid if uuid is not None else new_id()
+        Strand._registry[self.uuid] = self
         self.items = StrandItems() if items is None else StrandItems(items)
         self.closed = closed
         self.helix = helix
@@ -294,11 +731,24 @@ class Strand:
         if self.styles.strand is None:
             self.styles.strand = self
 
-        self.uuid = str(uuid1())
+        self.uuid = new_id()
+
+    @classmethod
+    def of_uuid(cls, uuid: int) -> "Strand | None":
+        """
+        Obtain the strand that has a uuid.
+
+        Args:
+            uuid: The uuid of the strand.
+
+        Returns:
+            The strand, or None if no strand with the uuid exists anymore.
+        """
+        return cls._registry.get(uuid)
 
     def __len__(self) -> int:
-        """Obtain number of items in strand."""
-        return len(self.items.unpacked())
+        """Obtain number of items in strand, with linkages counted as their items."""
+        return self.items.unpacked_count()
 
     def __contains__(self, item) -> bool:
         """Determine whether item is in strand."""
@@ -379,12 +829,11 @@ class Strand:
         strand2.items = self.sliced(index + 1, None)
 
         # Update the items' parents (.strand)
-        for item in strand1.items:
-            item.strand = strand1
-        for item in strand2.items:
-            item.strand = strand2
+        strand1.record()
+        strand2.record()
 
-        self.strands.style()
+        self.strands.mark_changed(self)
+        self.strands.style(only_changed=True)
 
         return strand1, strand2
 
@@ -427,8 +876,8 @@ class Strand:
 
     def append(self, item: Point | Linkage) -> None:
         """Add an item to the right of the strand."""
-        item.strand = self
         self.items.append(item)
+        item.strand = self
 
     def appendleft(self, item: Point | Linkage):
         """
@@ -437,8 +886,8 @@ class Strand:
         Args:
             item: The item to add.
         """
-        item.strand = self
         self.items.appendleft(item)
+        item.strand = self
 
     def extend(self, items: Iterable[Point | Linkage]) -> None:
         """
@@ -447,9 +896,9 @@ class Strand:
         Args:
             items: The iterable to extend with.
         """
-        for item in items:
-            item.strand = self
+        items = StrandItems(items)
         self.items.extend(items)
+        items.record(self)
 
     def leftextend(self, items: Iterable[Point | Linkage]) -> None:
         """
@@ -458,9 +907,9 @@ class Strand:
         Args:
             items: The iterable to extend with.
         """
-        for item in items:
-            item.strand = self
+        items = StrandItems(items)
         self.items.extendleft(items)
+        items.record(self)
 
     def NEMids(self) -> List[NEMid]:
         """
@@ -500,53 +949,69 @@ class Strand:
         """
         Obtain a list of all points that wrap across the screen, going in both directions.
         """
+        # The x coords are read from the data arrays of the points' helices, so only
+        # the points that wrap are obtained from the helices
+        x_coords = self._coords("x_coord")
+        right_to_left = (x_coords[:-1] > domain_count - 1) & (x_coords[1:] < 1)
+        left_to_right = (x_coords[:-1] < 1) & (x_coords[1:] > domain_count - 1)
         wraps = []
-        for index in range(0, len(self.items) - 1):
-            point = self[index % len(self)]
-            next_point = self[(index + 1) % len(self)]
-
-            if point.x_coord > domain_count - 1 and next_point.x_coord < 1:
+        for index in np.flatnonzero(right_to_left | left_to_right).tolist():
+            point, next_point = self[index], self[index + 1]
+            if right_to_left[index]:
                 wraps.append(Wrap(WRAPS_RIGHT_TO_LEFT, point))
                 wraps.append(Wrap(WRAPS_LEFT_TO_RIGHT, next_point))
-            elif point.x_coord < 1 and next_point.x_coord > domain_count - 1:
+            else:
                 wraps.append(Wrap(WRAPS_LEFT_TO_RIGHT, point))
                 wraps.append(Wrap(WRAPS_RIGHT_TO_LEFT, next_point))
 
         if self.closed:
-            if self[0].x_coord < 1 and self[-1].x_coord > domain_count - 1:
+            if x_coords[0] < 1 and x_coords[-1] > domain_count - 1:
                 wraps.append(Wrap(WRAPS_LEFT_TO_RIGHT, self[0]))
                 wraps.append(Wrap(WRAPS_RIGHT_TO_LEFT, self[-1]))
-            elif self[0].x_coord > domain_count - 1 and self[-1].x_coord < 1:
+            elif x_coords[0] > domain_count - 1 and x_coords[-1] < 1:
                 wraps.append(Wrap(WRAPS_RIGHT_TO_LEFT, self[0]))
                 wraps.append(Wrap(WRAPS_LEFT_TO_RIGHT, self[-1]))
         return wraps
 
+    def record(self) -> None:
+        """
+        Record this strand as the strand of its items.
+
+        This must be called after items are moved into the strand. The strand is
+        recorded into the stores of the helices one segment at a time (see
+        StrandItems.record), so this takes time in the number of segments.
+        """
+        self.items.record(self)
+
     def has_linkage(self) -> bool:
         """Determine whether the strand has any linkages."""
-        for item in self.items:
-            if isinstance(item, Linkage):
-                return True
-        return False
+        return bool(self.items.type_count(Linkage))
 
     @property
     def sequence(self):
-        return [
-            nucleoside.base
-            for nucleoside in StrandItems(self.items.unpacked()).by_type(Nucleoside)
-        ]
+        # The bases of the nucleosides of segments are read from the stores of their
+        # helices
+        sequence = []
+        for piece in self.items.unpacked().by_type(Nucleoside).pieces:
+            if isinstance(piece, Segment):
+                sequence.extend(piece.helix.data.store.sequence(piece.as_slice()))
+            else:
+                sequence.append(piece.base)
+        return sequence
 
     @sequence.setter
     def sequence(self, new_sequence: List[str]):
         logger.debug(f"Setting sequence of %s to %s", self.name, new_sequence)
         nucleosides = self.items.unpacked().by_type(Nucleoside)
 
-        if len(new_sequence) == len(self.sequence):
-            for index, base in enumerate(new_sequence):
-                our_nucleoside = nucleosides[index]
+        if len(new_sequence) == len(nucleosides):
+            mates = self.mates(nucleosides)
+            for our_nucleoside, matching_nucleoside, base in zip(
+                nucleosides, mates, new_sequence
+            ):
                 our_nucleoside.base = base
-
-                matching_nucleoside = our_nucleoside.matching
-                if matching_nucleoside:
+                # Helices of different sizes may line up a NEMid with the nucleoside
+                if isinstance(matching_nucleoside, Nucleoside):
                     matching_nucleoside.base = our_nucleoside.complement
         else:
             raise ValueError(
@@ -554,23 +1019,54 @@ class Strand:
                 + f"match number of nucleosides in strand ({len(self)})"
             )
 
+    def mates(self, nucleosides: Iterable[Nucleoside] | None = None) -> np.ndarray:
+        """
+        Obtain the Watson-Crick mate of each nucleoside of the strand.
+
+        The mates are looked up with the mate index arrays of the double helices, one
+        helix at a time, so that the cost is linear in the number of nucleosides.
+
+        Args:
+            nucleosides: The nucleosides of the strand, in order. If None, they are
+                obtained from the strand.
+
+        Returns:
+            An object array of the mate of each nucleoside, in the order of the
+            strand's sequence. Nucleosides without a mate have None as their mate.
+        """
+        if nucleosides is None:
+            nucleosides = self.items.unpacked().by_type(Nucleoside)
+
+        # Group the positions of the nucleosides by the helix that they lie on
+        helices = {}
+        for position, nucleoside in enumerate(nucleosides):
+            if nucleoside.helix is not None:
+                helices.setdefault(id(nucleoside.helix), []).append(position)
+
+        mates = np.full(len(nucleosides), None, dtype=object)
+        for positions in helices.values():
+            helix = nucleosides[positions[0]].helix
+            other_helix = helix.other_helix()
+            mate_indices = helix.double_helix.mate_indices(helix.direction)[
+                [nucleosides[position].helical_index for position in positions]
+            ]
+            for position, mate_index in zip(positions, mate_indices.tolist()):
+                if mate_index >= 0:
+                    mates[position] = other_helix[mate_index]
+        return mates
+
     @property
     def complements(self):
-        output = [
-            nucleoside.matching.base if nucleoside.matching is not None else None
-            for nucleoside in StrandItems(self.items.unpacked()).by_type(Nucleoside)
+        return [
+            mate.base if isinstance(mate, Nucleoside) else None for mate in self.mates()
         ]
-        return output
 
     def has_complements(self):
         """
         Return a list of bools that indicate whether the mate of each nucleoside
         is present (True) or not (False).
         """
-        return [
-            nucleoside.matching is not None
-            for nucleoside in StrandItems(self.items.unpacked()).by_type(Nucleoside)
-        ]
+        return [isinstance(mate, Nucleoside) for mate in self.mates()]
 
     @staticmethod
     def random_sequence(length: int) -> List[str]:
@@ -595,11 +1091,54 @@ class Strand:
                 to a random nucleoside. If overwrite is True then all nucleosides
                 will be set to a random nucleoside.
         """
-        for nucleoside in self.items.unpacked().by_type(Nucleoside):
-            if overwrite or nucleoside.base is None:
-                nucleoside.base = random.choice(DNA)
-                if nucleoside.matching is not None:
-                    nucleoside.matching.complement = nucleoside.base
+        nucleosides = self.items.unpacked().by_type(Nucleoside)
+        mates = self.mates(nucleosides)
+        if overwrite:
+            positions = range(len(nucleosides))
+        else:
+            positions = np.flatnonzero(self.unset_bases(nucleosides)).tolist()
+        for position in positions:
+            nucleoside = nucleosides[position]
+            nucleoside.base = random.choice(DNA)
+            # Helices of different sizes may line up a NEMid with the nucleoside
+            if isinstance(mates[position], Nucleoside):
+                mates[position].complement = nucleoside.base
+
+    def unset_bases(
+        self, nucleosides: Iterable[Nucleoside] | None = None
+    ) -> np.ndarray:
+        """
+        Obtain whether each nucleoside of the strand is without a base.
+
+        The bases are looked up in the stores of the helices that the nucleosides
+        lie on, one helix at a time. Nucleosides that don't lie on a helix, like
+        those of linkages, are checked one by one.
+
+        Args:
+            nucleosides: The nucleosides of the strand, in order. If None, they are
+                obtained from the strand.
+
+        Returns:
+            A mask of the nucleosides without a base, in the order of the strand's
+            sequence.
+        """
+        if nucleosides is None:
+            nucleosides = self.items.unpacked().by_type(Nucleoside)
+
+        unset = np.zeros(len(nucleosides), dtype=bool)
+        helices = {}
+        for position, nucleoside in enumerate(nucleosides):
+            if nucleoside.helix is None:
+                unset[position] = nucleoside.base is None
+            else:
+                helices.setdefault(id(nucleoside.helix), []).append(position)
+
+        for positions in helices.values():
+            helix = nucleosides[positions[0]].helix
+            unset[positions] = helix.data.store.unset_bases()[
+                [nucleosides[position].helical_index for position in positions]
+            ]
+        return unset
 
     def clear_sequence(self) -> None:
         """Clear the sequence of the strand."""
@@ -614,8 +1153,8 @@ class Strand:
             return None
 
     def sliced(self, start: int | None, end: int | None) -> StrandItems:
-        """Return self.NEMids as a list."""
-        return StrandItems(itertools.islice(self.items, start, end))
+        """Obtain the items between two positions."""
+        return self.items[start:end]
 
     def touching(self, other: "Strand") -> bool:
         """
@@ -656,52 +1195,99 @@ class Strand:
 
     def up_strand(self) -> bool:
         """Whether the strand is an up strand."""
-        checks = [bool(NEMid_.direction) for NEMid_ in self.items.by_type(NEMid)]
-        return all(checks)
+        # The points of a segment share the direction of their helix
+        return all(
+            bool(_piece_direction(piece)) for piece in self.items.by_type(NEMid).pieces
+        )
 
     def down_strand(self) -> bool:
         """Whether the strand is a down strand."""
-        checks = [(not bool(NEMid_.direction)) for NEMid_ in self.items.by_type(NEMid)]
-        return all(checks)
+        return all(
+            (not bool(_piece_direction(piece)))
+            for piece in self.items.by_type(NEMid).pieces
+        )
 
     def interdomain(self) -> bool:
         """Whether all the items in this strand belong to the same domain."""
         from natug.structures.domains import Domain
 
-        try:
-            points = self.items.by_type(Point)
-            checker = None
+        # The points of a segment share the domain of their helix
+        domains = [_piece_domain(piece) for piece in self.items.by_type(Point).pieces]
+        checker = None
 
-            # Find the first domain that shows up in the strand to use as a checker
-            for item in points:
-                if isinstance(item.domain, Domain):
-                    checker = item.domain
-                    break
+        # Find the first domain that shows up in the strand to use as a checker
+        for domain in domains:
+            if isinstance(domain, Domain):
+                checker = domain
+                break
 
-            # Make sure that every other domain is the same as the checker
-            for item in points:
-                if item.domain != checker and item.domain is not None:
-                    return True
-        except IndexError:
-            return False
+        # Make sure that every other domain is the same as the checker
+        for domain in domains:
+            if domain != checker and domain is not None:
+                return True
 
         return False
 
+    def _coords(self, coord: str) -> np.ndarray:
+        """
+        Obtain a coordinate of each item of the strand.
+
+        The coordinates of the points of segments are read from the data arrays of
+        their helices, rounded like the coordinates of points are.
+
+        Args:
+            coord: The name of the coordinate. Either "x_coord" or "z_coord".
+
+        Returns:
+            The coordinate of each item, in order.
+        """
+        values = []
+        for piece in self.items.pieces:
+            if isinstance(piece, Segment):
+                coords = getattr(piece.helix.data, f"{coord}s")[piece.as_slice()]
+                values.append(np.round(coords, 5))
+            else:
+                values.append((getattr(piece, coord),))
+        return np.concatenate(values) if values else np.zeros(0)
+
+    def _coord_extreme(self, coord: str, extreme: Callable) -> float:
+        """
+        Obtain the extreme value of a coordinate of the points of the strand.
+
+        The coordinates of the points of segments are read from the data arrays of
+        their helices, rounded like the coordinates of points are.
+
+        Args:
+            coord: The name of the coordinate. Either "x_coord" or "z_coord".
+            extreme: Either min or max.
+
+        Returns:
+            The extreme value of the coordinate.
+        """
+        values = []
+        for piece in self.items.by_type(Point).pieces:
+            if isinstance(piece, Segment):
+                coords = getattr(piece.helix.data, f"{coord}s")[piece.as_slice()]
+                values.append(round(extreme(coords), 5))
+            else:
+                values.append(getattr(piece, coord))
+        return extreme(values)
+
     def y_min(self) -> float:
         """The minimum y-coordinate of the strand."""
-        return min([item.z_coord for item in self.items if isinstance(item, Point)])
+        return self._coord_extreme("z_coord", min)
 
     def y_max(self) -> float:
         """The maximum y-coordinate of the strand."""
-        return max([item.z_coord for item in self.items if isinstance(item, Point)])
+        return self._coord_extreme("z_coord", max)
 
     def x_min(self) -> float:
         """The minimum x-coordinate of the strand."""
-        return min([item.x_coord for item in self.items if isinstance(item, Point)])
+        return self._coord_extreme("x_coord", min)
 
     def x_max(self) -> float:
         """Obtain the maximum x-coordinate of the strand."""
-        return max([item.x_coord for item in self.items if isinstance(item, Point)])
+        return self._coord_extreme("x_coord", max)
 
     def height(self) -> float:
         """The height of the strand in nanometers."""
@@ -725,12 +1311,29 @@ class Strand:
         return self.width(), self.height()
 
 
-def to_df(strands: Iterable[Strand]) -> pd.DataFrame:
+def _piece_direction(piece: "Segment | Point") -> int:
+    """Obtain the direction of the points of a piece of strand items."""
+    return piece.helix.direction if isinstance(piece, Segment) else piece.direction
+
+
+def _piece_domain(piece: "Segment | Point") -> "Domain | None":
+    """Obtain the domain of the points of a piece of strand items."""
+    if isinstance(piece, Segment):
+        double_helix = piece.helix.double_helix
+        return double_helix.domain if double_helix is not None else None
+    return piece.domain
+
+
+def to_df(
+    strands: Iterable[Strand], file_ids: Callable[[object], int] = live_id
+) -> pd.DataFrame:
     """
     Export the strand to a pandas dataframe.
 
     Arguments:
         strands: All the strands to be exported.
+        file_ids: Obtains the id to refer to each object by. Defaults to the
+            objects' own ids.
 
     Returns:
         A pandas dataframe containing data for many strands.
@@ -747,11 +1350,21 @@ def to_df(strands: Iterable[Strand]) -> pd.DataFrame:
     }
 
     for strand in strands:
-        data["uuid"].append(strand.uuid)
+        data["uuid"].append(file_ids(strand))
         data["name"].append(strand.name)
         data["data:closed"].append(strand.closed)
-        data["data:nucleic_acid_profile"].append(strand.nucleic_acid_profile.uuid)
-        data["data:items"].append("; ".join([item.uuid for item in strand.items]))
+        data["data:nucleic_acid_profile"].append(file_ids(strand.nucleic_acid_profile))
+        # The points of segments are given their file ids a segment at a time, so
+        # that they needn't be created
+        item_ids = []
+        for piece in strand.items.pieces:
+            if isinstance(piece, Segment) and isinstance(file_ids, FileIds):
+                item_ids.extend(file_ids.segment_ids(piece).tolist())
+            elif isinstance(piece, Segment):
+                item_ids.extend(map(file_ids, piece))
+            else:
+                item_ids.append(file_ids(piece))
+        data["data:items"].append("; ".join(map(str, item_ids)))
         data["style:thickness"].append(strand.styles.thickness.as_str())
         data["style:color"].append(strand.styles.color.as_str(valuemod=rgb_to_hex))
         data["style:highlighted"].append(strand.styles.highlighted)
@@ -1,11 +1,10 @@
 import itertools
 import logging
-from collections import deque
 from copy import copy, deepcopy
 from functools import partial
-from typing import Generator, Iterable, List, Literal, Tuple
-from uuid import uuid1
+from typing import Callable, Dict, Generator, Iterable, List, Literal, Tuple
 
+import numpy as np
 import pandas as pd
 from pandas import ExcelWriter
 from PyQt6.QtCore import QTimer
@@ -13,11 +12,14 @@ from xlsxwriter import Workbook
 
 from natug import settings
 from natug.constants.directions import DOWN, UP
+from natug.structures.ids import live_id, new_id
 from natug.structures.points import NEMid
 from natug.structures.points.nick import Nick
-from natug.structures.points.point import Point
+from natug.structures.points.point import Point, PointStyles
 from natug.structures.profiles import NucleicAcidProfile
+from natug.structures.strands.indexed_list import IndexedList
 from natug.structures.strands.linkage import Linkage
+from natug.structures.strands.segment import Segment
 from natug.structures.strands.strand import Strand, StrandItems
 from natug.utils import rgb_to_hex, show_in_file_explorer
 
@@ -30,7 +32,8 @@ class Strands:
 
     Attributes:
         nucleic_acid_profile: The nucleic acid settings for the strands container.
-        strands: The actual strands.
+        strands: The actual strands, in an IndexedList, so that checking whether a
+            strand is in the container, and finding and removing it, are lookups.
         up_strands: All up strands.
         down_strands: All down strands.
         nicks: All Nick objects within the strand. Automatically managed when nicking.
@@ -38,6 +41,9 @@ class Strands:
         size: The width and height of the domains when they are all laid next to one
             another.
         uuid: A unique identifier for the strands object. Automatically generated.
+        junctions: The JunctionTable of the design that the strands were derived
+            from, which is kept up to date when junctions are made. None if the
+            strands weren't derived from double helices.
 
     Methods:
         update: Update the strands object in-place with another Strands object.
@@ -48,10 +54,13 @@ class Strands:
         randomize_sequences: Randomize the sequences of all strands.
         clear_sequences: Clear the sequences of all strands.
         index: Obtain the index of a strand.
+        strand_of: Obtain the strand of the container that an item is in.
         append: Append a strand to the strands object.
         extend: Extend the strands object with a list of new Strands objects.
         remove: Remove a strand from the strands object.
-        style: Recompute styles for all the strands and items within the strands.
+        mark_changed: Mark strands as changed, so that the next styling pass that
+            only restyles changed strands restyles them.
+        style: Recompute styles for the strands and items within the strands.
         link: Create a linkage between two endpoint NEMids.
         unlink: Remove a linkage between two endpoint NEMids.
         conjunct: Create a cross-strand or same-strand junction between two NEMids.
@@ -68,7 +77,7 @@ class Strands:
         nucleic_acid_profile: NucleicAcidProfile,
         strands: Iterable[Strand],
         name: str = "Strands",
-        uuid: str = None,
+        uuid: int = None,
     ) -> None:
         """
         Initialize an instance of Strands.
@@ -82,13 +91,20 @@ class Strands:
         """
         # Store various attributes
         self.name = name
-        self.uuid = uuid or str(uuid1())
+        self.uuid = uuid if uuid is not None else new_id()
         self.nucleic_acid_profile = nucleic_acid_profile
-        self.strands = list(strands)
+        self.strands = IndexedList(strands)
 
         # Create various containers
         self.nicks = []
 
+        # The strands that were changed in place since the last styling pass, and the
+        # strands that the last styling pass styled (with the data that the pass
+        # styled them from), both keyed by the ids of the strands. _styled is None
+        # until the first styling pass.
+        self._changed: Dict[int, Strand] = {}
+        self._styled: Dict[int, Tuple[Strand, bool, bool, Tuple]] | None = None
+
         # Assign the strands attribute of all strands to this object
         for strand in self.strands:
             strand.strands = self
@@ -96,16 +112,30 @@ class Strands:
         # If this class is initialized with a list of strands, then there are no double
         # helices to store
         self.double_helices = None
+        self.junctions = None
 
     def __contains__(self, item):
         """Check if a strand or point is contained within this container."""
-        if item in self.strands:
-            return True
-        else:
-            for strand in self.strands:
-                for item_ in strand:
-                    if item_ is item:
-                        return True
+        return item in self.strands or self.strand_of(item) is not None
+
+    def strand_of(self, item: Point | Linkage) -> Strand | None:
+        """
+        Obtain the strand of this container that an item is in.
+
+        Points and linkages refer to their strand, so the strand is found without
+        searching the strands.
+
+        Args:
+            item: The point or linkage to obtain the strand of.
+
+        Returns:
+            The strand that the item is in, or None if the item is not in a strand of
+            this container.
+        """
+        strand = getattr(item, "strand", None)
+        if strand is not None and strand in self.strands and item in strand.items:
+            return strand
+        return None
 
     def __len__(self):
         """Obtain the number of strands this Strands object contains."""
@@ -154,6 +184,12 @@ class Strands:
         self.strands = other.strands
         for strand in self.strands:
             strand.strands = self
+        self.junctions = other.junctions
+
+        # The strands are the same objects, so what the other object has styled is
+        # what is styled here
+        self._changed = other._changed
+        self._styled = other._styled
 
     def items(self, type_restriction=object) -> Generator:
         """
@@ -204,11 +240,9 @@ class Strands:
 
         if strand.closed:
             # Open up the strand by removing the point and then flagging it as open.
-            new_strand_items = StrandItems()
-            new_strand_items.extend(strand.items[point_index + 1 :])
-            new_strand_items.extend(strand.items[:point_index])
-            strand.items = new_strand_items
+            strand.items = strand.items[point_index + 1 :] + strand.items[:point_index]
             strand.closed = False
+            self.mark_changed(strand)
         else:
             # Split the strand into two strands and then remove the old singular strand.
             new_strand_template = copy(strand)
@@ -222,11 +256,8 @@ class Strands:
             new_strand_2 = deepcopy(new_strand_template)
             new_strand_2.items = StrandItems(strand.items[point_index + 1 :])
 
-            for new_strand in (new_strand_1, new_strand_2):
-                for item in new_strand.items.by_type(Point):
-                    item.styles = copy(item.styles)
-                    item.styles.strand = new_strand
-                    item.strand = new_strand
+            new_strand_1.record()
+            new_strand_2.record()
 
             self.append(new_strand_1)
             self.append(new_strand_2)
@@ -235,10 +266,10 @@ class Strands:
         point.strand = None
 
         # Change the NEMid in the helix to a nick
-        point.helix.data.points[point.helical_index] = nick
+        point.helix.data.set_point(point.helical_index, nick)
 
         if style:
-            self.style()
+            self.style(only_changed=True)
 
     def unnick(self, nick: "Nick", style: bool = True) -> None:
         """
@@ -270,6 +301,10 @@ class Strands:
         previous_item_strand = nick.previous_item().strand
         next_item_strand = nick.next_item().strand
 
+        # Replace the slot in the helix's points with the original point, so that the
+        # strand holds the point of the helix again
+        point.helix.data.set_point(point.helical_index, point)
+
         # Add back the point that used to exist instead of the nick to the end of the
         # strand that comes before the nick
         previous_item_strand.append(nick.original_item)
@@ -286,16 +321,16 @@ class Strands:
         else:
             logger.debug("Performing nick reversal that results in a open strand.")
             nick.previous_item().strand.extend(next_item_strand.items)
+            previous_item_strand.record()
             self.strands.remove(next_item_strand)
 
+        self.mark_changed(previous_item_strand)
+
         # Remove the nick.
         self.nicks.remove(nick)
 
-        # Replace the slot in the helix's points with the original point.
-        point.helix.data.points[point.helical_index] = point
-
         if style:
-            self.style()
+            self.style(only_changed=True)
 
     def do_many(
         self,
@@ -316,7 +351,10 @@ class Strands:
             repeat_for: The number of steps of repeat_every to take.
             bidirectional: Whether to repeat the bulk action going in both directions,
                 as opposed to only in the direction of the point starting at the point.
-            items_to_run_on: The iterable of Points to run the action along.
+            items_to_run_on: The iterable of Points to run the action along, or the
+                helix of the first point, to run the action along the helix. Along a
+                helix, points that the action can't apply to are skipped by their
+                data in the helix's store, without obtaining them from the helix.
 
         Raises:
             ValueError: If the point's strand is not a strand of ours, or the point does
@@ -340,7 +378,7 @@ class Strands:
                     self.unnick(point, style=False)
         elif action == "highlight":
             def worker(point):
-                point.highlighted = True
+                point.styles.change_state("highlighted")
         elif action == "conjunct":
             def worker(point):
                 if isinstance(point, NEMid) and point.juncmate is not None:
@@ -349,10 +387,21 @@ class Strands:
             raise ValueError(f"Unknown action: {action}")
         # fmt: on
 
-        first_point_index = tuple(items_to_run_on).index(first_point)
+        # The points of a helix are indexed by their helical indices, and the helix's
+        # store tells which of them the action can apply to, so that only those
+        # points are obtained from the helix
+        helix = first_point.helix
+        on_helix = helix is not None and items_to_run_on is helix
+        if on_helix:
+            first_point_index = first_point.helical_index
+            item_count = len(helix)
+        else:
+            items_to_run_on = tuple(items_to_run_on)
+            first_point_index = items_to_run_on.index(first_point)
+            item_count = len(items_to_run_on)
 
         if repeat_for is None:
-            end_at = len(items_to_run_on)
+            end_at = item_count
         else:
             end_at = first_point_index + repeat_for * repeat_every
 
@@ -366,14 +415,25 @@ class Strands:
             # we check whether the start_at is less than 1).
             if start_at < 1:
                 if action == "conjunct":
-                    for index, item in enumerate(items_to_run_on):
-                        if (
-                            isinstance(item, NEMid)
-                            and item.junctable
-                            and round(item.x_coord) == round(first_point.x_coord)
-                        ):
-                            start_at = index
-                            break
+                    if on_helix:
+                        # The junctable NEMids are found with the store, and their x
+                        # coords are read from the helix's data arrays
+                        x_coords = np.round(np.round(helix.data.x_coords, 5))
+                        candidates = np.flatnonzero(
+                            helix.data.store.junctable()
+                            & (x_coords == round(first_point.x_coord))
+                        )
+                        if len(candidates):
+                            start_at = int(candidates[0])
+                    else:
+                        for index, item in enumerate(items_to_run_on):
+                            if (
+                                isinstance(item, NEMid)
+                                and item.junctable
+                                and round(item.x_coord) == round(first_point.x_coord)
+                            ):
+                                start_at = index
+                                break
                 else:
                     start_at = 1
         else:
@@ -387,10 +447,32 @@ class Strands:
             repeat_every,
         )
 
-        for item in itertools.islice(items_to_run_on, start_at, end_at, repeat_every):
-            worker(item)
+        # Restyling a strand resets the states of its points, so strands that are
+        # waiting to be restyled are restyled before their points are highlighted
+        if action == "highlight":
+            self.style(only_changed=True)
+
+        if on_helix:
+            store = helix.data.store
+            indices = np.arange(start_at, min(end_at, item_count), repeat_every)
+            if action == "nick":
+                # The NEMids of active junctions can't be nicked
+                indices = indices[(store.NEMids() & ~store.junctions())[indices]]
+            elif action == "unnick":
+                indices = indices[store.nicks()[indices]]
+            elif action == "conjunct":
+                # Only junctable NEMids have juncmates to make junctions with
+                indices = indices[store.junctable()[indices]]
+            for index in indices.tolist():
+                worker(helix[index])
+        else:
+            for item in itertools.islice(
+                items_to_run_on, start_at, end_at, repeat_every
+            ):
+                worker(item)
 
-        self.style()
+        if action != "highlight":
+            self.style(only_changed=True)
 
     def export_sequence(
         self, filepath: str, open_in_file_explorer: bool = True, mode="xlsx"
@@ -507,27 +589,63 @@ class Strands:
         strand.strands = None
         self.strands.remove(strand)
 
-    def style(self) -> None:
+    def mark_changed(self, *strands: Strand) -> None:
+        """
+        Mark strands as changed, so that the next styling pass restyles them.
+
+        Strands that are added to or removed from the container don't need to be
+        marked, since styling passes find them by comparing the strands with the
+        strands that the last pass styled. Strands whose items or styles are changed
+        in place do.
+
+        Args:
+            *strands: The strands that were changed.
+        """
+        for strand in strands:
+            self._changed[id(strand)] = strand
+
+    def style(self, only_changed: bool = False) -> None:
         """
-        Recompute colors for all strands contained within, and all items within the
-        strands.
+        Recompute colors for the strands contained within, and the items within them.
+
+        The colors of interdomain strands with automatic colors are cycled through in
+        the order of the strands, so the color of each strand depends on the strands
+        before it. The strand-wide styles of every strand are therefore recomputed on
+        each pass, which is cheap, while restyling the items of a strand is not.
+
+        Args:
+            only_changed: Whether to only restyle the items of the strands that were
+                created or marked as changed since the last pass, and of the strands
+                whose strand-wide styles changed (like strands whose colors were
+                shifted by a change to the interdomain strands before them). Whether
+                a strand is interdomain or an up strand is then only recomputed for
+                the strands that were created or marked as changed. If False, or if
+                the strands have not been styled yet, all strands are restyled.
 
         Notes:
             - Prevents touching strands from sharing colors.
         """
         strand_colors = itertools.cycle(settings.colors["strands"]["colors"])
+        previously_styled = self._styled if only_changed else None
+        styled = {}
+        restyled = 0
 
         for strand in self.strands:
-            interdomain = strand.interdomain()
-
-            # Change all the linkages in the strand to either be pink if the strand
-            # is interdomain, or very dark grey if the strand is not interdomain.
-            if interdomain:
-                for item in strand.items.by_type(Linkage):
-                    item.styles.color = settings.colors["linkages"]["color"]
+            # Reuse what the last pass found about the strand, unless the strand was
+            # changed since or the last pass didn't style it
+            previous = (
+                None if previously_styled is None else previously_styled.get(id(strand))
+            )
+            changed = (
+                previous is None
+                or previous[0] is not strand
+                or self._changed.get(id(strand)) is strand
+            )
+            if changed:
+                interdomain = strand.interdomain()
+                up_strand = strand.up_strand()
             else:
-                for item in strand.items.by_type(Linkage):
-                    item.styles.color = settings.colors["linkages"]["grey"]
+                interdomain, up_strand = previous[1], previous[2]
 
             if strand.styles.thickness.automatic:
                 if interdomain:
@@ -539,7 +657,7 @@ class Strands:
                 if interdomain:
                     strand.styles.color.value = next(strand_colors)
                 else:
-                    if strand.up_strand():
+                    if up_strand:
                         strand.styles.color.value = settings.colors["strands"]["greys"][
                             1
                         ]
@@ -548,10 +666,34 @@ class Strands:
                             0
                         ]
 
-            # Set the styles of each point based off new strand styles
-            for item in strand.items.by_type(Point):
-                item.styles.change_state("default")
-        logger.debug("Recomputed strand styles.")
+            # The items are styled from whether the strand is interdomain, and from
+            # the color and highlight of the strand
+            applied = (
+                interdomain,
+                tuple(strand.styles.color.value),
+                bool(strand.styles.highlighted),
+            )
+            styled[id(strand)] = (strand, interdomain, up_strand, applied)
+            if not changed and previous[3] == applied:
+                continue
+            restyled += 1
+
+            # Change all the linkages in the strand to either be pink if the strand
+            # is interdomain, or very dark grey if the strand is not interdomain.
+            if interdomain:
+                for item in strand.items.by_type(Linkage):
+                    item.styles.color = settings.colors["linkages"]["color"]
+            else:
+                for item in strand.items.by_type(Linkage):
+                    item.styles.color = settings.colors["linkages"]["grey"]
+
+            # Set the styles of each point based off new strand styles. Points that
+            # haven't been created yet are styled from the strand when they are.
+            PointStyles.reset_many(strand.items.created(Point), strand)
+
+        self._styled = styled
+        self._changed = {}
+        logger.debug("Restyled %s of %s strands.", restyled, len(self.strands))
 
     def link(self, NEMid1: NEMid, NEMid2: NEMid) -> Linkage:
         """
@@ -591,6 +733,10 @@ class Strands:
         if NEMid1.strand.direction == DOWN:
             NEMid1, NEMid2 = NEMid2, NEMid1
 
+        # The stores of the helices don't keep the strands of points alive, so the
+        # strands are held onto while they are removed and replaced
+        old_strands = (NEMid1.strand, NEMid2.strand)
+
         # If a closed linkage is being created then the strands are the same and we
         # only need to remove one of them
         self.remove(NEMid1.strand)
@@ -636,18 +782,13 @@ class Strands:
         new_strand.append(linkage)
         if not closed:
             new_strand.items.extend(end_point.strand.items)
-        for item in new_strand.items:
-            item.strand = new_strand
-
-        assert [
-            item.strand == new_strand for item in new_strand
-        ], "All items in the new strand must have the new strand as their parent."
+        new_strand.record()
 
         # Add the new strand to the container
         self.append(new_strand)
 
         # Restyle the strands
-        self.style()
+        self.style(only_changed=True)
 
         # Return the linkage
         return linkage
@@ -676,6 +817,7 @@ class Strands:
                 linkage.strand[0:linkage_index] + linkage.strand[linkage_index:-1]
             )
             to_return = (linkage.strand,)
+            self.mark_changed(linkage.strand)
         else:
             # Create a copy of the strand that has the same styles and nucleic acid
             # profile as the original strand. The new strands will have the same name,
@@ -696,12 +838,8 @@ class Strands:
             new_strand_two.name = f"{self.name} (2)"
 
             # Split up the strand items of the linkage, and do not include the linkage
-            new_strand_one.extend(
-                tuple(linkage.strand[: linkage.strand.index(linkage)]),
-            )
-            new_strand_two.extend(
-                tuple(linkage.strand[linkage.strand.index(linkage) + 1 :]),
-            )
+            new_strand_one.extend(linkage.strand[: linkage.strand.index(linkage)])
+            new_strand_two.extend(linkage.strand[linkage.strand.index(linkage) + 1 :])
 
             # Add the new strands to the container
             self.append(new_strand_one)
@@ -710,11 +848,14 @@ class Strands:
             # Remove the old strand from the container
             self.remove(linkage.strand)
 
+            new_strand_one.record()
+            new_strand_two.record()
+
             # Store the two new strands that are to be returned
             to_return = (new_strand_one, new_strand_two)
 
         # Restyle the strands and return the new strand(s)
-        self.style()
+        self.style(only_changed=True)
         return to_return
 
     def conjunct(
@@ -760,6 +901,10 @@ class Strands:
         NEMid1_index = NEMid1.index
         NEMid2_index = NEMid2.index
 
+        # The stores of the helices don't keep the strands of points alive, so the
+        # strands are held onto while they are removed and replaced
+        old_strands = (NEMid1.strand, NEMid2.strand)
+
         # new strands we are creating
         new_strands = [
             Strand(nucleic_acid_profile=self.nucleic_acid_profile),
@@ -877,19 +1022,14 @@ class Strands:
 
             # if both of the NEMids have closed sequencing
             elif NEMid1.strand.closed and NEMid2.strand.closed:
-                # convert the strands to deques so that they can be rotated
-                NEMid1_strand_items_deque = deque(NEMid1.strand.items)
-                NEMid2_strand_items_deque = deque(NEMid2.strand.items)
-
                 # rotate the strands so that they start and end at the junction site
-                NEMid1_strand_items_deque.rotate(len(NEMid1.strand) - NEMid1_index)
-                NEMid2_strand_items_deque.rotate(len(NEMid2.strand) - NEMid2_index)
-
-                all_strand_items = NEMid1_strand_items_deque + NEMid2_strand_items_deque
-                all_strand_items.rotate(1)
+                NEMid1_strand_items = NEMid1.strand.items.rotated(NEMid1_index)
+                NEMid2_strand_items = NEMid2.strand.items.rotated(NEMid2_index)
 
-                # add the entire first reordered strand to the new strand
-                new_strands[0].items = StrandItems(all_strand_items)
+                # add the entire first reordered strand to the new strand, beginning
+                # with its last item
+                NEMid1_strand_items.extend(NEMid2_strand_items)
+                new_strands[0].items = NEMid1_strand_items.rotated(-1)
 
                 new_strands[0].closed = True
                 new_strands[1].closed = False
@@ -920,25 +1060,47 @@ class Strands:
 
         # strands the items in the strands
         for new_strand in new_strands:
-            for item in new_strand.items:
-                item.strand = new_strand
+            new_strand.record()
 
+        # Only junctable NEMids can be junctions, so only they are visited. Along
+        # segments they are found with the junctable masks of the helices' stores,
+        # and the domains around them are read from the pieces that hold them, so
+        # no other points are obtained from the helices.
+        junctable_NEMids = []
         for NEMid_ in (NEMid1, NEMid2):
-            for index, item in enumerate(NEMid_.strand):
-                if (
-                    isinstance(item, NEMid)
-                    and item.junctable
-                    and (
-                        NEMid_.strand[(index - 1) % len(NEMid_.strand)].domain
-                        != NEMid_.strand[(index + 1) % len(NEMid_.strand)].domain
-                    )
-                ):
-                    item.junction = True
+            items, length = NEMid_.strand.items, len(NEMid_.strand)
+            start = 0
+            for piece in items.pieces:
+                if isinstance(piece, Segment):
+                    junctable = piece.helix.data.store.junctable()[piece.as_slice()]
+                    found = [
+                        (start + offset, piece[offset])
+                        for offset in np.flatnonzero(junctable).tolist()
+                    ]
+                    start += len(piece)
                 else:
-                    item.junction = False
+                    found = (
+                        [(start, piece)]
+                        if isinstance(piece, NEMid) and piece.junctable
+                        else []
+                    )
+                    start += 1
+                for index, item in found:
+                    item.junction = items.domain_at(
+                        (index - 1) % length
+                    ) != items.domain_at((index + 1) % length)
+                    junctable_NEMids.append(item)
+
+        # Record which junctable pairs are now active junctions
+        if self.junctions is not None:
+            self.junctions.update(junctable_NEMids)
+
+        # Record the junction states of the points into the stores of their helices
+        for NEMid_ in junctable_NEMids:
+            NEMid_.record()
 
         if style:
-            self.style()
+            self.style(only_changed=True)
 
     def y_min(self) -> float:
         """The minimum z coordinate of the strands container."""
@@ -978,21 +1140,25 @@ class Strands:
         """
         return self.width(), self.height()
 
-    def to_json(self) -> dict:
+    def to_json(self, file_ids: Callable[[object], int] = live_id) -> dict:
         """
         Convert the domain to a JSON serializable dictionary.
 
-        All the strands and nicks are referenced by their uuids. The ordering of
+        All the strands and nicks are referenced by their ids. The ordering of
         strands and nicks is preserved.
 
+        Args:
+            file_ids: Obtains the id to refer to each object by. Defaults to the
+                objects' own ids.
+
         Returns:
             dict: JSON serializable dictionary
         """
         return {
             "name": self.name,
-            "uuid": self.uuid,
-            "data:strands": [strand.uuid for strand in self],
-            "data:nicks": [nick.uuid for nick in self.nicks],
+            "uuid": file_ids(self),
+            "data:strands": [file_ids(strand) for strand in self],
+            "data:nicks": [file_ids(nick) for nick in self.nicks],
         }
 
     def write_worksheets(
@@ -0,0 +1,79 @@
+import timeit
+
+import pandas as pd
+
+from natug.structures.domains import Domains
+from natug.structures.helices import DoubleHelices
+from natug.structures.points import NEMid
+from natug.structures.profiles import NucleicAcidProfile
+
+DOMAINS = "saves/domains/heart.csv"  # the design to measure
+NUCLEIC_ACID_PROFILE = "saves/nucleic_acid/MFD_B-DNA.json"
+BODY_COUNT = 250  # the body count of every helix, to make a large tube
+NICK_EVERY = 7  # the number of bases between each nick
+REPEATS = 20  # the number of times to time each access
+
+
+def nicked_strands():
+    """
+    Create the strands of a large tube, with every helix nicked every few bases.
+
+    The nicks are made with the action repeater, the same way that staples are
+    broken up in the side view.
+    """
+    nucleic_acid_profile = NucleicAcidProfile.from_file(NUCLEIC_ACID_PROFILE)
+    domains = Domains.from_df(pd.read_csv(DOMAINS), nucleic_acid_profile)
+    for domain in domains.subunit.domains:
+        domain.up_helix_count.body_count = BODY_COUNT
+        domain.down_helix_count.body_count = BODY_COUNT
+    domains.invalidate()
+    double_helices = DoubleHelices.from_domains(domains, nucleic_acid_profile)
+    double_helices.compute()
+    strands = double_helices.strands()
+
+    for helix in double_helices.helices():
+        # Begin at a NEMid that isn't junctable, since junctable NEMids can be
+        # active junctions, which can't be nicked
+        first_point = next(
+            helix[index]
+            for index in range(len(helix))
+            if isinstance(helix[index], NEMid) and not helix[index].junctable
+        )
+        strands.do_many(
+            "nick",
+            first_point,
+            # Points alternate between nucleosides and NEMids along a helix
+            repeat_every=2 * NICK_EVERY,
+            repeat_for=None,
+            bidirectional=False,
+            items_to_run_on=helix,
+        )
+    return strands
+
+
+def measure():
+    """
+    Measure the time it takes to read the attributes of many nicks.
+
+    The attributes read are the ones that the side view plotter, the file handler
+    and the unnicking code read for each nick.
+    """
+    strands = nicked_strands()
+    nicks = strands.nicks
+    print(f"Nicks: {len(nicks)}")
+
+    accesses = {
+        "position": lambda: [(nick.x_coord, nick.z_coord) for nick in nicks],
+        "helix": lambda: [(nick.helix, nick.helical_index) for nick in nicks],
+        "neighbours": lambda: [
+            (nick.previous_item(), nick.next_item()) for nick in nicks
+        ],
+        "domain": lambda: [nick.previous_item().domain.index for nick in nicks],
+    }
+    for name, access in accesses.items():
+        seconds = min(timeit.repeat(access, number=1, repeat=REPEATS))
+        print(f"{name}: {seconds / len(nicks) * 1e9:.0f} ns per nick")
+
+
+if __name__ == "__main__":
+    measure()
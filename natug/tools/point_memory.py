@@ -0,0 +1,55 @@
+import tracemalloc
+
+import pandas as pd
+
+from natug.runner.memory import shallow_size
+from natug.structures.domains import Domains
+from natug.structures.helices import DoubleHelices
+from natug.structures.points import NEMid, Nucleoside
+from natug.structures.profiles import NucleicAcidProfile
+
+DOMAINS = "saves/domains/heart.csv"  # the design to measure
+NUCLEIC_ACID_PROFILE = "saves/nucleic_acid/MFD_B-DNA.json"
+BODY_COUNT = 400  # the body count of every helix, to make a large tube
+
+
+def measure():
+    """
+    Measure the memory used per point by the strands of a large tube.
+
+    The helix data is computed before measuring, so that only the memory of
+    converting the helices into strands of points is counted. This includes the
+    strands and the stores of the helices, along with any point objects that are
+    created. Points are created when they are first used, so it doesn't include
+    those of points that aren't.
+    """
+    nucleic_acid_profile = NucleicAcidProfile.from_file(NUCLEIC_ACID_PROFILE)
+    domains = Domains.from_df(pd.read_csv(DOMAINS), nucleic_acid_profile)
+    for domain in domains.subunit.domains:
+        domain.up_helix_count.body_count = BODY_COUNT
+        domain.down_helix_count.body_count = BODY_COUNT
+    domains.invalidate()
+    double_helices = DoubleHelices.from_domains(domains, nucleic_acid_profile)
+    double_helices.compute()
+
+    tracemalloc.start()
+    strands = double_helices.strands()
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    point_count = sum(len(strand.items) for strand in strands)
+    print(f"Points: {point_count}")
+    print(f"Allocated: {allocated / 2**20:.1f} MiB")
+    print(f"Bytes per point: {allocated / point_count:.0f}")
+
+    # The shallow size of one of each type of point, and of a point's styles
+    for type_ in (NEMid, Nucleoside):
+        point = next(iter(strands.items(type_)))
+        print(
+            f"{type_.__name__}: {shallow_size(point)} bytes, "
+            f"styles: {shallow_size(point.styles)} bytes"
+        )
+
+
+if __name__ == "__main__":
+    measure()
@@ -1,5 +1,9 @@
 from functools import cache
 
+import numpy as np
+
+from natug import settings
+from natug.structures.domains.domains import closure_gaps
 from natug.structures.profiles import NucleicAcidProfile
 
 C = 8  # number of domains
@@ -75,15 +79,27 @@ def find_combos(n, c):
     return combinations
 
 
+def closes(combos, nucleic_acid_profile: NucleicAcidProfile) -> np.ndarray:
+    """
+    Whether each of many combos of theta_m multiples forms a closed tube.
+
+    Domains are assumed to have no helix switches. All combos are evaluated at once.
+    """
+    theta_is = np.asarray(combos, dtype=float) * nucleic_acid_profile.theta_c
+    return closure_gaps(theta_is, nucleic_acid_profile.D) < settings.closed_threshold
+
+
 def shapefind():
     target_M_over_R = (nucleic_acid_profile.B * (C - 2)) // (2 * R)
 
-    assert closes([4, 13, 4, 14] * 3, nucleic_acid_profile)
+    assert closes([[4, 13, 4, 14] * 3], nucleic_acid_profile)[0]
 
-    matches = []
-    for combo in find_combos(target_M_over_R, C):
-        if closes(combo, nucleic_acid_profile):
-            matches.append(combo)
+    combos = list(find_combos(target_M_over_R, C))
+    matches = [
+        combo
+        for combo, closed in zip(combos, closes(combos, nucleic_acid_profile))
+        if closed
+    ]
 
     print(matches)
 
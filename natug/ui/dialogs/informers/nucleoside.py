@@ -47,7 +47,7 @@ class NucleosideInformer(QDialog):
             openness = "open"
         self.strand.setText(
             f"nucleoside #"
-            f"{nucleoside.strand.items.by_type(Nucleoside).index(nucleoside) + 1} in"
+            f"{nucleoside.strand.items.index_of_type(nucleoside, Nucleoside) + 1} in"
             f" {openness} strand #{strand_index + 1}"
         )
         self.helix.setText(
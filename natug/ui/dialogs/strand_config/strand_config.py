@@ -37,8 +37,8 @@ class StrandConfig(QDialog):
 
     def _strand_params(self):
         """Setup parameters based on strand parameters."""
-        self.NEMids_in_strand.setValue(len(self.strand.items.by_type(NEMid)))
-        self.nucleosides_in_strand.setValue(len(self.strand.items.by_type(Nucleoside)))
+        self.NEMids_in_strand.setValue(self.strand.items.type_count(NEMid))
+        self.nucleosides_in_strand.setValue(self.strand.items.type_count(Nucleoside))
         self.closed.setChecked(self.strand.closed)
         self.empty.setChecked(self.strand.empty)
         self.thickness.blockSignals(True)
@@ -1,6 +1,7 @@
+import html
 import webbrowser
 
-from PyQt6.QtWidgets import QMenu
+from PyQt6.QtWidgets import QMenu, QMessageBox
 
 from natug import settings
 from natug.ui.resources import fetch_icon
@@ -14,20 +15,24 @@ class Help(QMenu):
         - Manual: Open the manual pdf.
         - Github: Open the github project link.
         - About: Obtain information about NATuG.
+        - Memory Report: Show the objects and memory of the current design.
     """
 
-    def __init__(self, parent):
+    def __init__(self, parent, runner):
         """
         Initialize the help section of the menu bar.
 
         Args:
             parent: The strands of the help section of the menu bar.
+            runner: NATuG's runner.
         """
+        self.runner = runner
         super().__init__("&Help", parent)
 
         self._about()
         self._manual()
         self._github()
+        self._memory_report()
 
     def _manual(self):
         """Open NATuG's manual."""
@@ -45,3 +50,22 @@ class Help(QMenu):
         """Get information about NATuG."""
         self.about = self.addAction("About")
         self.about.setIcon(fetch_icon("information-outline"))
+
+    def _memory_report(self):
+        """Show the objects and memory of the current design."""
+        self.memory_report = self.addAction("Memory Report")
+        self.memory_report.setIcon(fetch_icon("information-outline"))
+        self.memory_report.setStatusTip(
+            "Show the number of objects and memory used by the current design"
+        )
+        self.memory_report.triggered.connect(self._show_memory_report)
+
+    def _show_memory_report(self):
+        """Take a memory report and show it alongside its growth since the last."""
+        previous = self.runner.last_memory_report
+        report = self.runner.memory_report()
+        QMessageBox.information(
+            self,
+            "Memory Report",
+            f"<pre>{html.escape(report.to_text(previous))}</pre>",
+        )
@@ -19,6 +19,7 @@ class Menubar(QMenuBar):
             - Manual
             - Github
             - About
+            - Memory Report
     """
 
     def __init__(self, parent, runner: "runner.Runner"):
@@ -39,4 +40,4 @@ class Menubar(QMenuBar):
         # add menus
         self.addMenu(File(self, self.runner))
         self.addMenu(View(self, self.runner))
-        self.addMenu(Help(self))
+        self.addMenu(Help(self, self.runner))
@@ -12,8 +12,14 @@ from PyQt6.QtGui import QBrush, QFont, QPainterPath, QPen
 from natug import settings
 from natug.constants.directions import WRAPS_LEFT_TO_RIGHT, WRAPS_RIGHT_TO_LEFT
 from natug.structures.points import NEMid, Nucleoside
-from natug.structures.points.point import Point, PointStyles
+from natug.structures.points.point import (
+    Point,
+    PointStyle,
+    PointStyleColumns,
+    PointStyles,
+)
 from natug.structures.profiles import NucleicAcidProfile
+from natug.structures.strands.segment import Segment
 from natug.ui.plotters.plotter import Plotter
 from natug.ui.plotters.utils import chaikins_corner_cutting, custom_symbol
 
@@ -81,7 +87,8 @@ class PlotData:
         double_helices: The double helices underpinning the currently plotted strands.
         point_types: The currently plotted point types.
         modifiers: Various modifiers for the scale of various plot aspects.
-        points: A mapping of positions of plotted_points to point objects.
+        points: A mapping of positions of plotted_points to point objects, or to
+            the helix and helical index of points that haven't been created.
         plotted_points: The points.
         plotted_nicks: The nicks.
         plotted_linkages: The linkages.
@@ -95,7 +102,9 @@ class PlotData:
     double_helices: "DoubleHelices" = None
     point_types: Tuple[Type, ...] = field(default_factory=tuple)
     modifiers: PlotModifiers = field(default_factory=PlotModifiers)
-    points: Dict[Tuple[float, float], "Point"] = field(default_factory=dict)
+    points: Dict[Tuple[float, float], "Point | Tuple[Helix, int]"] = field(
+        default_factory=dict
+    )
     plotted_points: List[pg.PlotDataItem] = field(default_factory=list)
     plotted_nicks: List[pg.PlotDataItem] = field(default_factory=list)
     plotted_linkages: List[pg.PlotDataItem] = field(default_factory=list)
@@ -104,6 +113,166 @@ class PlotData:
     plotted_gridlines: List[pg.PlotDataItem] = field(default_factory=list)
 
 
+@dataclass(slots=True)
+class PointColumns:
+    """
+    The data of the points of strand items that are plotted, stored as columns.
+
+    The data of the points of segments is read from the data arrays and stores of
+    their helices, so points that haven't been created yet are plotted without
+    being obtained from their helices. The data of points that have been created is
+    read from the points themselves.
+
+    Attributes:
+        x_coords: The x coord of each point.
+        z_coords: The z coord of each point.
+        domain_indices: The index of the domain of each point.
+        directions: The direction of each point.
+        kinds: The kind of each point. NUCLEOSIDE, NEMID, or -1 for other points.
+        junctables: Whether each point is a junctable NEMid.
+        bases: The base code of each point (see BASE_CODES).
+        points: Each point that has been created, or None.
+        locators: Each point that has been created, or the helix and helical index
+            of the point otherwise.
+
+    Methods:
+        from_items: Gather the data of the points of strand items.
+        styles: Obtain the style record of each point.
+    """
+
+    x_coords: np.ndarray
+    z_coords: np.ndarray
+    domain_indices: np.ndarray
+    directions: np.ndarray
+    kinds: np.ndarray
+    junctables: np.ndarray
+    bases: np.ndarray
+    points: np.ndarray
+    locators: List["Point | Tuple[Helix, int]"]
+
+    def __len__(self) -> int:
+        return len(self.x_coords)
+
+    @classmethod
+    def from_items(cls, items: "StrandItems") -> "PointColumns":
+        """
+        Gather the data of the points of strand items.
+
+        Args:
+            items: The strand items. They must all be points.
+
+        Returns:
+            The data of the points, in the order of the items.
+        """
+        from natug.structures.helices.point_store import NEMID, NUCLEOSIDE, UNSET
+
+        pieces = []
+        for piece in items.pieces:
+            if isinstance(piece, Segment):
+                helix, key = piece.helix, piece.as_slice()
+                data, store = helix.data, helix.data.store
+                pieces.append(
+                    (
+                        np.round(data.x_coords[key], 5),
+                        np.round(data.z_coords[key], 5),
+                        np.full(len(piece), helix.domain.index, dtype=float),
+                        np.full(len(piece), helix.direction),
+                        store.kinds[key].astype(int),
+                        store.junctables[key] & (store.kinds[key] == NEMID),
+                        store.bases[key].astype(int),
+                        data.points[key],
+                        [(helix, index) for index in piece.indices],
+                    )
+                )
+            else:
+                pieces.append(
+                    (
+                        np.zeros(1),
+                        np.zeros(1),
+                        np.zeros(1),
+                        np.zeros(1, dtype=int),
+                        np.full(1, -1),
+                        np.zeros(1, dtype=bool),
+                        np.full(1, UNSET),
+                        np.array((piece,), dtype=object),
+                        [piece],
+                    )
+                )
+
+        if pieces:
+            columns = cls(
+                *(np.concatenate(column) for column in tuple(zip(*pieces))[:-1]),
+                locators=[locator for piece in pieces for locator in piece[-1]],
+            )
+        else:
+            columns = cls(
+                *(np.zeros(0, dtype=dtype) for dtype in (float,) * 3 + (int,) * 2),
+                junctables=np.zeros(0, dtype=bool),
+                bases=np.zeros(0, dtype=int),
+                points=np.zeros(0, dtype=object),
+                locators=[],
+            )
+
+        # The points that have been created are described by themselves
+        for position in np.flatnonzero(np.not_equal(columns.points, None)).tolist():
+            point = columns.points[position]
+            columns.x_coords[position] = point.x_coord
+            columns.z_coords[position] = point.z_coord
+            columns.domain_indices[position] = point.domain.index
+            columns.directions[position] = point.direction
+            if isinstance(point, Nucleoside):
+                columns.kinds[position] = NUCLEOSIDE
+            elif isinstance(point, NEMid):
+                columns.kinds[position] = NEMID
+                columns.junctables[position] = point.junctable
+            columns.locators[position] = point
+        return columns
+
+    def styles(self, strand: "Strand") -> np.ndarray:
+        """
+        Obtain the style record of each point.
+
+        Points that haven't been created yet are given the records that they would
+        be given when they are created, which only depend on a few of their data.
+
+        Args:
+            strand: The strand of the points.
+
+        Returns:
+            An object array of the style record of each point.
+        """
+        from natug.structures.helices.point_store import BASES, NUCLEOSIDE
+
+        styles = np.empty(len(self), dtype=object)
+        new = np.flatnonzero(np.equal(self.points, None))
+        if len(new):
+            # Find each combination of data that the records depend on once
+            keys = np.column_stack(
+                (
+                    self.kinds[new],
+                    self.directions[new],
+                    self.junctables[new],
+                    self.bases[new],
+                )
+            )
+            combinations, inverse = np.unique(keys, axis=0, return_inverse=True)
+            records = np.empty(len(combinations), dtype=object)
+            for index, (kind, direction, junctable, base) in enumerate(
+                combinations.tolist()
+            ):
+                records[index] = PointStyles.default_style(
+                    "Nucleoside" if kind == NUCLEOSIDE else "NEMid",
+                    direction,
+                    bool(junctable),
+                    BASES[base],
+                    strand,
+                )
+            styles[new] = records[inverse.reshape(-1)]
+        for position in np.flatnonzero(np.not_equal(self.points, None)).tolist():
+            styles[position] = self.points[position].styles.style
+        return styles
+
+
 class SideViewPlotter(Plotter):
     """
     Side view strands plot widget.
@@ -286,7 +455,12 @@ class SideViewPlotter(Plotter):
     def _points_clicked(self, event, points):
         """Called when a point on a strand is clicked."""
         position = tuple(points[0].pos())
-        self.points_clicked.emit(self.plot_data.points[position])
+        point = self.plot_data.points[position]
+        if isinstance(point, tuple):
+            # The point hadn't been created when it was plotted
+            helix, index = point
+            point = helix[index]
+        self.points_clicked.emit(point)
 
     def auto_range(self):
         """Configure the range for the plot automatically."""
@@ -371,8 +545,11 @@ class SideViewPlotter(Plotter):
         # Clear preexisting plotted_gridlines
         self.plot_data.plotted_gridlines.clear()
 
-        for index, double_helix in enumerate(self.double_helices):
-            if double_helix.right_joint_is_stable():
+        # Joint i is the right joint of double helix i, so the stability of every
+        # joint can be determined at once
+        stable_joints = self.double_helices.stable_joints()
+        for index, stable in enumerate(stable_joints):
+            if stable:
                 self._plot_vertical_gridline(index + 1)
             else:
                 self._plot_vertical_gridline(
@@ -380,8 +557,8 @@ class SideViewPlotter(Plotter):
                 )
 
         # Check if the joint on the very right side of the screen is unstable by
-        # looking at the first domain's left joint.
-        if self.double_helices[0].left_joint_is_stable():
+        # looking at the first domain's left joint, which is the last joint.
+        if stable_joints[-1]:
             self._plot_vertical_gridline(0)
         else:
             self._plot_vertical_gridline(0, unstable=self.show_unstable_joints)
@@ -392,131 +569,153 @@ class SideViewPlotter(Plotter):
             for i in range(0, ceil(self.height / self.nucleic_acid_profile.H)):
                 self._plot_horizontal_gridline(i * self.nucleic_acid_profile.H)
 
+    @staticmethod
+    def _point_symbol(style: PointStyle) -> str | QPainterPath:
+        """
+        Obtain the symbol to plot points of a given style with.
+
+        Args:
+            style: The style record of the points.
+
+        Returns:
+            The name of the symbol if it is a pyqtgraph symbol, otherwise a custom
+            symbol.
+        """
+        # if the symbol is a custom symbol, use the custom symbol
+        if style.symbol not in PointStyles.all_symbols:
+            if style.font is None:
+                symbol = custom_symbol(
+                    style.symbol,
+                    flip=False,
+                    rotation=style.rotation,
+                )
+            else:
+                symbol = custom_symbol(
+                    style.symbol,
+                    flip=False,
+                    rotation=style.rotation,
+                    font=QFont(style.font),
+                )
+            assert isinstance(symbol, QPainterPath), (
+                "Custom symbol must be of type QPainterPath, but is of type"
+                f" {type(symbol)}"
+            )
+            return symbol
+        return style.symbol
+
     def _plot_points(self):
         """
         Plot all the points that run along the strands.
 
         This method automatically updates plot_data.plotted_points.
         """
+        from natug.structures.helices.point_store import NEMID, NUCLEOSIDE
+
         for points in self.plot_data.plotted_points:
             self.removeItem(points)
         self.plot_data.plotted_points.clear()
         self.plot_data.points.clear()
 
         for strand_index, strand in enumerate(self.strands):
-            # First plot all the points
-            to_plot = strand.items.by_type(Point)
-
-            # create containers for plotting data
-            symbols = np.empty(len(to_plot), dtype=object)
-            symbol_sizes = np.empty(len(to_plot), dtype=int)
-            symbol_brushes = np.empty(len(to_plot), dtype=QBrush)
-            symbol_pens = np.empty(len(to_plot), dtype=QPen)
-            x_coords = np.empty(len(to_plot), dtype=float)
-            z_coords = np.empty(len(to_plot), dtype=float)
-
-            # Now create the proper plot data for each point one by one
-            for point_index, point in enumerate(to_plot):
-                # For points that are overlapping on the integrer line, they will be
-                # plotted slightly differently.
-                if point.x_coord % 1 == 0:
-                    # If the point is on the right side of its domain (i.e. the
-                    # point's domain x coord = index + 1) then we will shift it
-                    # slightly to the left so that it is not obscured by the other
-                    # point that is on top of it. Otherwise, we will shift it
-                    # slightly to the right.
-                    if (
-                        # Points that are on the very left (x=0) or the very right (
-                        # x=the number of domains) will not be shifted.
-                        point.x_coord == 0
-                        or point.x_coord == self.domains.count
-                    ):
-                        x_coord = point.x_coord
-                    else:
-                        if point.domain.index == point.x_coord:
-                            x_coord = point.x_coord + settings.domain_line_point_shift
-                        else:
-                            x_coord = point.x_coord - settings.domain_line_point_shift
-                else:
-                    x_coord = point.x_coord
-                z_coord = point.z_coord
-
-                x_coords[point_index] = x_coord
-                z_coords[point_index] = z_coord
-
-                # Update the point mappings. This is a dict that allows us to map the
-                # location of a given point to the point object itself.
-                self.plot_data.points[(x_coord, z_coord)] = point
-
-                # If the point type is NOT the same as the active point type, use the
-                # current styles of the point. Otherwise, plot a smaller "o" shaped
-                # point to indicate that the point is not the active point type,
-                # but still exists.
-                if not isinstance(point, self.point_types):
-                    if self.dot_hidden_points:
-                        symbols[point_index] = "o"
-                        symbol_sizes[point_index] = 2
-                        symbol_brushes[point_index] = pg.mkBrush(color=(30, 30, 30))
-                        symbol_pens[point_index] = None
-                else:
-                    # if the symbol is a custom symbol, use the custom symbol
-                    if point.styles.symbol_is_custom():
-                        if point.styles.font is None:
-                            symbols[point_index] = custom_symbol(
-                                point.styles.symbol,
-                                flip=False,
-                                rotation=point.styles.rotation,
-                            )
-                        else:
-                            symbols[point_index] = custom_symbol(
-                                point.styles.symbol,
-                                flip=False,
-                                rotation=point.styles.rotation,
-                                font=QFont(point.styles.font),
-                            )
-                        assert isinstance(symbols[point_index], QPainterPath), (
-                            "Custom symbol must be of type QPainterPath, but is of type"
-                            f" {type(symbols[point_index])}"
-                        )
-                    else:
-                        assert point.styles.symbol in PointStyles.all_symbols, (
-                            f'Symbol "{point.styles.symbol} "is not a valid symbol. '
-                            "Valid symbols are: "
-                            f"{PointStyles.all_symbols}"
-                        )
-                        symbols[point_index] = point.styles.symbol
+            # First plot all the points. Their data is gathered from the arrays of
+            # their helices, so points that haven't been created yet aren't.
+            to_plot = PointColumns.from_items(strand.items.by_type(Point))
+            count = len(to_plot)
+
+            # Gather the styles of the points into columns. Styles are shared between
+            # points, so symbols, brushes, and pens are made once per style record,
+            # and are then indexed by each point's record code.
+            columns = PointStyleColumns.from_records(to_plot.styles(strand))
+
+            # Gather the positions and kinds of the points
+            x_coords = to_plot.x_coords
+            z_coords = to_plot.z_coords
+            domain_indices = to_plot.domain_indices
+            NEMids = to_plot.kinds == NEMID
+            nucleosides = to_plot.kinds == NUCLEOSIDE
+            junctables = to_plot.junctables
+            shown = np.zeros(count, dtype=bool)
+            if issubclass(NEMid, self.point_types):
+                shown |= NEMids
+            if issubclass(Nucleoside, self.point_types):
+                shown |= nucleosides
+
+            # For points that are overlapping on the integer line, they will be
+            # plotted slightly differently. If the point is on the right side of its
+            # domain (i.e. the point's domain x coord = index + 1) then we will shift
+            # it slightly to the left so that it is not obscured by the other point
+            # that is on top of it. Otherwise, we will shift it slightly to the
+            # right. Points that are on the very left (x=0) or the very right (x=the
+            # number of domains) will not be shifted.
+            on_domain_line = (
+                (x_coords % 1 == 0) & (x_coords != 0) & (x_coords != self.domains.count)
+            )
+            x_coords = np.where(
+                on_domain_line,
+                np.where(
+                    domain_indices == x_coords,
+                    x_coords + settings.domain_line_point_shift,
+                    x_coords - settings.domain_line_point_shift,
+                ),
+                x_coords,
+            )
 
-                    outline_width = (
-                        point.styles.outline[1] * self.modifiers.point_outline_mod
-                    )
-                    if isinstance(point, NEMid):
-                        symbol_sizes[point_index] = (
-                            point.styles.size * self.modifiers.NEMid_mod
-                        )
-                        if point.junctable:
-                            outline_width = point.styles.outline[1]
-                    elif isinstance(point, Nucleoside):
-                        symbol_sizes[point_index] = (
-                            point.styles.size * self.modifiers.nucleoside_mod
-                        )
-                    else:
-                        symbol_sizes[point_index] = point.styles.size
-                        outline_width = point.styles.outline[1]
+            # Update the point mappings. This is a dict that allows us to map the
+            # location of a given point to the point object itself, or to where the
+            # point is obtained from if it hasn't been created yet.
+            self.plot_data.points.update(
+                zip(zip(x_coords.tolist(), z_coords.tolist()), to_plot.locators)
+            )
 
-                    # Create a brush for the symbol, based on the point's styles.
-                    symbol_brushes[point_index] = pg.mkBrush(
-                        color=point.styles.fill,
-                    )
+            # Create the symbols and brushes once per style record
+            record_symbols = np.empty(len(columns.records), dtype=object)
+            record_brushes = np.empty(len(columns.records), dtype=object)
+            for index, record in enumerate(columns.records):
+                record_symbols[index] = self._point_symbol(record)
+                record_brushes[index] = pg.mkBrush(color=record.fill)
+            symbols = record_symbols[columns.codes]
+            symbol_brushes = record_brushes[columns.codes]
+
+            # NEMids and nucleosides are scaled by their size modifiers. The outlines
+            # of junctable NEMids and of other points are not scaled.
+            symbol_sizes = columns.size.copy()
+            symbol_sizes[NEMids] *= self.modifiers.NEMid_mod
+            symbol_sizes[nucleosides] *= self.modifiers.nucleoside_mod
+            outline_scaled = (NEMids & ~junctables) | nucleosides
+            outline_widths = np.where(
+                outline_scaled,
+                columns.outline_width * self.modifiers.point_outline_mod,
+                columns.outline_width,
+            )
 
-                    # Create a pen for the symbol, based on the point's styles.
-                    symbol_pens[point_index] = (
-                        pg.mkPen(
-                            color=point.styles.outline[0],
+            # Create the pens once per style record and outline width
+            pens = {}
+            symbol_pens = np.empty(count, dtype=object)
+            for point_index, (code, outline_width) in enumerate(
+                zip(columns.codes.tolist(), outline_widths.tolist())
+            ):
+                if outline_width > 0:
+                    if (code, outline_width) not in pens:
+                        pens[code, outline_width] = pg.mkPen(
+                            color=columns.records[code].outline[0],
                             width=outline_width,
                         )
-                        if outline_width > 0
-                        else None
-                    )
+                    symbol_pens[point_index] = pens[code, outline_width]
+
+            # If the point type is NOT the same as the active point type, plot a
+            # smaller "o" shaped point to indicate that the point is not the active
+            # point type, but still exists.
+            hidden = ~shown
+            symbol_pens[hidden] = None
+            if self.dot_hidden_points:
+                symbols[hidden] = "o"
+                symbol_sizes[hidden] = 2
+                symbol_brushes[hidden] = pg.mkBrush(color=(30, 30, 30))
+            else:
+                symbols[hidden] = None
+                symbol_sizes[hidden] = 0
+                symbol_brushes[hidden] = None
+            symbol_sizes = symbol_sizes.astype(int)
 
             # Graph the plot for the points and for the strokes separately. First we
             # will plot the points.
@@ -581,9 +780,11 @@ class SideViewPlotter(Plotter):
                 x_coords = np.zeros(stroke_length, dtype=float)
                 z_coords = np.zeros(stroke_length, dtype=float)
 
-                for point_index, point in enumerate(stroke_segment):
-                    x_coords[point_index] = point.x_coord
-                    z_coords[point_index] = point.z_coord
+                # The coords are read from the arrays of the points' helices
+                stroke_columns = PointColumns.from_items(stroke_segment)
+                x_coords[: len(stroke_segment)] = stroke_columns.x_coords
+                z_coords[: len(stroke_segment)] = stroke_columns.z_coords
+                domain_indices = stroke_columns.domain_indices
 
                 # If the strand is closed, we will be adding a pseudo point to the
                 # end of the stroke segment. If the last point and the first point
@@ -591,7 +792,7 @@ class SideViewPlotter(Plotter):
                 # the first point (connect[-1] = True). Otherwise, we will not
                 # connect the last point to the first point (connect[-1] = False).
                 add_connected_pseudo_point = strand.closed and (
-                    abs(stroke_segment[0].domain - stroke_segment[-1].domain)
+                    abs(domain_indices[0] - domain_indices[-1])
                     == self.domains.count - 1
                 )
 
@@ -622,17 +823,12 @@ class SideViewPlotter(Plotter):
                     # "connect" feature, because we will later round the edges of
                     # strokes.
                     if len(self.domains) > 2:
-                        for index, point in enumerate(stroke_segment[:-1]):
-                            # We will be looking ahead to the next point to determine
-                            # whether we have crossed the screen, so we will skip the last
-                            # point and worry about it later.
-                            splitter[index + 1] = (
-                                abs(
-                                    point.domain.index
-                                    - stroke_segment[index + 1].domain.index
-                                )
-                                == self.domains.count - 1
-                            )
+                        # We will be looking ahead to the next point to determine
+                        # whether we have crossed the screen, so we will skip the last
+                        # point and worry about it later.
+                        splitter[1 : len(stroke_segment)] = (
+                            np.abs(np.diff(domain_indices)) == self.domains.count - 1
+                        )
 
                     strand.cross_screen = splitter.any()
 